@@ -0,0 +1,64 @@
+"""
+Memory footprint of the model classes on a large synthetic instance.
+
+    python benchmarks/bench_model_memory.py [--defenses 10000] [--slots 50000]
+
+Builds persons, defenses (each with its own TimeSlot/Room/chairman assigned) and an
+empty schedule grid, and reports tracemalloc bytes per object for each model class.
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.models import Person, Defense, Room, TimeSlot, Role  # noqa: E402
+from src.algorithm.scheduler import ScheduleSlot  # noqa: E402
+
+
+def measure(label, count, build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{label:<14}{count:>8}  {used / 1024 / 1024:8.2f} MiB  {used / count:7.1f} B/object")
+    return objects
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--defenses", type=int, default=10_000)
+    parser.add_argument("--slots", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    origin = datetime.combine(date(2025, 6, 20), datetime.min.time())
+    step = timedelta(minutes=30)
+    people = max(args.defenses // 20, 3)
+    rooms_count = 50
+
+    print(f"{'class':<14}{'count':>8}  {'total':>12}  {'per object':>16}")
+    persons = measure("Person", people, lambda: [
+        Person(f"Person {i}", f"person{i}@example.edu", roles={Role.SUPERVISOR, Role.REVIEWER, Role.CHAIRMAN})
+        for i in range(people)
+    ])
+    rooms = measure("Room", rooms_count, lambda: [Room(f"Room {i}", str(100 + i)) for i in range(rooms_count)])
+    times = measure("TimeSlot", args.slots, lambda: [
+        TimeSlot(origin + i * step, origin + (i + 1) * step) for i in range(args.slots)
+    ])
+    defenses = measure("Defense", args.defenses, lambda: [
+        Defense(f"Student {i}", f"Thesis {i}", persons[i % people], persons[(i + 1) % people],
+                time_slot=times[i % args.slots], room=rooms[i % rooms_count], chairman=persons[(i + 2) % people])
+        for i in range(args.defenses)
+    ])
+    measure("ScheduleSlot", args.slots, lambda: [
+        ScheduleSlot(time_slot=times[i], room=rooms[i % rooms_count],
+                     defense=defenses[i] if i < len(defenses) else None, time_index=i)
+        for i in range(args.slots)
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Save and load time of the project file formats on a large synthetic project.
+
+    python benchmarks/bench_project_io.py [--persons 600] [--intervals 40] [--defenses 8000] [--runs 5]
+
+Writes the same project as format 1 and format 2 to a temp directory and reports the
+file size, the median save time and the median load time, split into json.load and
+project_from_dict (parsing plus rebuilding the schedule grid).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.algorithm.scheduler import SchedulingAlgorithm  # noqa: E402
+from src.models import Defense, Person, Role, Room, SessionParameters, TimeSlot  # noqa: E402
+from src.utils.project_io import project_from_dict, save_project  # noqa: E402
+
+
+def median_time(fn, runs):
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t)
+    return statistics.median(times), result
+
+
+def build_project(persons_count, intervals, defenses_count):
+    params = SessionParameters(date(2025, 6, 20), "08:00", "20:00", 30, room_count=40)
+    rooms = [Room(f"Room {i}", str(100 + i)) for i in range(params.room_count)]
+    origin = datetime.combine(params.session_date, datetime.min.time())
+    persons = []
+    for i in range(persons_count):
+        p = Person(f"Person {i}", f"person{i}@example.edu", roles={Role.SUPERVISOR, Role.REVIEWER, Role.CHAIRMAN})
+        # krótkie przedziały rozrzucone po całej dobie (nie zlewają się)
+        p.unavailable_slots = [TimeSlot(origin + timedelta(minutes=(i * 7 + k * 35) % 1400),
+                                        origin + timedelta(minutes=(i * 7 + k * 35) % 1400 + 20))
+                               for k in range(intervals)]
+        persons.append(p)
+    defenses = [Defense(f"Student {i}", f"Thesis {i}", persons[i % persons_count], persons[(i + 1) % persons_count])
+                for i in range(defenses_count)]
+    # obrony na kolejnych komórkach siatki (ile się zmieści), reszta nieprzypisana
+    slots = SchedulingAlgorithm(parameters=params, rooms=rooms, available_chairmen=[]).create_empty_schedule().slots
+    for i, (d, slot) in enumerate(zip(defenses, slots)):
+        d.time_slot, d.room, d.chairman = slot.time_slot, slot.room, persons[(i + 2) % persons_count]
+    return persons, defenses, rooms, params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--persons", type=int, default=600)
+    parser.add_argument("--intervals", type=int, default=40)
+    parser.add_argument("--defenses", type=int, default=8000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    persons, defenses, rooms, params = build_project(args.persons, args.intervals, args.defenses)
+    print(f"{'format':<8}{'size':>10}{'save':>10}{'json.load':>11}{'from_dict':>11}{'load':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in (1, 2):
+            path = os.path.join(tmp, f"project_v{version}.json")
+            save, _ = median_time(lambda: save_project(path, persons, defenses, rooms, params, version=version),
+                                  args.runs)
+
+            def read():
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+
+            t_json, data = median_time(read, args.runs)
+            t_dict, _ = median_time(lambda: project_from_dict(data), args.runs)
+            print(f"v{version:<7}{os.path.getsize(path) / 1e6:8.2f}MB{save * 1000:8.0f}ms{t_json * 1000:9.0f}ms"
+                  f"{t_dict * 1000:9.0f}ms{(t_json + t_dict) * 1000:7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+GUI startup latency: module import and first paint of the main window.
+
+    python benchmarks/bench_startup.py [--runs 5] [--no-gui]
+
+Every run is a fresh interpreter (cold module cache, warm .pyc). Reports the median
+import time of `src.gui.main_window`, which heavy modules that import pulled in, and
+the time from interpreter start of the import to the first painted main window
+(skipped without a display). Autosave and the result cache point to a temp directory
+so no recovery prompt or cache scan distorts the numbers.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# moduły, których GUI nie potrzebuje do pierwszego wyświetlenia okna
+HEAVY = ("fpdf", "fontTools", "PIL", "multiprocessing", "concurrent.futures", "src.utils.schedule_exporter",
+         "src.utils.booklets", "src.utils.availability_import")
+
+_IMPORT = """
+import json, sys, time
+t = time.perf_counter()
+import src.gui.main_window
+print(json.dumps({"import": time.perf_counter() - t, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+_PAINT = """
+import json, time
+t = time.perf_counter()
+import tkinter as tk
+from src.gui.main_window import MainWindow
+imported = time.perf_counter() - t
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print(json.dumps({"import": imported, "paint": None}))
+    raise SystemExit
+MainWindow(root)
+root.update()
+while not root.winfo_viewable():
+    root.update()
+painted = time.perf_counter() - t
+# pierwsze przełączenie na zakładkę budowaną leniwie
+s = time.perf_counter()
+notebook = [w for w in root.winfo_children() if w.winfo_class() == "TNotebook"][0]
+notebook.select(1)
+root.update()
+print(json.dumps({"import": imported, "paint": painted, "schedule_tab": time.perf_counter() - s}))
+root.destroy()
+"""
+
+
+def run(code: str, env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-gui", action="store_true", help="measure the import only")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, TDS_AUTOSAVE_DIR=os.path.join(tmp, "autosave"), TDS_CACHE_DIR=os.path.join(tmp, "cache"))
+        subprocess.run([sys.executable, "-c", "import src.gui.main_window"], cwd=ROOT, env=env, check=True)  # .pyc
+
+        imports = [run(_IMPORT % (HEAVY,), env) for _ in range(args.runs)]
+        print(f"import src.gui.main_window   {statistics.median(r['import'] for r in imports) * 1000:8.1f} ms"
+              f"   (median of {args.runs})")
+        print(f"heavy modules loaded         {', '.join(imports[0]['loaded']) or 'none'}")
+        if args.no_gui:
+            return
+
+        paints = [run(_PAINT, env) for _ in range(args.runs)]
+        if paints[0]["paint"] is None:
+            print("first paint                  n/a (no display)")
+            return
+        print(f"import + first paint         {statistics.median(r['paint'] for r in paints) * 1000:8.1f} ms")
+        print(f"Schedule tab on first open   {statistics.median(r['schedule_tab'] for r in paints) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
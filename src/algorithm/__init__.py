@@ -3,17 +3,29 @@ from .scheduler import (
     ScheduleSlot,
     SchedulingAlgorithm,
     SchedulingConflict,
+    SchedulingCancelled,
     ConflictChecker
 )
 from .simple_scheduler import SimpleGreedyScheduler, PriorityGreedyScheduler
+from .backtracking_scheduler import BacktrackingScheduler
 from .optimizer import ScheduleOptimizer, OptimizationWeights
 
+# nazwy algorytmów (te same co w GUI) -> klasy schedulerów
+ALGORITHMS = {
+    'simple': SimpleGreedyScheduler,
+    'priority': PriorityGreedyScheduler,
+    'backtracking': BacktrackingScheduler,
+}
+
 __all__ = [
     'Schedule',
     'ScheduleSlot',
     'SchedulingAlgorithm',
     'SchedulingConflict',
+    'SchedulingCancelled',
     'ConflictChecker',
     'SimpleGreedyScheduler',
-    'PriorityGreedyScheduler'
-]
\ No newline at end of file
+    'PriorityGreedyScheduler',
+    'BacktrackingScheduler',
+    'ALGORITHMS'
+]
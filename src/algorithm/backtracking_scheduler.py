@@ -1,6 +1,6 @@
 # file: src/algorithm/backtracking_scheduler.py
 from __future__ import annotations
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import time
 
 from src.models import Defense, Person
@@ -11,6 +11,7 @@ class BacktrackingScheduler(SchedulingAlgorithm):
     """
     Any-time backtracking:
     - warm-start z PriorityGreedy (żeby nigdy nie być gorszym),
+    - opcjonalny incumbent (`initial`, np. wczytany harmonogram) – przeszukiwanie startuje od niego,
     - MRV: w każdym kroku wybieramy obronę z najmniejszą liczbą *aktualnie* dostępnych slotów,
     - min-conflicts dla przewodniczącego,
     - budżet: limit czasu i limit liczby odwiedzonych węzłów,
@@ -22,42 +23,66 @@ class BacktrackingScheduler(SchedulingAlgorithm):
     NODE_LIMIT: int = 1_000_000          # górny limit liczby węzłów (prób umieszczeń)
 
     # ---------- API ----------
-    def schedule(self, defenses: List[Defense]) -> Tuple[Schedule, List[SchedulingConflict]]:
-        # 1) dwa baseline’y: simple i priority — bierzemy lepszy
-        from .simple_scheduler import SimpleGreedyScheduler, PriorityGreedyScheduler
-
-        simple_sched, simple_conf = SimpleGreedyScheduler(
-            parameters=self.parameters,
-            rooms=self.rooms,
-            available_chairmen=self.available_chairmen
-        ).schedule(defenses)
+    def get_settings(self) -> dict:
+        return {"time_limit_sec": self.TIME_LIMIT_SEC, "node_limit": self.NODE_LIMIT}
 
-        priority_sched, priority_conf = PriorityGreedyScheduler(
-            parameters=self.parameters,
-            rooms=self.rooms,
-            available_chairmen=self.available_chairmen
-        ).schedule(defenses)
+    def schedule(self, defenses: List[Defense],
+                 initial: Optional[Schedule] = None) -> Tuple[Schedule, List[SchedulingConflict]]:
+        from .simple_scheduler import SimpleGreedyScheduler, PriorityGreedyScheduler
 
         def _score(s: Schedule) -> int:
             return len(s.get_scheduled_defenses())
 
-        baseline_sched, baseline_conflicts = (
-            (priority_sched, priority_conf)
-            if _score(priority_sched) >= _score(simple_sched)
-            else (simple_sched, simple_conf)
-        )
-
-        # 2) inicjalizacja BT (any-time)
+        def _assignments(s: Schedule) -> list:
+            # kolejne przebiegi przestawiają te same obiekty Defense – zapamiętaj przydziały, żeby dało się je przywrócić
+            return [(sl, sl.defense, sl.defense.chairman) for sl in s.slots if sl.defense]
+
+        candidates = []
+        if initial is not None:
+            # warm-start: incumbent = wykonalna część `initial`, dopełniona zachłannie. Komplet
+            # kończy pracę od razu; w przeciwnym razie jest tylko wynikiem do pobicia.
+            incumbent = self.seed_schedule(defenses, initial)
+            if _score(incumbent) == len(defenses):
+                self._report_progress(len(defenses), len(defenses))
+                return incumbent, []
+            warm_sched, warm_conf = PriorityGreedyScheduler(
+                parameters=self.parameters,
+                rooms=self.rooms,
+                available_chairmen=self.available_chairmen,
+                progress_callback=self._baseline_progress
+            ).schedule(defenses, initial=incumbent)
+            if _score(warm_sched) == len(defenses):
+                self._report_progress(len(defenses), len(defenses))
+                return warm_sched, warm_conf
+            candidates.append((warm_sched, warm_conf, _assignments(warm_sched)))
+
+        # 1) baseline'y od zera: priority i simple — bierzemy najlepszy (remis: incumbent, potem priority)
+        for baseline in (PriorityGreedyScheduler, SimpleGreedyScheduler):
+            sched, conf = baseline(
+                parameters=self.parameters,
+                rooms=self.rooms,
+                available_chairmen=self.available_chairmen,
+                progress_callback=self._baseline_progress
+            ).schedule(defenses)
+            candidates.append((sched, conf, _assignments(sched)))
+        best = max(_score(c[0]) for c in candidates)
+        baseline_sched, baseline_conflicts, baseline_assignments = next(c for c in candidates if _score(c[0]) == best)
+
+        # postęp raportujemy jako "najlepszy dotąd" – nigdy poniżej baseline'u
+        self._progress_total = len(defenses)
+        self._progress_best = _score(baseline_sched)
+        self._report_progress(self._progress_best, self._progress_total)
+
+        # 2) inicjalizacja BT (any-time) – zawsze od pustej siatki, żeby przydziały incumbenta też mogły się przesunąć
         start = time.perf_counter()
         node_counter = 0
-        empty = self.create_empty_schedule()
-
+        root = self.create_empty_schedule()
         remaining: List[Defense] = list(defenses)
         best_assignments: List[tuple[Defense, ScheduleSlot, Person]] = []
         best_count: int = 0
 
         self._bt(
-            schedule=empty,
+            schedule=root,
             remaining=remaining,
             start_time=start,
             node_counter_ref=[node_counter],
@@ -67,7 +92,8 @@ class BacktrackingScheduler(SchedulingAlgorithm):
         # 3) zbuduj schedule z najlepszego częściowego wyniku BT
         bt_sched = self.create_empty_schedule()
         for d, slot, chair in best_assignments:
-            target = self._find_slot(bt_sched, slot.time_slot, slot.room)
+            cell = self.grid.cell(slot.time_index, slot.room.number)
+            target = bt_sched.slots[cell] if cell is not None else None
             if target and target.is_free():
                 bt_sched.add_defense(d, target, chair)
 
@@ -75,8 +101,14 @@ class BacktrackingScheduler(SchedulingAlgorithm):
         if _score(bt_sched) >= _score(baseline_sched):
             return bt_sched, self._conflicts_for_unplaced(defenses, bt_sched)
         else:
+            for sl, d, chair in baseline_assignments:
+                baseline_sched.add_defense(d, sl, chair)
             return baseline_sched, baseline_conflicts
 
+    def _baseline_progress(self, placed: int, total: int) -> None:
+        # baseline'y to osobne instancje – przerwanie ma dotrzeć także do nich
+        self._check_cancelled()
+
     # ---------- backtracking core ----------
 
     def _bt(self,
@@ -86,7 +118,8 @@ class BacktrackingScheduler(SchedulingAlgorithm):
             node_counter_ref: List[int],
             best_ref: List[object]) -> bool:
         """Zwraca True tylko gdy udało się umieścić WSZYSTKIE obrony przed upływem limitów."""
-        # budżet
+        # budżet (i przerwanie z zewnątrz)
+        self._check_cancelled()
         if (time.perf_counter() - start_time) > self.TIME_LIMIT_SEC:
             return False
         if node_counter_ref[0] > self.NODE_LIMIT:
@@ -101,6 +134,9 @@ class BacktrackingScheduler(SchedulingAlgorithm):
             for sl in schedule.slots:
                 if sl.defense and sl.defense.chairman:
                     best_ref[1].append((sl.defense, sl, sl.defense.chairman))
+            if placed_now > self._progress_best:
+                self._progress_best = placed_now
+                self._report_progress(placed_now, self._progress_total)
 
             # jeśli już mamy komplet – sukces globalny
             if placed_now == len(remaining) + placed_now:  # tautologia, ale zostawiamy czytelnie
@@ -139,11 +175,10 @@ class BacktrackingScheduler(SchedulingAlgorithm):
     def _feasible_slots(self, defense: Defense, schedule: Schedule) -> List[ScheduleSlot]:
         feas: List[ScheduleSlot] = []
         for slot in schedule.get_free_slots():
-            ok, _ = self.can_schedule_defense(defense, slot, schedule)
-            if ok:
+            if self.fit_defense(defense, slot, schedule) is not None:
                 feas.append(slot)
         # porządek: najwcześniejsze najpierw (stabilniejsze wyniki)
-        feas.sort(key=lambda s: (s.time_slot.start, s.room.number))
+        feas.sort(key=lambda s: (s.time_index, s.room.number))
         return feas
 
     def _pick_mrv_defense(self, remaining: List[Defense], schedule: Schedule):
@@ -159,33 +194,30 @@ class BacktrackingScheduler(SchedulingAlgorithm):
                 best_i, best_d, best_domain = i, d, dom
         return best_i, best_d, best_domain
 
-    def _chairman_candidates(self, defense: Defense) -> List[Person]:
-        """Preferuj osoby spoza komisji; dopuszczaj promotora/recenzenta gdy trzeba."""
-        sup = defense.supervisor.email
-        rev = defense.reviewer.email
-        cands = list(self.available_chairmen)
-        cands.sort(key=lambda p: (p.email in (sup, rev), p.email))  # spoza komisji najpierw
-        return cands
-
     def _pick_chairman_min_conflicts(self, defense: Defense, slot: ScheduleSlot, schedule: Schedule) -> Optional[Person]:
         """Wybierz przewodniczącego z minimalnym 'konfliktem w przyszłości' (min-conflicts)."""
         best: Optional[Person] = None
         best_score = float("inf")
-        scheduled = schedule.get_scheduled_defenses()
+        i = slot.time_index
 
-        for cand in self._chairman_candidates(defense):
+        # wolne sloty (bez bieżącego czasu) zliczone per indeks czasu + zajętość osób w tych czasach
+        free_count: Dict[int, int] = {}
+        for other_slot in schedule.get_free_slots():
+            if other_slot.time_index != i:
+                free_count[other_slot.time_index] = free_count.get(other_slot.time_index, 0) + 1
+        booked_at = {j: self._booked_at(schedule, j) for j in free_count}
+        booked_now = self._booked_at(schedule, i)
+
+        for pid, cand in self._chairman_candidate_ids(self.instance.defense_id(defense)):
             # czy dostępny teraz?
-            if self.conflict_checker.check_person_availability(cand, slot.time_slot, scheduled) is not None:
+            if not self._is_free(pid, i, booked_now):
                 continue
 
             # policz "przyszłe konflikty": w ilu slotach mógłby on jeszcze pracować
             score = 0
-            for other_slot in schedule.get_free_slots():
-                # liczymy tylko sloty, które nie kolidują czasowo
-                if other_slot.time_slot == slot.time_slot:
-                    continue
-                if self.conflict_checker.check_person_availability(cand, other_slot.time_slot, scheduled) is not None:
-                    score += 1  # im większy score, tym gorzej
+            for j, count in free_count.items():
+                if not self._is_free(pid, j, booked_at[j]):
+                    score += count  # im większy score, tym gorzej
 
             if score < best_score:
                 best_score = score
@@ -193,17 +225,16 @@ class BacktrackingScheduler(SchedulingAlgorithm):
 
         return best
 
-    def _find_slot(self, schedule: Schedule, time_slot, room) -> Optional[ScheduleSlot]:
-        for s in schedule.slots:
-            if s.time_slot == time_slot and s.room == room:
-                return s
-        return None
-
     def _conflicts_for_unplaced(self, all_defenses: List[Defense], schedule: Schedule) -> List[SchedulingConflict]:
-        # zamiast set(defense) użyj set(id(defense)) – obiekty Defense są niehashowalne
-        placed_ids = {id(d) for d in schedule.get_scheduled_defenses()}
+        # Defense jest niehashowalny – flagi indeksowane gęstym id z CompiledInstance
+        inst = self.instance
+        placed_ids = [inst.defense_id(d) for d in schedule.get_scheduled_defenses()]
+        all_ids = [inst.defense_id(d) for d in all_defenses]
+        placed = bytearray(len(inst.defenses))
+        for did in placed_ids:
+            placed[did] = 1
         ret: List[SchedulingConflict] = []
-        for d in all_defenses:
-            if id(d) not in placed_ids:
+        for d, did in zip(all_defenses, all_ids):
+            if not placed[did]:
                 ret.append(SchedulingConflict(f"Could not schedule defense for {d.student_name}", defense=d))
         return ret
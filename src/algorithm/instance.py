@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Optional
+
+from src.models import Person, Defense, Room
+from src.algorithm.time_model import TimeModel
+
+
+class CompiledInstance:
+    """
+    Dense integer ids for the persons, defenses and rooms of one run, plus lookup tables.
+
+    Persons are interned by email, rooms by value and defenses by identity, so the
+    algorithm layer can work on list indices and integer sets. Objects seen for the
+    first time are interned on demand; ids never change during the instance's lifetime.
+    """
+
+    def __init__(self, time_model: Optional[TimeModel] = None, defenses: Iterable[Defense] = (),
+                 persons: Iterable[Person] = (), rooms: Iterable[Room] = ()):
+        self.time_model = time_model
+
+        self.persons: List[Person] = []
+        self.unavailable: List[int] = []    # person id -> bitmask zablokowanych slotów siatki
+        self.defenses: List[Defense] = []
+        self.supervisor: List[int] = []     # defense id -> person id
+        self.reviewer: List[int] = []       # defense id -> person id
+        self.rooms: List[Room] = []
+
+        self._person_by_email: Dict[str, int] = {}
+        self._person_by_obj: Dict[int, int] = {}
+        self._defense_by_obj: Dict[int, int] = {}
+        self._room_ids: Dict[Room, int] = {}
+        # trzymamy referencje, żeby id() obiektów z cache nie zostały użyte ponownie
+        self._pinned: List[object] = []
+
+        for p in persons:
+            self.person_id(p)
+        for r in rooms:
+            self.room_id(r)
+        for d in defenses:
+            self.defense_id(d)
+
+    def person_id(self, person: Person) -> int:
+        pid = self._person_by_obj.get(id(person))
+        if pid is not None:
+            return pid
+        pid = self._person_by_email.get(person.email)
+        if pid is None:
+            pid = len(self.persons)
+            self.persons.append(person)
+            self._person_by_email[person.email] = pid
+            self.unavailable.append(
+                self.time_model.blocked_mask(person.unavailable_slots) if self.time_model else 0
+            )
+        self._person_by_obj[id(person)] = pid
+        self._pinned.append(person)
+        return pid
+
+    def defense_id(self, defense: Defense) -> int:
+        did = self._defense_by_obj.get(id(defense))
+        if did is None:
+            did = len(self.defenses)
+            self.defenses.append(defense)
+            self.supervisor.append(self.person_id(defense.supervisor))
+            self.reviewer.append(self.person_id(defense.reviewer))
+            self._defense_by_obj[id(defense)] = did
+        return did
+
+    def room_id(self, room: Room) -> int:
+        rid = self._room_ids.get(room)
+        if rid is None:
+            rid = len(self.rooms)
+            self.rooms.append(room)
+            self._room_ids[room] = rid
+        return rid
+
+    def committee_ids(self, defense: Defense) -> List[int]:
+        """Person ids of supervisor, reviewer and (if set) chairman, in get_committee() order."""
+        did = self.defense_id(defense)
+        ids = [self.supervisor[did], self.reviewer[did]]
+        if defense.chairman is not None:
+            ids.append(self.person_id(defense.chairman))
+        return ids
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict
 
+from src.algorithm.instance import CompiledInstance
 from src.algorithm.scheduler import Schedule, ScheduleSlot, SchedulingAlgorithm
 
 
@@ -17,8 +18,16 @@ class OptimizationWeights:
 class ScheduleOptimizer:
     def __init__(self, weights: OptimizationWeights = OptimizationWeights()):
         self.w = weights
+        # id osób z instancji algorytmu (koszt liczony na int-ach zamiast emaili)
+        self._instance: Optional[CompiledInstance] = None
+
+    def _ids(self) -> CompiledInstance:
+        if self._instance is None:
+            self._instance = CompiledInstance()
+        return self._instance
 
     def optimize(self, algo: SchedulingAlgorithm, schedule: Schedule, max_iters: int = 300) -> Schedule:
+        self._instance = algo.instance
         best_cost = self._cost(schedule)
         all_slots = [s for s in schedule.slots if s.time_slot]
 
@@ -104,15 +113,13 @@ class ScheduleOptimizer:
 
         # feasibility
         if da:
-            can_a, _ = algo.can_schedule_defense(da, b, schedule)
-            if not can_a:
+            if algo.fit_defense(da, b, schedule) is None:
                 a.defense = da; b.defense = db
                 if da: da.time_slot, da.room, da.chairman = a.time_slot, a.room, chair_a
                 if db: db.time_slot, db.room, db.chairman = b.time_slot, b.room, chair_b
                 return False
         if db:
-            can_b, _ = algo.can_schedule_defense(db, a, schedule)
-            if not can_b:
+            if algo.fit_defense(db, a, schedule) is None:
                 a.defense = da; b.defense = db
                 if da: da.time_slot, da.room, da.chairman = a.time_slot, a.room, chair_a
                 if db: db.time_slot, db.room, db.chairman = b.time_slot, b.room, chair_b
@@ -120,7 +127,7 @@ class ScheduleOptimizer:
 
         # wstaw da -> b
         if da:
-            chair = algo.find_available_chairman(da, b.time_slot, schedule.get_scheduled_defenses())
+            chair = algo.chairman_for_slot(da, b, schedule)
             if not chair:
                 a.defense = da; b.defense = db
                 if da: da.time_slot, da.room, da.chairman = a.time_slot, a.room, chair_a
@@ -130,7 +137,7 @@ class ScheduleOptimizer:
 
         # wstaw db -> a
         if db:
-            chair = algo.find_available_chairman(db, a.time_slot, schedule.get_scheduled_defenses())
+            chair = algo.chairman_for_slot(db, a, schedule)
             if not chair:
                 if b.defense is da:
                     b.defense = None
@@ -154,13 +161,7 @@ class ScheduleOptimizer:
         src.defense = None
         d.time_slot = None; d.room = None; d.chairman = None
 
-        can, _ = algo.can_schedule_defense(d, dst, schedule)
-        if not can:
-            src.defense = d
-            d.time_slot, d.room, d.chairman = src.time_slot, src.room, old_chair
-            return False
-
-        chair = algo.find_available_chairman(d, dst.time_slot, schedule.get_scheduled_defenses())
+        chair = algo.fit_defense(d, dst, schedule)
         if not chair:
             src.defense = d
             d.time_slot, d.room, d.chairman = src.time_slot, src.room, old_chair
@@ -192,14 +193,14 @@ class ScheduleOptimizer:
 
         penalty = 0.0
         by_room: Dict[str, List[ScheduleSlot]] = defaultdict(list)
-        by_person: Dict[str, List[ScheduleSlot]] = defaultdict(list)
+        by_person: Dict[int, List[ScheduleSlot]] = defaultdict(list)
+        ids = self._ids()
 
         for s in schedule.slots:
             if not s.defense: continue
             by_room[s.room.number].append(s)
-            for p in s.defense.get_committee():
-                key = getattr(p, "email", str(id(p)))
-                by_person[key].append(s)
+            for pid in ids.committee_ids(s.defense):
+                by_person[pid].append(s)
 
         for slots in by_room.values(): penalty += timeline_gaps(slots)
         for slots in by_person.values(): penalty += timeline_gaps(slots)
@@ -212,12 +213,13 @@ class ScheduleOptimizer:
                 buckets[s.time_slot.start].append(s)
         times = sorted(buckets.keys())
 
-        def people(slots: List[ScheduleSlot]) -> set[str]:
-            emails = set()
+        ids = self._ids()
+
+        def people(slots: List[ScheduleSlot]) -> set[int]:
+            pids = set()
             for sl in slots:
-                for p in sl.defense.get_committee():
-                    emails.add(getattr(p, "email", str(id(p))))
-            return emails
+                pids.update(ids.committee_ids(sl.defense))
+            return pids
 
         bonus = 0.0
         for i in range(1, len(times)):
@@ -227,10 +229,10 @@ class ScheduleOptimizer:
 
     def _chairman_block_bonus(self, schedule: Schedule) -> float:
         by_chair = defaultdict(list)
+        ids = self._ids()
         for s in schedule.slots:
             if s.defense and s.defense.chairman:
-                email = getattr(s.defense.chairman, "email", str(id(s.defense.chairman)))
-                by_chair[email].append(s)
+                by_chair[ids.person_id(s.defense.chairman)].append(s)
 
         bonus = 0.0
         for slots in by_chair.values():
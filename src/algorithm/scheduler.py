@@ -1,29 +1,77 @@
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from src.models import Person, Defense, Room, TimeSlot, SessionParameters
+from src.algorithm.slot_grid import SlotGrid, slot_grid_for
+from src.algorithm.time_model import TimeModel
+from src.algorithm.instance import CompiledInstance
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleSlot:
     time_slot: TimeSlot
     room: Room
     defense: Optional[Defense] = None
+    # indeks slotu czasowego w TimeModel (None dla slotów spoza siatki)
+    time_index: Optional[int] = None
 
     def is_free(self) -> bool:
         return self.defense is None
 
 
+# (zdarzenie, obrona, slot) – zdarzenie: "add" | "remove" | "move" | "chairman"; slot = obecny slot obrony
+ScheduleListener = Callable[[str, Defense, Optional[ScheduleSlot]], None]
+
+
 @dataclass
 class Schedule:
     slots: List[ScheduleSlot] = field(default_factory=list)
+    # rośnie przy każdej zmianie wykonanej przez metody Schedule
+    version: int = field(default=0, init=False, compare=False)
+    _by_time: Dict[int, List[ScheduleSlot]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_time_count: int = field(default=0, init=False, repr=False, compare=False)
+    _listeners: List[ScheduleListener] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def slots_at(self, time_index: int) -> List[ScheduleSlot]:
+        """All room slots sharing one grid time index (index rebuilt when slots are appended)."""
+        if self._by_time_count != len(self.slots):
+            self._by_time = {}
+            for slot in self.slots:
+                if slot.time_index is not None:
+                    self._by_time.setdefault(slot.time_index, []).append(slot)
+            self._by_time_count = len(self.slots)
+        return self._by_time.get(time_index, [])
+
+    # --- powiadomienia o zmianach ---
+
+    def subscribe(self, listener: ScheduleListener) -> None:
+        """Call `listener` after every add/remove/move/chairman change made through this object."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ScheduleListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, defense: Defense, slot: Optional[ScheduleSlot]) -> None:
+        self.version += 1
+        if self._listeners:
+            for listener in list(self._listeners):
+                listener(event, defense, slot)
+
+    def find_slot(self, defense: Defense) -> Optional[ScheduleSlot]:
+        for slot in self.slots:
+            if slot.defense is defense:
+                return slot
+        return None
+
+    # --- mutacje ---
 
     def add_defense(self, defense: Defense, slot: ScheduleSlot, chairman: Person) -> None:
         defense.time_slot = slot.time_slot
         defense.room = slot.room
         defense.chairman = chairman
         slot.defense = defense
+        self._notify("add", defense, slot)
 
     def get_scheduled_defenses(self) -> List[Defense]:
         return [slot.defense for slot in self.slots if slot.defense]
@@ -38,8 +86,29 @@ class Schedule:
                 defense.time_slot = None
                 defense.room = None
                 defense.chairman = None
+                self._notify("remove", defense, None)
                 break
 
+    def move_defense(self, defense: Defense, target: ScheduleSlot) -> None:
+        """Move an already placed defense to a free slot, keeping its chairman."""
+        source = self.find_slot(defense)
+        if source is None:
+            raise ValueError(f"{defense.student_name}'s defense is not in this schedule")
+        if target is source:
+            return
+        if not target.is_free():
+            raise ValueError(f"Slot {target.time_slot} in room {target.room.number} is occupied")
+        source.defense = None
+        target.defense = defense
+        defense.time_slot = target.time_slot
+        defense.room = target.room
+        self._notify("move", defense, target)
+
+    def set_chairman(self, defense: Defense, chairman: Person) -> None:
+        """Replace the chairman of a placed defense."""
+        defense.chairman = chairman
+        self._notify("chairman", defense, self.find_slot(defense))
+
 
 class SchedulingConflict:
     def __init__(self, message: str, defense: Optional[Defense] = None,
@@ -95,53 +164,170 @@ class ConflictChecker:
         return conflicts
 
 
+ProgressCallback = Callable[[int, int], None]
+
+
+class SchedulingCancelled(Exception):
+    """Raised out of `schedule()` once `cancel()` was called (e.g. from the GUI thread)."""
+
+
 class SchedulingAlgorithm:
     def __init__(self, parameters: SessionParameters, rooms: List[Room],
-                 available_chairmen: List[Person]):
+                 available_chairmen: List[Person],
+                 progress_callback: Optional[ProgressCallback] = None):
         self.parameters = parameters
         self.rooms = rooms
         self.available_chairmen = available_chairmen
         self.conflict_checker = ConflictChecker()
+        # (umieszczone, wszystkie) – wołane przez schedulery w trakcie pracy
+        self.progress_callback = progress_callback
+        self._cancelled = False
+        # skompilowane dane (liczone leniwie, raz na instancję)
+        self._time_model: Optional[TimeModel] = None
+        self._grid: Optional[SlotGrid] = None
+        self._instance: Optional[CompiledInstance] = None
+        self._chairs: Optional[List[Tuple[int, Person]]] = None
+
+    def get_settings(self) -> dict:
+        """Tunables that influence the result (part of the result-cache key)."""
+        return {}
+
+    def cancel(self) -> None:
+        """Ask a running `schedule()` to stop; it raises SchedulingCancelled at its next check."""
+        self._cancelled = True
+
+    def _check_cancelled(self) -> None:
+        if self._cancelled:
+            raise SchedulingCancelled(f"{type(self).__name__} cancelled")
+
+    def _report_progress(self, placed: int, total: int) -> None:
+        self._check_cancelled()
+        if self.progress_callback is not None:
+            self.progress_callback(placed, total)
+
+    # --- compiled time model ---
+
+    @property
+    def grid(self) -> SlotGrid:
+        """Shared rooms × slots grid (compiled once per session parameters and rooms)."""
+        if self._grid is None:
+            self._grid = slot_grid_for(self.parameters, self.rooms)
+        return self._grid
+
+    @property
+    def time_model(self) -> TimeModel:
+        if self._time_model is None:
+            self._time_model = self.grid.time_model
+        return self._time_model
+
+    @property
+    def instance(self) -> CompiledInstance:
+        """Integer ids and lookup tables for this run (persons/defenses interned on first use)."""
+        if self._instance is None:
+            self._instance = CompiledInstance(self.time_model, persons=self.available_chairmen,
+                                              rooms=self.rooms)
+        return self._instance
+
+    def unavailable_mask(self, person: Person) -> int:
+        """Grid slots `person` declared as unavailable, as a bitmask (bit i = slot i)."""
+        inst = self.instance
+        return inst.unavailable[inst.person_id(person)]
+
+    def _booked_at(self, schedule: Schedule, time_index: int) -> Dict[int, Defense]:
+        """person id -> defense for everyone sitting on a committee at the given slot index."""
+        booked: Dict[int, Defense] = {}
+        for slot in schedule.slots_at(time_index):
+            d = slot.defense
+            if d is None:
+                continue
+            for pid in self.instance.committee_ids(d):
+                booked.setdefault(pid, d)
+        return booked
+
+    def _is_free(self, pid: int, time_index: int, booked: Dict[int, Defense]) -> bool:
+        return not (self.instance.unavailable[pid] >> time_index) & 1 and pid not in booked
+
+    def _committee_free(self, did: int, time_index: int, booked: Dict[int, Defense]) -> bool:
+        inst = self.instance
+        return (self._is_free(inst.supervisor[did], time_index, booked) and
+                self._is_free(inst.reviewer[did], time_index, booked))
 
     def generate_time_slots(self) -> List[TimeSlot]:
-        slots: List[TimeSlot] = []
-        sh, sm = map(int, self.parameters.start_time.split(':'))
-        eh, em = map(int, self.parameters.end_time.split(':'))
-
-        current_time = datetime.combine(
-            self.parameters.session_date,
-            datetime.min.time().replace(hour=sh, minute=sm)
-        )
-        end_time = datetime.combine(
-            self.parameters.session_date,
-            datetime.min.time().replace(hour=eh, minute=em)
-        )
-        step = timedelta(minutes=self.parameters.defense_duration)
-
-        while current_time + step <= end_time:
-            slot = TimeSlot(start=current_time, end=current_time + step)
-            if not any(slot.overlaps_with(b) for b in (self.parameters.breaks or [])):
-                slots.append(slot)
-            current_time += step
-        return slots
+        return list(self.time_model.time_slots)
 
     def create_empty_schedule(self) -> Schedule:
-        schedule = Schedule()
-        for ts in self.generate_time_slots():
-            for room in self.rooms[: self.parameters.room_count]:
-                schedule.slots.append(ScheduleSlot(time_slot=ts, room=room))
+        """Fresh slots in grid cell order (slot i of the schedule is cell i of `self.grid`)."""
+        grid = self.grid
+        return Schedule([ScheduleSlot(time_slot=ts, room=room, time_index=i)
+                         for i, ts in enumerate(grid.time_slots) for room in grid.rooms])
+
+    def seed_schedule(self, defenses: List[Defense], initial: Optional[Schedule] = None) -> Schedule:
+        """
+        Empty grid with the still-feasible part of `initial` already placed (warm start).
+        Only defenses from `defenses` are copied; an assignment is dropped when its slot no longer
+        exists or the committee clashes, and its chairman is replaced when no longer available.
+        """
+        schedule = self.create_empty_schedule()
+        if not initial:
+            return schedule
+
+        wanted = {id(d) for d in defenses}
+        # snapshot przed jakąkolwiek mutacją – initial zwykle dzieli obiekty Defense z `defenses`
+        placements = [
+            (s.defense, s.time_slot.start, s.room.number, s.defense.chairman)
+            for s in initial.slots if s.defense is not None and id(s.defense) in wanted
+        ]
+        grid = self.grid
+        inst = self.instance
+        chair_ids = {pid for pid, _ in self._chair_order()}
+
+        for defense, start, room_number, chairman in placements:
+            cell = grid.cell_at(start, room_number)
+            slot = schedule.slots[cell] if cell is not None else None
+            if slot is None or not slot.is_free():
+                continue
+            i = slot.time_index
+            did = inst.defense_id(defense)
+            booked = self._booked_at(schedule, i)
+            if not self._committee_free(did, i, booked):
+                continue
+            if chairman is not None:
+                pid = inst.person_id(chairman)
+                if pid not in chair_ids or not self._is_free(pid, i, booked):
+                    chairman = None
+            if chairman is None:
+                chairman = self._free_chairman(did, i, booked)
+            if chairman is None:
+                continue
+            schedule.add_defense(defense, slot, chairman)
         return schedule
 
     # --- chairman ---
 
-    def _chairman_candidates(self, defense: Defense) -> List[Person]:
+    def _chair_order(self) -> List[Tuple[int, Person]]:
+        """(person id, person) of all available chairmen, sorted by email."""
+        if self._chairs is None:
+            self._chairs = [(self.instance.person_id(p), p)
+                            for p in sorted(self.available_chairmen, key=lambda p: p.email)]
+        return self._chairs
+
+    def _chairman_candidate_ids(self, did: int) -> List[Tuple[int, Person]]:
         """DOPUSZCZA promotora/recenzenta jako przewodniczącego, ale preferuje osoby spoza komisji."""
-        sup_email = defense.supervisor.email
-        rev_email = defense.reviewer.email
-        cands = list(self.available_chairmen)
-        # osoby spoza komisji najpierw (False < True)
-        cands.sort(key=lambda p: (p.email in (sup_email, rev_email), p.email))
-        return cands
+        sup, rev = self.instance.supervisor[did], self.instance.reviewer[did]
+        # osoby spoza komisji najpierw (kolejność jak sort po (w_komisji, email))
+        chairs = self._chair_order()
+        return ([c for c in chairs if c[0] != sup and c[0] != rev] +
+                [c for c in chairs if c[0] == sup or c[0] == rev])
+
+    def _chairman_candidates(self, defense: Defense) -> List[Person]:
+        return [p for _, p in self._chairman_candidate_ids(self.instance.defense_id(defense))]
+
+    def _free_chairman(self, did: int, time_index: int,
+                       booked: Dict[int, Defense]) -> Optional[Person]:
+        for pid, cand in self._chairman_candidate_ids(did):
+            if self._is_free(pid, time_index, booked):
+                return cand
+        return None
 
     def find_available_chairman(self, defense: Defense, time_slot: TimeSlot,
                                 scheduled_defenses: List[Defense]) -> Optional[Person]:
@@ -150,13 +336,57 @@ class SchedulingAlgorithm:
                 return cand
         return None
 
+    def chairman_for_slot(self, defense: Defense, slot: ScheduleSlot, schedule: Schedule) -> Optional[Person]:
+        """First free chairman for a schedule slot (integer path for grid slots)."""
+        if slot.time_index is None:
+            return self.find_available_chairman(defense, slot.time_slot, schedule.get_scheduled_defenses())
+        return self._free_chairman(self.instance.defense_id(defense), slot.time_index,
+                                   self._booked_at(schedule, slot.time_index))
+
+    def fit_defense(self, defense: Defense, slot: ScheduleSlot, schedule: Schedule) -> Optional[Person]:
+        """
+        Chairman to use when `defense` fits into `slot`, None otherwise.
+        Same decision as can_schedule_defense + find_available_chairman, without building messages.
+        """
+        i = slot.time_index
+        if i is None:
+            ok, _ = self.can_schedule_defense(defense, slot, schedule)
+            return self.chairman_for_slot(defense, slot, schedule) if ok else None
+        did = self.instance.defense_id(defense)
+        booked = self._booked_at(schedule, i)
+        if not self._committee_free(did, i, booked):
+            return None
+        return self._free_chairman(did, i, booked)
+
     def can_schedule_defense(self, defense: Defense, slot: ScheduleSlot,
                              schedule: Schedule) -> Tuple[bool, List[SchedulingConflict]]:
-        scheduled = schedule.get_scheduled_defenses()
-        conflicts = self.conflict_checker.check_defense_conflicts(defense, slot.time_slot, scheduled)
-        if conflicts:
-            return False, conflicts
-        chairman = self.find_available_chairman(defense, slot.time_slot, scheduled)
+        i = slot.time_index
+        if i is None:
+            scheduled = schedule.get_scheduled_defenses()
+            conflicts = self.conflict_checker.check_defense_conflicts(defense, slot.time_slot, scheduled)
+            if conflicts:
+                return False, conflicts
+            chairman = self.find_available_chairman(defense, slot.time_slot, scheduled)
+        else:
+            inst = self.instance
+            did = inst.defense_id(defense)
+            booked = self._booked_at(schedule, i)
+            conflicts = []
+            for person, pid in ((defense.supervisor, inst.supervisor[did]), (defense.reviewer, inst.reviewer[did])):
+                if (inst.unavailable[pid] >> i) & 1:
+                    conflicts.append(SchedulingConflict(
+                        f"{person.name} is not available at {slot.time_slot}",
+                        person=person, time_slot=slot.time_slot
+                    ))
+                elif pid in booked:
+                    other = booked[pid]
+                    conflicts.append(SchedulingConflict(
+                        f"{person.name} is already scheduled for {other.student_name}'s defense",
+                        defense=other, person=person, time_slot=slot.time_slot
+                    ))
+            if conflicts:
+                return False, conflicts
+            chairman = self._free_chairman(did, i, booked)
         if not chairman:
             return False, [SchedulingConflict(f"No chairman available for {slot.time_slot}", defense=defense)]
         return True, []
@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from src.algorithm.scheduler import SchedulingAlgorithm, Schedule, SchedulingConflict
 from src.models import Defense
 
@@ -6,30 +6,31 @@ from src.models import Defense
 class SimpleGreedyScheduler(SchedulingAlgorithm):
     """Schedules in given order using the first feasible slot."""
 
-    def schedule(self, defenses: List[Defense]) -> Tuple[Schedule, List[SchedulingConflict]]:
-        schedule = self.create_empty_schedule()
+    def schedule(self, defenses: List[Defense],
+                 initial: Optional[Schedule] = None) -> Tuple[Schedule, List[SchedulingConflict]]:
+        """`initial` (e.g. a loaded schedule) is kept where still feasible; only the rest is placed."""
+        schedule = self.seed_schedule(defenses, initial)
         unresolved: List[SchedulingConflict] = []
+        seeded = {id(d) for d in schedule.get_scheduled_defenses()}
+        placed_count = len(seeded)
 
         for defense in defenses:
+            if id(defense) in seeded:
+                continue
             placed = False
             for slot in schedule.get_free_slots():
-                ok, _ = self.can_schedule_defense(defense, slot, schedule)
-                if not ok:
-                    continue
-
-                # we know a chairman exists because can_schedule_defense() checked it
-                chairman = self.find_available_chairman(
-                    defense, slot.time_slot, schedule.get_scheduled_defenses()
-                )
+                chairman = self.fit_defense(defense, slot, schedule)
                 if not chairman:
                     continue
 
                 schedule.add_defense(defense, slot, chairman)
                 placed = True
+                placed_count += 1
                 break
 
             if not placed:
                 unresolved.append(SchedulingConflict(f"Could not schedule defense for {defense.student_name}", defense))
+            self._report_progress(placed_count, len(defenses))
         return schedule, unresolved
 
 
@@ -47,6 +48,7 @@ class PriorityGreedyScheduler(SimpleGreedyScheduler):
 
         return shared_sup * 2 + shared_rev * 2 + 0.5 * (sup_unav + rev_unav)
 
-    def schedule(self, defenses: List[Defense]) -> Tuple[Schedule, List[SchedulingConflict]]:
+    def schedule(self, defenses: List[Defense],
+                 initial: Optional[Schedule] = None) -> Tuple[Schedule, List[SchedulingConflict]]:
         ordered = sorted(defenses, key=lambda d: self._priority(d, defenses), reverse=True)
-        return super().schedule(ordered)
+        return super().schedule(ordered, initial)
@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+from src.algorithm.time_model import TimeModel, parameters_key, time_model_for
+from src.models import Room, SessionParameters, TimeSlot
+
+
+class SlotGrid:
+    """
+    Rooms × time slots of one session, compiled once and shared (see `slot_grid_for`).
+
+    Cells are numbered time-major – cell = time_index * len(rooms) + room position –
+    which is exactly the order `create_empty_schedule` lays out `schedule.slots`, so a
+    (time, room) lookup is an index into the slot list instead of a dict built per call.
+    Immutable: tuples only, no setters.
+    """
+
+    __slots__ = ("time_model", "rooms", "starts", "ends", "time_slots", "_room_pos", "_time_by_start")
+
+    def __init__(self, time_model: TimeModel, rooms: Sequence[Room]):
+        self.time_model = time_model
+        self.rooms: Tuple[Room, ...] = tuple(rooms)
+        self.starts: Tuple[int, ...] = tuple(time_model.slot_starts)   # minuty od początku sesji
+        self.ends: Tuple[int, ...] = tuple(time_model.slot_ends)
+        self.time_slots: Tuple[TimeSlot, ...] = tuple(time_model.time_slots)
+        self._room_pos: Dict[str, int] = {room.number: i for i, room in enumerate(self.rooms)}
+        self._time_by_start: Dict[datetime, int] = {ts.start: i for i, ts in enumerate(self.time_slots)}
+
+    def __len__(self) -> int:
+        return len(self.time_slots) * len(self.rooms)
+
+    def cell(self, time_index: int, room_number: str) -> Optional[int]:
+        pos = self._room_pos.get(room_number)
+        return None if pos is None else time_index * len(self.rooms) + pos
+
+    def cell_at(self, start: datetime, room_number: str) -> Optional[int]:
+        """Cell of the grid slot starting at `start` in the room, None when there is none."""
+        i = self._time_by_start.get(start)
+        return None if i is None else self.cell(i, room_number)
+
+    def cell_of(self, time_slot: TimeSlot, room_number: str) -> Optional[int]:
+        """Like `cell_at`, but the end must match too."""
+        i = self._time_by_start.get(time_slot.start)
+        if i is None or self.time_slots[i].end != time_slot.end:
+            return None
+        return self.cell(i, room_number)
+
+
+_GRIDS: "OrderedDict[tuple, SlotGrid]" = OrderedDict()
+_GRIDS_LIMIT = 8
+_GRIDS_LOCK = threading.Lock()
+
+
+def slot_grid_for(parameters: SessionParameters, rooms: Sequence[Room]) -> SlotGrid:
+    """Shared grid of the first `parameters.room_count` rooms, cached by value."""
+    rooms = tuple(rooms[: parameters.room_count])
+    key = (parameters_key(parameters), rooms)
+    with _GRIDS_LOCK:
+        grid = _GRIDS.get(key)
+        if grid is not None:
+            _GRIDS.move_to_end(key)
+            return grid
+    grid = SlotGrid(time_model_for(parameters), rooms)
+    with _GRIDS_LOCK:
+        grid = _GRIDS.setdefault(key, grid)
+        while len(_GRIDS) > _GRIDS_LIMIT:
+            _GRIDS.popitem(last=False)
+    return grid
@@ -0,0 +1,132 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.models import IntervalList, SessionParameters, TimeSlot
+
+
+Interval = Tuple[int, int]
+
+
+class TimeModel:
+    """
+    Compiled time representation of one session.
+
+    Every instant is an integer minute offset from the session start (`origin`);
+    grid slots are addressed by index. Datetimes are only touched when converting
+    at the API boundary (`to_minutes`, `interval`, `time_slots`).
+    """
+
+    def __init__(self, parameters: SessionParameters):
+        sh, sm = map(int, parameters.start_time.split(':'))
+        eh, em = map(int, parameters.end_time.split(':'))
+        self.origin = datetime.combine(parameters.session_date,
+                                       datetime.min.time().replace(hour=sh, minute=sm))
+        self.duration = parameters.defense_duration
+        session_end = (eh * 60 + em) - (sh * 60 + sm)
+
+        self.breaks: List[Interval] = sorted(self.interval(b) for b in (parameters.breaks or []))
+
+        self.slot_starts: List[int] = []
+        self.slot_ends: List[int] = []
+        start = 0
+        while start + self.duration <= session_end:
+            end = start + self.duration
+            if not any(b_start < end and start < b_end for b_start, b_end in self.breaks):
+                self.slot_starts.append(start)
+                self.slot_ends.append(end)
+            start = end
+
+        self._index_by_start: Dict[int, int] = {s: i for i, s in enumerate(self.slot_starts)}
+        # identyfikuje siatkę – klucz masek zapamiętanych w IntervalList
+        self.key = (self.origin, self.duration, tuple(self.slot_starts))
+        # TimeSlot tworzymy raz – to jedyne miejsce, gdzie siatka wraca do datetime
+        step = timedelta(minutes=self.duration)
+        self.time_slots: List[TimeSlot] = [
+            TimeSlot(start=self.origin + timedelta(minutes=s), end=self.origin + timedelta(minutes=s) + step)
+            for s in self.slot_starts
+        ]
+
+    def __len__(self) -> int:
+        return len(self.slot_starts)
+
+    # ---------- konwersje na granicy API ----------
+
+    def to_minutes(self, dt: datetime, round_up: bool = False) -> int:
+        """Minute offset of `dt` from the session start (floor, or ceil with round_up)."""
+        seconds = (dt - self.origin).total_seconds()
+        minutes = int(seconds // 60)
+        if round_up and minutes * 60 < seconds:
+            minutes += 1
+        return minutes
+
+    def interval(self, ts: TimeSlot) -> Interval:
+        """[start, end) in minutes; rounded outwards so overlaps are never lost."""
+        return self.to_minutes(ts.start), self.to_minutes(ts.end, round_up=True)
+
+    def index_of(self, ts: TimeSlot) -> Optional[int]:
+        """Grid index of a time slot, or None when it is not a grid slot."""
+        start, end = self.interval(ts)
+        i = self._index_by_start.get(start)
+        if i is None or self.slot_ends[i] != end:
+            return None
+        return i
+
+    # ---------- zapytania na liczbach ----------
+
+    def overlapping(self, start: int, end: int) -> range:
+        """Indices of grid slots overlapping [start, end)."""
+        # sloty są rozłączne i posortowane, więc końce też są posortowane
+        first = bisect_right(self.slot_ends, start)
+        last = bisect_left(self.slot_starts, end)
+        return range(first, max(first, last))
+
+    def blocked_mask(self, intervals: Iterable[TimeSlot]) -> int:
+        """Bitmask of grid slots overlapping any of the intervals (bit i = slot i)."""
+        if isinstance(intervals, IntervalList):
+            cached = intervals.cached_mask(self.key)
+            if cached is not None:
+                return cached
+        mask = 0
+        for ts in intervals:
+            start, end = self.interval(ts)
+            for i in self.overlapping(start, end):
+                mask |= 1 << i
+        if isinstance(intervals, IntervalList):
+            intervals.store_mask(self.key, mask)
+        return mask
+
+
+# ---------- współdzielone modele ----------
+
+_MODELS: "OrderedDict[tuple, TimeModel]" = OrderedDict()
+_MODELS_LIMIT = 8
+_MODELS_LOCK = threading.Lock()   # schedulery działają też w wątku roboczym GUI
+
+
+def parameters_key(parameters: SessionParameters) -> tuple:
+    """Everything in the session parameters that shapes the time grid (room count excluded)."""
+    return (parameters.session_date, parameters.start_time, parameters.end_time, parameters.defense_duration,
+            tuple((b.start, b.end) for b in (parameters.breaks or [])))
+
+
+def time_model_for(parameters: SessionParameters) -> TimeModel:
+    """
+    Shared TimeModel for these session parameters, compiled once and reused by every
+    scheduler, the optimizer and the project loader (treat it as read-only). Keyed by
+    value, so editing the parameters simply selects another model.
+    """
+    key = parameters_key(parameters)
+    with _MODELS_LOCK:
+        model = _MODELS.get(key)
+        if model is not None:
+            _MODELS.move_to_end(key)
+            return model
+    model = TimeModel(parameters)
+    with _MODELS_LOCK:
+        model = _MODELS.setdefault(key, model)
+        while len(_MODELS) > _MODELS_LIMIT:
+            _MODELS.popitem(last=False)
+    return model
@@ -0,0 +1,164 @@
+import argparse
+import sys
+
+from src.utils.availability_import import import_unavailability
+from src.utils.booklets import export_booklets
+from src.utils.calendar_export import COMBINED, export_calendars
+from src.utils.project_io import load_project, save_project
+from src.utils.schedule_exporter import ScheduleExporter
+from src.utils.project_store import ProjectStore
+from src.utils.validation_engine import ValidationEngine
+from src.utils.validators import Validator
+
+
+def _load(path: str):
+    if path.endswith(".db"):
+        with ProjectStore(path) as store:
+            return store.load_project()
+    return load_project(path)
+
+
+def _validate(args) -> int:
+    persons, defenses, rooms, params, schedule = _load(args.project)
+    engine = ValidationEngine(schedule)
+    counts = engine.counts
+
+    print(f"{len(schedule.get_scheduled_defenses())}/{len(defenses)} defenses scheduled")
+    print(f"Persons double-booked: {counts['person_clashes']}")
+    print(f"Rooms double-booked:   {counts['room_clashes']}")
+    print(f"Unavailable members:   {counts['unavailable']}")
+    print(f"Chairman role issues:  {counts['chairman_role']}")
+
+    messages = sorted(set(Validator.validate_defense_data(defenses)) | set(engine.messages()))
+    if not args.quiet:
+        for message in messages:
+            print(f"  • {message}")
+    return 1 if messages else 0
+
+
+def _availability(args) -> int:
+    if args.project.endswith(".db"):
+        store = ProjectStore(args.project)
+        persons, defenses, rooms, params, _ = store.load_project()
+    else:
+        store = None
+        persons, defenses, rooms, params, _ = load_project(args.project)
+
+    changed, reports = import_unavailability(args.files, persons, params, replace=args.replace, email=args.email)
+    failed = 0
+    for report in reports:
+        print(f"{report.filepath}: {report.imported} intervals in the session window, {report.skipped} rejected")
+        for issue in report.errors + report.warnings:
+            print(f"  line {issue.line}: {issue.message}")
+        failed += report.skipped
+
+    if store is not None:
+        # baza projektu: tylko zmienione osoby, każda we własnej małej transakcji
+        for person in changed:
+            store.save_person(person)
+        store.close()
+        target = args.project
+    else:
+        target = args.output or args.project
+        save_project(target, persons, defenses, rooms, params)
+    print(f"Updated availability of {len(changed)} persons -> {target}")
+    return 1 if failed else 0
+
+
+def _booklets(args) -> int:
+    schedule = _load(args.project)[4]
+    kinds = ("person", "room") if args.kind == "all" else (args.kind,)
+    booklets = export_booklets(schedule, args.directory, kinds=kinds, workers=args.workers,
+                               progress=None if args.quiet else
+                               lambda done, total: print(f"\r{done}/{total} booklets", end="", flush=True))
+    if not args.quiet:
+        print()
+    print(f"Wrote {len(booklets)} booklets ({sum(b.pages for b in booklets)} pages) to {args.directory}")
+    return 0
+
+
+def _calendars(args) -> int:
+    schedule = _load(args.project)[4]
+    counts = export_calendars(schedule, args.directory, persons=args.kind in ("all", "person"),
+                              rooms=args.kind in ("all", "room"), combined=None if args.no_combined else COMBINED)
+    print(f"Wrote {len(counts)} calendars ({sum(counts.values())} events) to {args.directory}")
+    return 0
+
+
+_EXPORTS = {"csv": ScheduleExporter.export_to_csv, "json": ScheduleExporter.export_to_json,
+            "jsonl": ScheduleExporter.export_to_jsonl}
+
+
+def _export(args) -> int:
+    name = args.output[:-3] if args.output.endswith(".gz") else args.output
+    kind = args.format or name.rsplit(".", 1)[-1].lower()
+    if kind not in _EXPORTS:
+        print(f"Unknown export format '{kind}' (use --format csv|json|jsonl)", file=sys.stderr)
+        return 2
+    schedule = _load(args.project)[4]
+    rows = _EXPORTS[kind](schedule, args.output, compress=True if args.gzip else None)
+    print(f"Exported {rows} defenses -> {args.output}")
+    return 0
+
+
+def _workload(args) -> int:
+    schedule = _load(args.project)[4]
+    persons = ScheduleExporter.export_workload_report(schedule, args.output, compress=True if args.gzip else None)
+    print(f"Workload of {persons} persons -> {args.output}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Thesis Defense Scheduler – command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="report conflicts of a saved project's schedule")
+    validate.add_argument("project", help="project file (.json or .db)")
+    validate.add_argument("-q", "--quiet", action="store_true", help="print the counts only")
+    validate.set_defaults(func=_validate)
+
+    availability = commands.add_parser("availability",
+                                       help="import unavailability from CSV (email,start,end) or .ics files")
+    availability.add_argument("project", help="project file (.json or .db); updated in place unless -o is given")
+    availability.add_argument("files", nargs="+", help=".csv / .ics files")
+    availability.add_argument("--email", help="owner of the .ics files (default: file name if it is an email, "
+                                              "otherwise the event's organizer/attendees)")
+    availability.add_argument("--replace", action="store_true",
+                              help="replace the imported persons' unavailability instead of adding to it")
+    availability.add_argument("-o", "--output", help="write the updated .json project here")
+    availability.set_defaults(func=_availability)
+
+    booklets = commands.add_parser("booklets", help="write one PDF per person and per room, with a manifest.json")
+    booklets.add_argument("project", help="project file (.json or .db)")
+    booklets.add_argument("directory", help="output directory")
+    booklets.add_argument("--kind", choices=("all", "person", "room"), default="all")
+    booklets.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    booklets.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    booklets.set_defaults(func=_booklets)
+
+    calendars = commands.add_parser("calendars", help="write .ics feeds: schedule.ics, one per person and per room")
+    calendars.add_argument("project", help="project file (.json or .db)")
+    calendars.add_argument("directory", help="output directory")
+    calendars.add_argument("--kind", choices=("all", "person", "room"), default="all")
+    calendars.add_argument("--no-combined", action="store_true", help="skip the combined schedule.ics")
+    calendars.set_defaults(func=_calendars)
+
+    export = commands.add_parser("export", help="stream the schedule to CSV, JSON or JSON Lines (.gz = compressed)")
+    export.add_argument("project", help="project file (.json or .db)")
+    export.add_argument("output", help="e.g. schedule.csv, schedule.jsonl.gz")
+    export.add_argument("--format", choices=sorted(_EXPORTS), help="default: from the output file name")
+    export.add_argument("--gzip", action="store_true", help="compress even without a .gz suffix")
+    export.set_defaults(func=_export)
+
+    workload = commands.add_parser("workload", help="per-person workload report (CSV, or JSON with room utilization)")
+    workload.add_argument("project", help="project file (.json or .db)")
+    workload.add_argument("output", help="e.g. workload.csv, workload.json.gz")
+    workload.add_argument("--gzip", action="store_true", help="compress even without a .gz suffix")
+    workload.set_defaults(func=_workload)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@ import tkinter as tk
 from datetime import datetime, date, time
 from tkinter import ttk, messagebox
 
+from src.models import IntervalList
+
 
 class AvailabilityDialog:
     """Dialog for managing person availability."""
@@ -9,7 +11,8 @@ class AvailabilityDialog:
     def __init__(self, parent, person, session_date=None):
         self.person = person
         self.session_date = session_date or date.today()
-        self.unavailable_slots = person.unavailable_slots.copy()
+        self.unavailable_slots = IntervalList(person.unavailable_slots)  # posortowana kopia
+        self.result = None  # nowe przedziały po Save, jeśli coś się zmieniło
 
         # Create dialog
         self.dialog = tk.Toplevel(parent)
@@ -118,10 +121,9 @@ class AvailabilityDialog:
             slot = TimeSlot(start=start_time, end=end_time)
 
             # Check for overlaps
-            for existing in self.unavailable_slots:
-                if existing.overlaps_with(slot):
-                    messagebox.showerror("Error", "This time slot overlaps with an existing one")
-                    return
+            if self.unavailable_slots.overlaps(slot):
+                messagebox.showerror("Error", "This time slot overlaps with an existing one")
+                return
 
             self.unavailable_slots.append(slot)
             self._refresh_slots_list()
@@ -140,10 +142,13 @@ class AvailabilityDialog:
     def _refresh_slots_list(self):
         """Refresh the list of unavailable slots."""
         self.slots_listbox.delete(0, tk.END)
-        for slot in sorted(self.unavailable_slots, key=lambda s: s.start):
+        # IntervalList jest posortowana – indeksy listboxa odpowiadają indeksom listy
+        for slot in self.unavailable_slots:
             self.slots_listbox.insert(tk.END, str(slot))
 
     def _save(self):
         """Save changes and close dialog."""
-        self.person.unavailable_slots = self.unavailable_slots
+        if list(self.unavailable_slots) != list(self.person.unavailable_slots):
+            self.person.unavailable_slots = self.unavailable_slots
+            self.result = self.unavailable_slots
         self.dialog.destroy()
\ No newline at end of file
@@ -0,0 +1,195 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from dataclasses import dataclass
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# (tytuł, treść) jednej karty
+CardText = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class CardLayout:
+    """
+    Geometry of the card grid for one viewport width – pure arithmetic, no widgets.
+
+    Cards have a fixed size, so the position of card i and the range of cards that
+    intersect a vertical window are O(1) computations, whatever the number of cards.
+    """
+    count: int
+    width: int                  # szerokość viewportu
+    card_w: int = 320
+    card_h: int = 110
+    gutter: int = 16
+    side: int = 16
+    top: int = 0                # miejsce na nagłówek nad kartami
+
+    @property
+    def cols(self) -> int:
+        fit = max(1, min(8, max(0, self.width - 2 * self.side) // (self.card_w + self.gutter)))
+        # preferencje: 4 -> 3 -> (2/1)
+        return 4 if fit >= 4 else fit
+
+    @property
+    def rows(self) -> int:
+        return -(-self.count // self.cols)
+
+    @property
+    def content_w(self) -> int:
+        return self.cols * self.card_w + (self.cols - 1) * self.gutter + 2 * self.side
+
+    @property
+    def left(self) -> int:
+        """x of the first column – the grid is centred in the viewport."""
+        return max(0, (self.width - self.content_w) // 2) + self.side
+
+    @property
+    def height(self) -> int:
+        """Height of the card area (below `top`)."""
+        return self.rows * (self.card_h + self.gutter) + self.gutter if self.count else 0
+
+    def box(self, index: int) -> Tuple[int, int, int, int]:
+        r, c = divmod(index, self.cols)
+        x = self.left + c * (self.card_w + self.gutter)
+        y = self.top + self.gutter + r * (self.card_h + self.gutter)
+        return x, y, x + self.card_w, y + self.card_h
+
+    def visible(self, y0: float, y1: float) -> range:
+        """Indexes of the cards intersecting canvas rows [y0, y1)."""
+        if not self.count:
+            return range(0)
+        pitch = self.card_h + self.gutter
+        base = self.top + self.gutter
+        # wiersz r zajmuje [base + r*pitch, base + r*pitch + card_h)
+        first = max(0, int((y0 - base - self.card_h) // pitch) + 1)
+        last = min(self.rows - 1, -int((base - y1) // pitch) - 1)
+        if last < first:
+            return range(0)
+        return range(first * self.cols, min(self.count, (last + 1) * self.cols))
+
+
+class CardGrid(ttk.Frame):
+    """
+    Virtualized card view drawn on one canvas.
+
+    Only the cards inside the viewport exist, as a recycled pool of canvas items
+    (border rectangle, title, body) that are moved and re-texted on scroll and resize –
+    no widget per defense, so redrawing costs the same for 30 or 3000 cards. Card texts
+    come from `render(item)` when a card first becomes visible and are cached. Optional
+    `header` / `footer` widgets (children of `self.canvas`) scroll with the cards.
+    """
+
+    def __init__(self, master, render: Callable[[object], CardText], **kwargs):
+        super().__init__(master, **kwargs)
+        self.render = render
+        self.items: Sequence = []
+        self._texts: Dict[int, CardText] = {}
+        self._pool: List[Tuple[int, int, int]] = []
+        self._header: Optional[tk.Widget] = None
+        self._footer: Optional[tk.Widget] = None
+        self._header_id = self._footer_id = None
+        self.layout = CardLayout(0, 1)
+
+        background = ttk.Style().lookup("TFrame", "background") or "#f0f0f0"
+        self.canvas = tk.Canvas(self, highlightthickness=0, background=background)
+        scroll = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=scroll.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.title_font = tkfont.Font(family="Arial", size=10, weight="bold")
+        self.body_font = tkfont.Font(family="Arial", size=9)
+        # wysokość karty z metryk czcionek: tytuł + 4 wiersze treści + padding 10
+        self.card_h = (self.title_font.metrics("linespace") + 4 +
+                       4 * self.body_font.metrics("linespace") + 20)
+
+        self.canvas.bind("<Configure>", lambda _e: self.relayout())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda _e: self._scroll(-3))
+        self.canvas.bind("<Button-5>", lambda _e: self._scroll(3))
+
+    # ---------- dane ----------
+
+    def set_items(self, items: Sequence) -> None:
+        self.items = items
+        self._texts.clear()
+        self.canvas.yview_moveto(0)
+        self.relayout()
+
+    def set_header(self, widget: tk.Widget) -> None:
+        self._header = widget
+        self._header_id = self.canvas.create_window(0, 0, window=widget, anchor="n")
+        widget.bind("<Configure>", lambda _e: self.relayout(), add="+")
+
+    def set_footer(self, widget: tk.Widget) -> None:
+        self._footer = widget
+        self._footer_id = self.canvas.create_window(0, 0, window=widget, anchor="n")
+        widget.bind("<Configure>", lambda _e: self.relayout(), add="+")
+
+    def invalidate(self, index: Optional[int] = None) -> None:
+        """Re-render one card (or all) after its defense changed."""
+        if index is None:
+            self._texts.clear()
+        else:
+            self._texts.pop(index, None)
+        self.redraw()
+
+    # ---------- układ ----------
+
+    def relayout(self) -> None:
+        """Resize: recompute the O(1) geometry, move header/footer, redraw the visible cards."""
+        width = max(1, self.canvas.winfo_width())
+        top = self._header.winfo_reqheight() + 8 if self._header is not None else 0
+        self.layout = CardLayout(len(self.items), width, card_h=self.card_h, top=top)
+        bottom = top + self.layout.height
+        if self._header_id is not None:
+            self.canvas.coords(self._header_id, width // 2, 0)
+        if self._footer_id is not None:
+            self.canvas.coords(self._footer_id, width // 2, bottom)
+            self.canvas.itemconfigure(self._footer_id, width=min(width, self.layout.content_w))
+            bottom += self._footer.winfo_reqheight()
+        self.canvas.configure(scrollregion=(0, 0, width, bottom))
+        self.redraw()
+
+    def redraw(self) -> None:
+        """Scroll: reuse pool items for the cards in view, hide the rest."""
+        y0 = self.canvas.canvasy(0)
+        y1 = y0 + self.canvas.winfo_height()
+        visible = self.layout.visible(y0, y1)
+        while len(self._pool) < len(visible):
+            self._pool.append(self._new_card())
+
+        canvas = self.canvas
+        for (rect, title, body), index in zip(self._pool, visible):
+            x0, top, x1, bottom = self.layout.box(index)
+            text = self._texts.get(index)
+            if text is None:
+                text = self._texts[index] = self.render(self.items[index])
+            canvas.coords(rect, x0, top, x1, bottom)
+            canvas.coords(title, x0 + 10, top + 10)
+            canvas.coords(body, x0 + 10, top + 14 + self.title_font.metrics("linespace"))
+            canvas.itemconfigure(title, text=text[0], state="normal")
+            canvas.itemconfigure(body, text=text[1], state="normal")
+            canvas.itemconfigure(rect, state="normal")
+        for rect, title, body in self._pool[len(visible):]:
+            for item in (rect, title, body):
+                canvas.itemconfigure(item, state="hidden")
+
+    def _new_card(self) -> Tuple[int, int, int]:
+        width = self.layout.card_w - 20
+        return (self.canvas.create_rectangle(0, 0, 0, 0, outline="#8a8a8a", fill=self.canvas["background"]),
+                self.canvas.create_text(0, 0, anchor="nw", font=self.title_font, width=width),
+                self.canvas.create_text(0, 0, anchor="nw", font=self.body_font, width=width, justify="left"))
+
+    # ---------- przewijanie ----------
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def _scroll(self, units: int) -> None:
+        self.canvas.yview_scroll(units, "units")
+        self.redraw()
+
+    def _on_wheel(self, event) -> None:
+        self._scroll(-1 if event.delta > 0 else 1)
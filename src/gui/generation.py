@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional, Tuple
+
+from src.algorithm import SchedulingCancelled
+from src.utils.result_cache import run_cached
+
+# komunikaty wątku: ("progress", (placed, total)) | ("done", wynik run_cached) | ("cancelled", None) | ("error", wyjątek)
+Message = Tuple[str, object]
+
+
+class GenerationWorker:
+    """
+    `run_cached` on a daemon thread. The thread only posts messages to `self.messages`;
+    nothing outside the scheduler's own objects is touched until the GUI reads "done".
+    Schedulers write placements onto the shared Defense objects as they go, so after a
+    cancel or an error those fields are restored from a snapshot taken before the run.
+    """
+
+    def __init__(self, cache, scheduler, persons, defenses, initial=None):
+        self.cache = cache
+        self.scheduler = scheduler
+        self.persons = persons
+        self.defenses = defenses
+        self.initial = initial
+        self.messages: "queue.Queue[Message]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        scheduler.progress_callback = self._progress
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="schedule-generation", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self.scheduler.cancel()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _progress(self, placed: int, total: int) -> None:
+        self.messages.put(("progress", (placed, total)))
+
+    def _run(self) -> None:
+        snapshot = [(d, d.time_slot, d.room, d.chairman) for d in self.defenses]
+        try:
+            result = run_cached(self.cache, self.scheduler, self.persons, self.defenses, initial=self.initial)
+        except SchedulingCancelled:
+            self._restore(snapshot)
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            self._restore(snapshot)
+            self.messages.put(("error", e))
+        else:
+            self.messages.put(("done", result))
+
+    @staticmethod
+    def _restore(snapshot: List[tuple]) -> None:
+        for defense, time_slot, room, chairman in snapshot:
+            defense.time_slot, defense.room, defense.chairman = time_slot, room, chairman
+
+
+class GenerationDialog(tk.Toplevel):
+    """
+    Modal progress window for a `GenerationWorker`: progress bar with the best-so-far
+    count, elapsed time and Cancel. The queue is drained from `after()` every POLL_MS,
+    so the Tk loop never blocks; `on_finish(kind, payload)` gets the final message.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, master, worker: GenerationWorker, title: str,
+                 on_finish: Callable[[str, object], None]):
+        super().__init__(master)
+        self.worker = worker
+        self.on_finish = on_finish
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(master)
+
+        frame = ttk.Frame(self, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        total = len(worker.defenses)
+        self.bar = ttk.Progressbar(frame, length=320, mode="determinate", maximum=max(1, total))
+        self.bar.pack(fill=tk.X)
+        self.count_label = ttk.Label(frame, text=f"Best so far: 0/{total} defenses")
+        self.count_label.pack(anchor=tk.W, pady=(8, 0))
+        self.time_label = ttk.Label(frame, text="Elapsed: 0 s")
+        self.time_label.pack(anchor=tk.W)
+        self.cancel_button = ttk.Button(frame, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(pady=(10, 0))
+
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self._started = time.monotonic()
+        worker.start()
+        self.grab_set()
+        self._job = self.after(self.POLL_MS, self._poll)
+
+    def cancel(self) -> None:
+        self.worker.cancel()
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.count_label.configure(text="Cancelling...")
+
+    def _poll(self) -> None:
+        progress = None
+        final: Optional[Message] = None
+        try:
+            while final is None:
+                kind, payload = self.worker.messages.get_nowait()
+                if kind == "progress":
+                    progress = payload
+                else:
+                    final = (kind, payload)
+        except queue.Empty:
+            pass
+
+        # tylko ostatni stan z paczki komunikatów
+        if progress is not None and self.cancel_button.instate(["!disabled"]):
+            placed, total = progress
+            self.bar.configure(maximum=max(1, total), value=placed)
+            self.count_label.configure(text=f"Best so far: {placed}/{total} defenses")
+        self.time_label.configure(text=f"Elapsed: {time.monotonic() - self._started:.0f} s")
+
+        if final is None:
+            self._job = self.after(self.POLL_MS, self._poll)
+            return
+        self.grab_release()
+        self.destroy()
+        self.on_finish(*final)
@@ -7,11 +7,11 @@ class ImportCSVDialog:
     """Dialog for importing CSV files."""
 
     def __init__(self, parent):
-        self.result = None  # Will be (type, filepath) tuple
+        self.result = None  # Will be (type, filepath, merge) tuple
 
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Import CSV")
-        self.dialog.geometry("400x300")
+        self.dialog.geometry("400x330")
         self.dialog.resizable(False, False)
 
         self.dialog.transient(parent)
@@ -45,6 +45,11 @@ class ImportCSVDialog:
         ttk.Radiobutton(main_frame, text="Import Defenses",
                         variable=self.import_type, value="defenses").pack(anchor=tk.W, pady=5)
 
+        # Tryb importu – scalanie po emailu / (student, temat) zamiast dopisywania duplikatów
+        self.merge_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(main_frame, text="Merge with existing data (update matches, add only new)",
+                        variable=self.merge_var).pack(anchor=tk.W, pady=(10, 0))
+
         # File selection
         file_frame = ttk.Frame(main_frame)
         file_frame.pack(fill=tk.X, pady=(20, 0))
@@ -92,7 +97,7 @@ class ImportCSVDialog:
             messagebox.showerror("Error", "Selected file does not exist")
             return
 
-        self.result = (self.import_type.get(), filepath)
+        self.result = (self.import_type.get(), filepath, self.merge_var.get())
         self.dialog.destroy()
 
     def _create_samples(self):
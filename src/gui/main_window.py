@@ -4,15 +4,22 @@ from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
 from src.algorithm import SimpleGreedyScheduler, PriorityGreedyScheduler
 from src.gui.availability_dialog import AvailabilityDialog
+from src.gui.card_grid import CardGrid
+from src.gui.generation import GenerationDialog, GenerationWorker
+from src.gui.schedule_table import ScheduleTable
 from src.gui.dialogs import PersonDialog, DefenseDialog
 from src.gui.import_dialog import ImportCSVDialog
 from src.gui.parameters_dialog import SessionParametersDialog
 from src.gui.room_dialog import RoomManagementDialog
-from src.models import Room
-from src.utils.csv_handler import CSVHandler
+from src.models import Person, Room
+from src.utils.csv_handler import CSVHandler, ImportReport
+from src.utils.merge import PersonMerger, DefenseMerger
 from src.utils.project_io import load_project, save_project
-from src.utils.schedule_exporter import ScheduleExporter
-from src.algorithm.optimizer import ScheduleOptimizer, OptimizationWeights
+from src.utils.change_journal import ChangeJournal
+from src.utils.project_store import ProjectStore
+from src.utils.result_cache import ScheduleCache
+from src.utils.schedule_stats import invalidate_stats, schedule_stats
+from src.utils.validation_engine import ValidationEngine
 from datetime import datetime
 
 
@@ -36,6 +43,22 @@ class MainWindow:
         self.defenses = []
         self.schedule = None
         self.session_parameters = None
+        self.last_cache_key = None
+        self.validation = None  # ValidationEngine podpięty pod bieżący harmonogram
+        self.store = None  # ProjectStore otwartego projektu .db – zmiany zapisywane na bieżąco
+
+        # autozapis – dziennik zmian; brak katalogu (np. read-only home) po prostu go wyłącza
+        try:
+            self.journal = ChangeJournal(
+                state=lambda: (self.persons, self.defenses, self.rooms, self.session_parameters))
+        except OSError:
+            self.journal = None
+
+        # cache wyników – brak katalogu (np. read-only home) po prostu wyłącza cache
+        try:
+            self.result_cache = ScheduleCache()
+        except OSError:
+            self.result_cache = None
 
         # Default rooms
         self.rooms = [
@@ -48,19 +71,19 @@ class MainWindow:
         self.person_listbox = None
         self.defense_listbox = None
 
-        # schedule responsive helpers
-        self._cards_cache = []       # bieżące sloty do wyrenderowania (karty)
-        self._current_cols = None    # aktualna liczba kolumn w kartach
-        self._schedule_canvas = None
-        self._schedule_scrollable = None
+        # wirtualna siatka kart harmonogramu (CardGrid) i tabela wypełniana paczkami (ScheduleTable)
+        self._card_grid = None
+        self.schedule_table = None
+        # okno postępu trwającego generowania (GenerationDialog), None gdy nic nie liczy
+        self._generation = None
 
         self._create_menu()
         self._create_toolbar()
         self._create_notebook()
         self._create_status_bar()
 
-        # globalny bind – przebudowa kart po zmianie rozmiaru
-        self.root.bind('<Configure>', self._on_root_resize)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_exit)
+        self._recover_autosave()
 
     def _create_menu(self):
         """Create application menu bar."""
@@ -77,13 +100,14 @@ class MainWindow:
         file_menu.add_command(label="Import CSV...", command=self.import_csv)
         file_menu.add_command(label="Export Schedule...", command=self.export_schedule)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self._on_exit)
 
         # Edit menu
         edit_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Edit", menu=edit_menu)
         edit_menu.add_command(label="Add Person", command=self.add_person)
         edit_menu.add_command(label="Add Defense", command=self.add_defense)
+        edit_menu.add_command(label="Import Availability...", command=self.import_availability)
         edit_menu.add_separator()
         edit_menu.add_command(label="Session Parameters", command=self.edit_parameters)
         edit_menu.add_command(label="Manage Rooms", command=self.manage_rooms)
@@ -130,15 +154,21 @@ class MainWindow:
         self.notebook.add(self.data_frame, text="Data Input")
         self._create_data_tab()
 
-        # Schedule tab
+        # Schedule i Export – budowane przy pierwszym wybraniu zakładki (albo pierwszym użyciu)
         self.schedule_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.schedule_frame, text="Schedule")
-        self._create_schedule_tab()
-
-        # Export tab
         self.export_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.export_frame, text="Export Schedule")
-        self._create_export_tab()
+        self._pending_tabs = {str(self.schedule_frame): self._create_schedule_tab,
+                              str(self.export_frame): self._create_export_tab}
+        self.notebook.bind("<<NotebookTabChanged>>",
+                           lambda _e: self._ensure_tab(self.notebook.select()), add="+")
+
+    def _ensure_tab(self, frame):
+        """Build a deferred tab (frame or its Tk path) once; no-op when it already exists."""
+        build = self._pending_tabs.pop(str(frame), None)
+        if build is not None:
+            build()
 
     def _create_data_tab(self):
         """Create content for data input tab."""
@@ -222,6 +252,13 @@ class MainWindow:
             variable=self.algorithm_var, value="backtracking"
         ).pack(side=tk.LEFT, padx=(0, 12))
 
+        # warm-start: zachowaj bieżące przydziały i dopełnij resztę (domyślnie wyłączony – świeże liczenie)
+        self.warm_start_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            control_frame, text="Start from current schedule",
+            variable=self.warm_start_var
+        ).pack(side=tk.LEFT, padx=(0, 6))
+
         # Separator
         ttk.Separator(control_frame, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=10)
 
@@ -266,124 +303,175 @@ class MainWindow:
         ).grid(row=1, column=0, pady=6, sticky="ew")
 
         ttk.Button(
-            export_options, text="Export to PDF", width=btn_width,
-            command=lambda: self.export_schedule('pdf')
+            export_options, text="Export to JSON Lines", width=btn_width,
+            command=lambda: self.export_schedule('jsonl')
         ).grid(row=2, column=0, pady=6, sticky="ew")
 
-    def _create_status_bar(self):
-        """Create status bar at bottom of window."""
-        self.status_bar = ttk.Label(self.root, text="Ready", relief=tk.SUNKEN)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Button(
+            export_options, text="Export to PDF", width=btn_width,
+            command=lambda: self.export_schedule('pdf')
+        ).grid(row=3, column=0, pady=6, sticky="ew")
 
-    def _update_room_info(self):
-        """Update room information display."""
-        if hasattr(self, 'room_info_label'):
-            room_text = f"Available rooms: {len(self.rooms)}"
-            if self.rooms:
-                room_names = ", ".join([f"{r.name}" for r in self.rooms[:3]])
-                if len(self.rooms) > 3:
-                    room_names += "..."
-                room_text += f" ({room_names})"
-            self.room_info_label.config(text=room_text)
+        ttk.Button(
+            export_options, text="Export PDF Booklets (per person and room)...", width=btn_width,
+            command=self.export_booklets
+        ).grid(row=4, column=0, pady=6, sticky="ew")
 
-    def _on_root_resize(self, _event=None):
-        # przebuduj karty, jeśli już istnieją
-        if hasattr(self, "_schedule_canvas") and self._schedule_canvas:
-            self._relayout_cards()
+        ttk.Button(
+            export_options, text="Export to iCalendar (.ics)", width=btn_width,
+            command=lambda: self.export_schedule('ics')
+        ).grid(row=5, column=0, pady=6, sticky="ew")
 
-    def _relayout_cards(self):
-        if not hasattr(self, "_cards_host") or not self._cards_host.winfo_exists():
-            return
-        if self._cards_cache is None:
-            return
+        ttk.Button(
+            export_options, text="Export Calendar Feeds (per person and room)...", width=btn_width,
+            command=self.export_calendar_feeds
+        ).grid(row=6, column=0, pady=6, sticky="ew")
 
-        # parametry "karty"
-        card_min_w = 320
-        gutter = 16
-        side_padding = 16  # po obu bokach
+        ttk.Button(
+            export_options, text="Export Workload Report...", width=btn_width,
+            command=self.export_workload_report
+        ).grid(row=7, column=0, pady=6, sticky="ew")
 
-        # szerokość dostępna (bierzemy z canvasa – jest stabilna)
-        try:
-            base_w = self._schedule_canvas.winfo_width()
-        except Exception:
-            base_w = self._cards_host.winfo_width()
+    def _create_status_bar(self):
+        """Create status bar at bottom of window."""
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar = ttk.Label(status_frame, text="Ready", relief=tk.SUNKEN)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # liczba konfliktów na żywo (ValidationEngine)
+        self.conflict_label = ttk.Label(status_frame, text="", relief=tk.SUNKEN, width=16, anchor=tk.CENTER)
+        self.conflict_label.pack(side=tk.RIGHT)
+
+    def _attach_validation(self, changed=False):
+        """
+        (Re)subscribe live validation and the autosave sinks to the current schedule.
+        `changed=True` when the placements themselves are new (generated or cleared) and
+        have to be written; a just opened or recovered project is already stored as it is.
+        """
+        if self.validation is not None:
+            self.validation.detach()
+            self.validation = None
+        if self.schedule is not None:
+            self.validation = ValidationEngine(self.schedule, on_change=self._update_conflict_count)
+        else:
+            self.conflict_label.config(text="")
+        if changed:
+            self._persist("save_assignments", self.defenses)
+        for sink in self._sinks():
+            if self.schedule is not None:
+                sink.track(self.schedule)
+            else:
+                sink.untrack()
 
-        avail = max(0, base_w - 2 * side_padding)
+    def _switch_store(self, store):
+        """Switch incremental saving to an opened ProjectStore (None = plain JSON project)."""
+        if self.store is not None and self.store is not store:
+            self.store.close()
+        self.store = store
+        return store
 
-        # ile realnie się mieści
-        fit_cols = max(1, min(8, avail // (card_min_w + gutter)))
+    def _sinks(self):
+        return [sink for sink in (self.store, self.journal) if sink is not None]
 
-        # preferencje: 4 -> 3 -> (2/1)
-        if fit_cols >= 4:
-            cols = 4
-        elif fit_cols >= 3:
-            cols = 3
-        else:
-            cols = fit_cols
+    def _persist(self, method, *args):
+        """Send one edit to the open .db project and the autosave journal; failures only reach the status bar."""
+        for sink in self._sinks():
+            try:
+                getattr(sink, method)(*args)
+            except Exception as e:
+                self.update_status(f"Autosave failed: {e}")
 
-        # renderuj też, gdy kontener pusty
-        need_render = (cols != self._current_cols) or (len(self._cards_host.winfo_children()) == 0)
-        if not need_render:
+    def _begin_journal(self):
+        """Make the current project the journal's new base state (after new/open/recover)."""
+        if self.journal is None:
             return
-        self._current_cols = cols
-
-        # ---- KLUCZ: ustaw szerokość wrappera pod karty ----
-        # target = suma szerokości kolumn + odstępy + wewnętrzne paddingi
-        target_width = cols * card_min_w + (cols - 1) * gutter + 2 * side_padding
         try:
-            # wyłącz propagację i wymuś szerokość – dzięki temu spacery wycentrują cały banner
-            self._center_content.grid_propagate(False)
-            self._center_content.configure(width=target_width)
-        except Exception:
-            pass
-
-        # re-render siatki kart
-        for w in self._cards_host.winfo_children():
-            w.destroy()
-
-        grid = ttk.Frame(self._cards_host)
-        grid.pack()
-
-        for c in range(cols):
-            grid.grid_columnconfigure(c, weight=1, uniform="cards")
+            self.journal.begin(self.persons, self.defenses, self.rooms, self.session_parameters)
+            if self.schedule is not None:
+                self.journal.track(self.schedule)
+        except Exception as e:
+            self.update_status(f"Autosave failed: {e}")
 
-        for idx, slot in enumerate(self._cards_cache):
-            r, c = divmod(idx, cols)
-            card = ttk.Frame(grid, padding=10, style="Card.TFrame")
+    def _recover_autosave(self):
+        """Offer to restore the project left behind by a session that did not exit cleanly."""
+        if self.journal is None or not self.journal.has_changes():
+            self._begin_journal()
+            return
+        if messagebox.askyesno("Recover Project",
+                               "The previous session did not close cleanly.\nRecover its unsaved changes?"):
             try:
-                style = ttk.Style()
-                style.layout("Card.TFrame", [
-                    ('Frame.border', {'sticky': 'nswe', 'children': [
-                        ('Frame.padding', {'sticky': 'nswe'})
-                    ]})
-                ])
-                style.configure("Card.TFrame", borderwidth=1, relief="solid")
-            except Exception:
-                pass
+                recovered = self.journal.recover()
+            except Exception as e:
+                messagebox.showerror("Recover Error", f"Could not recover the autosave:\n{e}")
+                recovered = None
+            if recovered:
+                self.persons, self.defenses, self.rooms, self.session_parameters, self.schedule = recovered
+                self._begin_journal()
+                self._refresh_persons()
+                self._refresh_defenses()
+                self._update_room_info()
+                if self.schedule is not None:
+                    self._attach_validation()
+                    self._display_schedule()
+                    self.show_schedule_table()
+                self.update_status("Recovered unsaved changes from the previous session")
+                return
+        self._begin_journal()
+
+    def _on_exit(self):
+        """Clean exit – close the project database and drop the autosave (it is only for crashes)."""
+        if self.journal is not None:
+            self.journal.close(discard=True)
+        if self.store is not None:
+            self.store.close()
+        self.root.quit()
+
+    def _refresh_validation_for(self, item):
+        """Re-check the live validation after a person/defense was changed in place."""
+        invalidate_stats()
+        if self.validation is None:
+            return
+        if isinstance(item, Person):
+            self.validation.refresh_person(item)
+        else:
+            self.validation.refresh(item)
+        # tylko wiersze/karty tej osoby lub obrony
+        if self.schedule_table is not None and self.schedule_table.winfo_exists():
+            self.schedule_table.refresh(item)
+        if self._card_grid is not None and self._card_grid.winfo_exists():
+            self._card_grid.invalidate()
 
-            card.grid(row=r, column=c, sticky="n", padx=8, pady=8)
+    def _update_conflict_count(self, engine):
+        total = engine.total
+        self.conflict_label.config(text=f"Conflicts: {total}" if total else "No conflicts ✔")
 
-            ttk.Label(
-                card,
-                text=f"{slot.time_slot}   |   Room: {slot.room.name}",
-                font=("Arial", 10, "bold"),
-                wraplength=card_min_w - 32,
-                justify="left"
-            ).pack(anchor="w")
+    def _update_room_info(self):
+        """Update room information display."""
+        if hasattr(self, 'room_info_label'):
+            room_text = f"Available rooms: {len(self.rooms)}"
+            if self.rooms:
+                room_names = ", ".join([f"{r.name}" for r in self.rooms[:3]])
+                if len(self.rooms) > 3:
+                    room_names += "..."
+                room_text += f" ({room_names})"
+            self.room_info_label.config(text=room_text)
 
-            d = slot.defense
-            body = (
+    @staticmethod
+    def _card_text(slot):
+        """(title, body) of one schedule card – rendered only when the card scrolls into view."""
+        d = slot.defense
+        return (f"{slot.time_slot}   |   Room: {slot.room.name}",
                 f"Student: {d.student_name}\n"
                 f"Chairman: {d.chairman.name if d.chairman else '—'}\n"
                 f"Supervisor: {d.supervisor.name}\n"
-                f"Reviewer: {d.reviewer.name}"
-            )
-            ttk.Label(card, text=body, font=("Arial", 9), justify="left").pack(anchor="w", pady=(4, 0))
+                f"Reviewer: {d.reviewer.name}")
 
     def _display_schedule(self):
+        self._ensure_tab(self.schedule_frame)
         # wyczyść
         for widget in self.schedule_display_frame.winfo_children():
             widget.destroy()
+        self._card_grid = None
 
         if not self.schedule:
             schedule_label = ttk.Label(self.schedule_display_frame,
@@ -392,147 +480,44 @@ class MainWindow:
             schedule_label.pack(expand=True)
             return
 
-        # Canvas + scroll
-        self._schedule_canvas = tk.Canvas(self.schedule_display_frame, highlightthickness=0)
-        vscroll = ttk.Scrollbar(self.schedule_display_frame, orient="vertical",
-                                command=self._schedule_canvas.yview)
-        self._schedule_canvas.configure(yscrollcommand=vscroll.set)
-
-        # Scrollable frame wewnątrz canvas
-        self._schedule_scrollable = ttk.Frame(self._schedule_canvas)
-        inner = self._schedule_canvas.create_window((0, 0), window=self._schedule_scrollable, anchor="nw")
-
-        def _on_scrollable_config(_event=None):
-            # dopasuj scrollregion
-            self._schedule_canvas.configure(scrollregion=self._schedule_canvas.bbox("all"))
-            # dopasuj szerokość okna w canvas do szerokości canvasa (bez przestawiania x)
-            self._schedule_canvas.itemconfigure(inner, width=self._schedule_canvas.winfo_width())
-
-        self._schedule_scrollable.bind("<Configure>", _on_scrollable_config)
-        self._schedule_canvas.bind("<Configure>", lambda _e: (self._schedule_canvas.itemconfigure(inner, width=self._schedule_canvas.winfo_width()),
-                                                            self._relayout_cards()))
-
-        self._schedule_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        vscroll.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # === CENTER WRAPPER ===
-        # layout 3-kolumnowy: [spacer][CONTENT][spacer]; spacery rozciągają się i centrują CONTENT
-        self._center_wrap = ttk.Frame(self._schedule_scrollable)
-        self._center_wrap.pack(fill=tk.X, expand=True)
-
-        self._center_wrap.grid_columnconfigure(0, weight=1)
-        self._center_wrap.grid_columnconfigure(1, weight=0)  # CONTENT
-        self._center_wrap.grid_columnconfigure(2, weight=1)
-
-        self._center_content = ttk.Frame(self._center_wrap)
-        self._center_content.grid(row=0, column=1, sticky="n")
-
-        # Header w CONTENT
-        header = ttk.Frame(self._center_content)
-        header.pack(fill=tk.X, pady=(10, 6))
+        # wirtualna siatka kart na jednym canvasie: nagłówek, karty widoczne w oknie, statystyki
+        self._card_grid = CardGrid(self.schedule_display_frame, render=self._card_text)
+        self._card_grid.pack(fill=tk.BOTH, expand=True)
+        canvas = self._card_grid.canvas
 
+        header = ttk.Frame(canvas)
         ttk.Label(header, text="Generated Schedule",
                 font=("Arial", 14, "bold"),
-                anchor="center", justify="center").pack()
+                anchor="center", justify="center").pack(pady=(10, 0))
 
-        scheduled_count = len(self.schedule.get_scheduled_defenses())
-        total_slots = len([s for s in self.schedule.slots if s.time_slot])
-        used_slots = len([s for s in self.schedule.slots if s.defense])
+        stats = schedule_stats(self.schedule)
         rooms_txt = (self.session_parameters.room_count if self.session_parameters else "-")
-        summary_text = (f"Scheduled: {scheduled_count} defenses | "
-                        f"Used slots: {used_slots}/{total_slots} | Rooms (params): {rooms_txt}")
+        summary_text = (f"Scheduled: {stats.defenses} defenses | "
+                        f"Used slots: {stats.used_slots}/{stats.slots} | Rooms (params): {rooms_txt}")
         ttk.Label(header, text=summary_text, font=("Arial", 10),
                 anchor="center", justify="center").pack()
+        self._card_grid.set_header(header)
 
-        # kontener pod karty – W ŚRODKOWEJ KOLUMNIE
-        self._cards_host = ttk.Frame(self._center_content)
-        self._cards_host.pack(padx=16, pady=8)
+        # statystyki – pod kartami
+        footer = ttk.Frame(canvas)
+        self.show_statistics(footer)
+        self._card_grid.set_footer(footer)
 
-        # zbuforuj sloty do kart
         used_slots_list = [s for s in self.schedule.slots if s.defense]
         used_slots_list.sort(key=lambda s: (s.time_slot.start, s.room.number))
-        self._cards_cache = used_slots_list
-
-        # pierwsze renderowanie
-        self._relayout_cards()
-
-        # statystyki – też w CONTENT
-        self.show_statistics(self._center_content)
-
-        self._schedule_canvas.bind(
-            "<Configure>",
-            lambda _e: (
-                self._schedule_canvas.itemconfigure(inner, width=self._schedule_canvas.winfo_width()),
-                self._relayout_cards()
-            )
-        )
-
+        self._card_grid.set_items(used_slots_list)
 
     def show_statistics(self, parent_frame):
         stats_frame = ttk.LabelFrame(parent_frame, text="Summary Statistics", padding=10)
         stats_frame.pack(fill=tk.X, padx=20, pady=10)
 
-        defense_count = len(self.schedule.get_scheduled_defenses())
-        slot_count = len([s for s in self.schedule.slots if s.time_slot])
-        used_slots = len([s for s in self.schedule.slots if s.defense])
-        room_usage = {}
-        role_count = {"supervisor": {}, "reviewer": {}, "chairman": {}}
-        role_time = {"supervisor": {}, "reviewer": {}, "chairman": {}}
-        total_work_time = {}
-
-        for slot in self.schedule.slots:
-            if not slot.defense:
-                continue
-
-            duration_minutes = int((slot.time_slot.end - slot.time_slot.start).total_seconds() // 60)
-            room_name = slot.room.name
-            room_usage[room_name] = room_usage.get(room_name, 0) + 1
-
-            d = slot.defense
-            for role, person in [("supervisor", d.supervisor), ("reviewer", d.reviewer), ("chairman", d.chairman)]:
-                if person:
-                    name = person.name
-
-                    # Liczba wystąpień
-                    role_count[role][name] = role_count[role].get(name, 0) + 1
-
-                    # Czas w danej roli
-                    role_time[role][name] = role_time[role].get(name, 0) + duration_minutes
-
-                    # Całkowity czas pracy (łącznie we wszystkich rolach)
-                    total_work_time[name] = total_work_time.get(name, 0) + duration_minutes
-
-        # Room usage
-        usage_str = "Room Utilization:\n" + "\n".join([f"{room}: {count} times" for room, count in room_usage.items()])
-        ttk.Label(stats_frame, text=usage_str, font=('Arial', 10)).pack(anchor=tk.W)
-
-        # Workload
-        ttk.Label(stats_frame, text="Workload Distribution:", font=('Arial', 10, 'bold')).pack(anchor=tk.W,
-                                                                                               pady=(10, 0))
-        for role in ["supervisor", "reviewer", "chairman"]:
-            title = role.capitalize() + "s:"
-            ttk.Label(stats_frame, text=title, font=('Arial', 10, 'underline')).pack(anchor=tk.W)
-            for name in sorted(role_count[role], key=lambda n: -role_count[role][n]):
-                count = role_count[role][name]
-                minutes = role_time[role][name]
-                hours = minutes // 60
-                minutes_rem = minutes % 60
-                ttk.Label(stats_frame, text=f"  {name}: {count} defenses ({hours}h {minutes_rem}min)",
-                          font=('Arial', 10)).pack(anchor=tk.W)
-
-        # Całkowity czas pracy każdej osoby (łącznie we wszystkich rolach)
-        ttk.Label(stats_frame, text="Total Work Time:", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
-        for name, minutes in sorted(total_work_time.items(), key=lambda x: -x[1]):
-            hours, mins = divmod(minutes, 60)
-            total_defenses = sum(role_count[role].get(name, 0) for role in role_count)
-            ttk.Label(stats_frame, text=f"  {name}: {hours}h {mins}min ({total_defenses} defenses)",
-                      font=('Arial', 10)).pack(anchor=tk.W)
-
-        # Podsumowanie
-        ttk.Label(stats_frame, text=f"\nTotal Scheduled Defenses: {defense_count}", font=('Arial', 10, 'italic')).pack(
-            anchor=tk.W, pady=(10, 0))
-        ttk.Label(stats_frame, text=f"Used Slots: {used_slots}/{slot_count}", font=('Arial', 10, 'italic')).pack(
-            anchor=tk.W)
+        # jeden widget Text zamiast etykiety na osobę; statystyki z cache wspólnego z eksportem
+        content = schedule_stats(self.schedule).text()
+        text = tk.Text(stats_frame, font=('Arial', 10), wrap=tk.NONE, relief=tk.FLAT,
+                       height=content.count("\n") + 1, background=self.root.cget("background"))
+        text.insert("1.0", content)
+        text.configure(state=tk.DISABLED)
+        text.pack(fill=tk.X, anchor=tk.W)
 
     def update_status(self, message):
         """Update status bar message."""
@@ -548,9 +533,11 @@ class MainWindow:
                 return
 
         self.update_status("New project created")
+        self._switch_store(None)
         self.persons = []
         self.defenses = []
         self.schedule = None
+        self._attach_validation()
         self.session_parameters = None
 
         # Reset rooms to default
@@ -559,32 +546,45 @@ class MainWindow:
             Room("Sala 102", "102", 25),
             Room("Sala 201", "201", 20)
         ]
+        self._begin_journal()
 
         # Clear displays
         self._refresh_persons()
         self._refresh_defenses()
         self._update_room_info()
 
-        # Clear schedule display
-        for widget in self.schedule_frame.winfo_children():
-            widget.destroy()
-        self._create_schedule_tab()
+        # Clear schedule display (zakładka jeszcze niezbudowana nie ma czego czyścić)
+        if str(self.schedule_frame) not in self._pending_tabs:
+            for widget in self.schedule_frame.winfo_children():
+                widget.destroy()
+            self._create_schedule_tab()
 
         # Switch to first tab
         self.notebook.select(0)
         self._update_schedule_warning()
 
     def open_project(self):
-        """Open full project from a JSON file."""
+        """Open full project from a JSON file or a project database (.db)."""
 
         filepath = filedialog.askopenfilename(
             title="Open Project",
-            filetypes=[("Project files", "*.json"), ("All files", "*.*")]
+            filetypes=[("Project files", "*.json *.db"), ("All files", "*.*")]
         )
         if not filepath:
             return
         try:
-            persons, defenses, rooms, params, schedule = load_project(filepath)
+            # najpierw odczyt – przy błędzie bieżący projekt i jego baza zostają bez zmian
+            if filepath.endswith(".db"):
+                store = ProjectStore(filepath)
+                try:
+                    persons, defenses, rooms, params, schedule = store.load_project()
+                except Exception:
+                    store.close()
+                    raise
+            else:
+                store = None
+                persons, defenses, rooms, params, schedule = load_project(filepath)
+            self._switch_store(store)
 
             # set state
             self.persons = persons
@@ -592,6 +592,8 @@ class MainWindow:
             self.rooms = rooms
             self.session_parameters = params
             self.schedule = schedule
+            self._begin_journal()
+            self._attach_validation()
 
             # refresh UI
             self._refresh_persons()
@@ -608,7 +610,7 @@ class MainWindow:
             self._update_schedule_warning()
 
     def save_project(self):
-        """Save full project to a JSON file."""
+        """Save full project to a JSON file or a project database (.db, later edits saved as they happen)."""
 
         if not self.session_parameters:
             messagebox.showwarning("No Parameters", "Set session parameters before saving.")
@@ -617,18 +619,24 @@ class MainWindow:
         filepath = filedialog.asksaveasfilename(
             title="Save Project As",
             defaultextension=".json",
-            filetypes=[("Project files", "*.json"), ("All files", "*.*")]
+            filetypes=[("Project files", "*.json"), ("Project database", "*.db"), ("All files", "*.*")]
         )
         if not filepath:
             return
         try:
-            save_project(
-                filepath=filepath,
-                persons=self.persons,
-                defenses=self.defenses,
-                rooms=self.rooms,
-                session_parameters=self.session_parameters,
-            )
+            if filepath.endswith(".db"):
+                store = self._switch_store(ProjectStore(filepath))
+                store.save_project(self.persons, self.defenses, self.rooms, self.session_parameters)
+                if self.schedule is not None:
+                    store.track(self.schedule)
+            else:
+                save_project(
+                    filepath=filepath,
+                    persons=self.persons,
+                    defenses=self.defenses,
+                    rooms=self.rooms,
+                    session_parameters=self.session_parameters,
+                )
             self.update_status(f"Project saved: {filepath}")
             messagebox.showinfo("Save Project", f"Project saved to:\n{filepath}")
         except Exception as e:
@@ -641,29 +649,58 @@ class MainWindow:
         self.root.wait_window(dialog.dialog)
 
         if dialog.result:
-            import_type, filepath = dialog.result
+            import_type, filepath, merge = dialog.result
+
+            def progress(rows, done, total):
+                self.update_status(f"Importing {import_type}... {rows} rows ({100 * done // max(total, 1)}%)")
 
             try:
+                report = ImportReport(import_type, filepath)
                 if import_type == 'persons':
-                    imported = CSVHandler.import_persons(filepath)
-                    self.persons.extend(imported)
-                    self._refresh_persons()
-                    self.update_status(f"Imported {len(imported)} persons from CSV")
-                    messagebox.showinfo("Import Success",
-                                        f"Successfully imported {len(imported)} persons")
+                    chunks = CSVHandler.iter_persons(filepath, report, progress=progress)
+                    merger = PersonMerger(self.persons) if merge else None
+                    target, save, refresh = self.persons, "save_person", self._refresh_persons
 
                 elif import_type == 'defenses':
                     if not self.persons:
                         messagebox.showwarning("No Persons",
                                                "Import persons first before importing defenses")
                         return
-
-                    imported = CSVHandler.import_defenses(filepath, self.persons)
-                    self.defenses.extend(imported)
-                    self._refresh_defenses()
-                    self.update_status(f"Imported {len(imported)} defenses from CSV")
-                    messagebox.showinfo("Import Success",
-                                        f"Successfully imported {len(imported)} defenses")
+                    chunks = CSVHandler.iter_defenses(filepath, self.persons, report, progress=progress)
+                    merger = DefenseMerger(self.defenses) if merge else None
+                    target, save, refresh = self.defenses, "save_defense", self._refresh_defenses
+                else:
+                    return
+
+                # paczkami – pamięć ograniczona do jednej paczki ponad same dane
+                for chunk in chunks:
+                    if merger is not None:
+                        batch = merger.merge(chunk)
+                        chunk = batch.changed
+                        for item in batch.updated:
+                            self._refresh_validation_for(item)
+                    else:
+                        target.extend(chunk)
+                    for item in chunk:
+                        self._persist(save, item)
+                refresh()
+
+                summary = f"Imported {report.imported} {import_type} from CSV"
+                if merger is not None:
+                    counts = merger.result.to_dict()
+                    summary += (f" ({counts['created']} new, {counts['updated']} updated, "
+                                f"{counts['unchanged']} unchanged)")
+                if report.skipped:
+                    summary += f", skipped {report.skipped} rows"
+                self.update_status(summary)
+                issues = report.errors + report.warnings
+                if issues:
+                    details = "\n".join(f"line {e.line}: {e.message}" for e in issues[:10])
+                    if report.truncated or len(issues) > 10:
+                        details += "\n..."
+                    messagebox.showwarning("Import Finished With Issues", f"{summary}.\n\n{details}")
+                else:
+                    messagebox.showinfo("Import Success", summary)
 
             except Exception as e:
                 messagebox.showerror("Import Error", f"Error importing CSV: {str(e)}")
@@ -712,6 +749,8 @@ class MainWindow:
 
     def export_schedule(self, format=None):
         """Export schedules to CSV/PDF/JSON file."""
+        from src.utils.schedule_exporter import ScheduleExporter   # fpdf dopiero przy eksporcie
+
         if not self.schedule:
             messagebox.showwarning("No Schedule", "No schedule to export")
             return
@@ -719,15 +758,21 @@ class MainWindow:
         filetypes = {
             'csv': ("CSV files", "*.csv"),
             'json': ("JSON files", "*.json"),
-            'pdf': ("PDF files", "*.pdf")
+            'jsonl': ("JSON Lines files", "*.jsonl"),
+            'pdf': ("PDF files", "*.pdf"),
+            'ics': ("iCalendar files", "*.ics")
         }
 
         if format not in filetypes:
             format = 'csv'  # default
 
+        types = [filetypes[format]]
+        if format in ('csv', 'json', 'jsonl'):
+            # nazwa z końcówką .gz -> kompresja w locie
+            types.append((f"Compressed {format.upper()} files", f"*.{format}.gz"))
         filepath = filedialog.asksaveasfilename(
             defaultextension=f".{format}",
-            filetypes=[filetypes[format]],
+            filetypes=types,
             title=f"Export Schedule as {format.upper()}"
         )
 
@@ -739,8 +784,12 @@ class MainWindow:
                 ScheduleExporter.export_to_csv(self.schedule, filepath)
             elif format == 'json':
                 ScheduleExporter.export_to_json(self.schedule, filepath)
+            elif format == 'jsonl':
+                ScheduleExporter.export_to_jsonl(self.schedule, filepath)
             elif format == 'pdf':
                 ScheduleExporter.export_to_pdf(self.schedule, filepath)
+            elif format == 'ics':
+                ScheduleExporter.export_to_ics(self.schedule, filepath)
             else:
                 raise ValueError("Unsupported export format")
 
@@ -751,10 +800,76 @@ class MainWindow:
             messagebox.showerror("Export Error", f"Error exporting schedule: {str(e)}")
             self.update_status("Export failed")
 
+    def export_workload_report(self):
+        """Per-person workload (CSV) or full statistics (JSON) from the cached schedule statistics."""
+        from src.utils.schedule_exporter import ScheduleExporter
+
+        if not self.schedule:
+            messagebox.showwarning("No Schedule", "No schedule to export")
+            return
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json")],
+            title="Export Workload Report"
+        )
+        if not filepath:
+            return
+        try:
+            persons = ScheduleExporter.export_workload_report(self.schedule, filepath)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Error exporting workload report: {str(e)}")
+            self.update_status("Export failed")
+            return
+        self.update_status(f"Exported workload of {persons} persons to {filepath}")
+        messagebox.showinfo("Export Success", f"Workload report exported to:\n{filepath}")
+
+    def export_booklets(self):
+        """One PDF per faculty member and per room, rendered by a process pool, plus manifest.json."""
+        from src.utils.booklets import MANIFEST, export_booklets
+
+        if not self.schedule or not self.schedule.get_scheduled_defenses():
+            messagebox.showwarning("No Schedule", "No schedule to export")
+            return
+        directory = filedialog.askdirectory(title="Export Booklets To Folder", mustexist=False)
+        if not directory:
+            return
+        try:
+            booklets = export_booklets(
+                self.schedule, directory,
+                progress=lambda done, total: self.update_status(f"Rendering booklets... {done}/{total}"))
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Error exporting booklets: {str(e)}")
+            self.update_status("Export failed")
+            return
+        summary = f"Exported {len(booklets)} booklets to {directory}"
+        self.update_status(summary)
+        messagebox.showinfo("Export Success", f"{summary}\n(see {MANIFEST})")
+
+    def export_calendar_feeds(self):
+        """schedule.ics plus one .ics feed per person and per room in a chosen folder."""
+        from src.utils.schedule_exporter import ScheduleExporter
+
+        if not self.schedule or not self.schedule.get_scheduled_defenses():
+            messagebox.showwarning("No Schedule", "No schedule to export")
+            return
+        directory = filedialog.askdirectory(title="Export Calendar Feeds To Folder", mustexist=False)
+        if not directory:
+            return
+        try:
+            counts = ScheduleExporter.export_calendar_feeds(self.schedule, directory)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Error exporting calendars: {str(e)}")
+            self.update_status("Export failed")
+            return
+        summary = f"Exported {len(counts)} calendar files to {directory}"
+        self.update_status(summary)
+        messagebox.showinfo("Export Success", summary)
+
     def add_person(self):
         dialog = PersonDialog(self.root)
         if dialog.result:
             self.persons.append(dialog.result)
+            self._persist("save_person", dialog.result)
             self.update_status(f"Added person: {dialog.result.name}")
             self._refresh_persons()
 
@@ -766,6 +881,7 @@ class MainWindow:
         dialog = DefenseDialog(self.root, self.persons)
         if dialog.result:
             self.defenses.append(dialog.result)
+            self._persist("save_defense", dialog.result)
             self.update_status(f"Added defense: {dialog.result.student_name}")
             self._refresh_defenses()
 
@@ -774,6 +890,7 @@ class MainWindow:
         dialog = RoomManagementDialog(self.root, self.rooms)
         if dialog.result:
             self.rooms = dialog.result
+            self._persist("save_rooms", self.rooms)
             self._update_room_info()
             self.update_status(f"Updated rooms: {len(self.rooms)} rooms available")
             self._update_schedule_warning()
@@ -784,6 +901,7 @@ class MainWindow:
 
         if dialog.result:
             self.session_parameters = dialog.result
+            self._persist("save_parameters", self.session_parameters)
             self.update_status("Session parameters updated")
             self._update_schedule_warning()
 
@@ -817,10 +935,53 @@ class MainWindow:
         dialog = AvailabilityDialog(self.root, person,
                                     self.session_parameters.session_date if self.session_parameters else None)
         self.root.wait_window(dialog.dialog)
+        if dialog.result is None:  # anulowano albo bez zmian
+            return
+        self._persist("save_person", person)
+        self._refresh_validation_for(person)
         self.update_status(f"Updated availability for {person.name}")
 
+    def import_availability(self):
+        """Bulk-import unavailability of many persons from CSV (email,start,end) or .ics files."""
+        from src.utils.availability_import import import_unavailability
+
+        if not self.session_parameters:
+            messagebox.showwarning("No Parameters", "Set session parameters first – intervals are clipped to the session.")
+            return
+        if not self.persons:
+            messagebox.showwarning("No Faculty", "Add or import persons first.")
+            return
+        paths = filedialog.askopenfilenames(
+            title="Import Availability",
+            filetypes=[("Availability files", "*.csv *.ics"), ("All files", "*.*")]
+        )
+        if not paths:
+            return
+        try:
+            changed, reports = import_unavailability(
+                paths, self.persons, self.session_parameters,
+                progress=lambda rows, done, total: self.update_status(f"Importing availability... {rows} rows"))
+        except Exception as e:
+            messagebox.showerror("Import Error", f"Error importing availability:\n{e}")
+            return
+
+        for person in changed:
+            self._persist("save_person", person)
+            self._refresh_validation_for(person)
+        imported = sum(r.imported for r in reports)
+        summary = f"Imported {imported} unavailable intervals for {len(changed)} persons"
+        self.update_status(summary)
+        issues = [f"{os.path.basename(r.filepath)} line {e.line}: {e.message}" for r in reports for e in r.errors]
+        if issues:
+            details = "\n".join(issues[:10]) + ("\n..." if len(issues) > 10 else "")
+            messagebox.showwarning("Import Finished With Issues", f"{summary}.\n\n{details}")
+        else:
+            messagebox.showinfo("Import Availability", summary)
+
     def generate_schedule(self):
-        """Generate schedule using selected algorithm."""
+        """Generate schedule using selected algorithm (on a worker thread, see GenerationDialog)."""
+        if self._generation is not None:
+            return
         # Validation (same as before)
 
         ok, msg = self._rooms_params_ok()
@@ -848,36 +1009,58 @@ class MainWindow:
                                    "No faculty members with chairman role available")
             return
 
-        try:
-            self.update_status("Generating schedule...")
-
-            # Choose algorithm based on selection
-            if self.algorithm_var.get() == "priority":
-                scheduler = PriorityGreedyScheduler(
-                    parameters=self.session_parameters,
-                    rooms=self.rooms,
-                    available_chairmen=available_chairmen
-                )
-                algo_name = "Priority-based"
-            elif self.algorithm_var.get() == "backtracking":
-                from src.algorithm.backtracking_scheduler import BacktrackingScheduler
-                scheduler = BacktrackingScheduler(
-                    parameters=self.session_parameters,
-                    rooms=self.rooms,
-                    available_chairmen=available_chairmen
-                )
-                algo_name = "Backtracking"
-            else:
-                scheduler = SimpleGreedyScheduler(
-                    parameters=self.session_parameters,
-                    rooms=self.rooms,
-                    available_chairmen=available_chairmen
-                )
-                algo_name = "Simple greedy"
+        # Choose algorithm based on selection (algorithm_var lives on the deferred Schedule tab)
+        self._ensure_tab(self.schedule_frame)
+        if self.algorithm_var.get() == "priority":
+            scheduler = PriorityGreedyScheduler(
+                parameters=self.session_parameters,
+                rooms=self.rooms,
+                available_chairmen=available_chairmen
+            )
+            algo_name = "Priority-based"
+        elif self.algorithm_var.get() == "backtracking":
+            from src.algorithm.backtracking_scheduler import BacktrackingScheduler
+            scheduler = BacktrackingScheduler(
+                parameters=self.session_parameters,
+                rooms=self.rooms,
+                available_chairmen=available_chairmen
+            )
+            algo_name = "Backtracking"
+        else:
+            scheduler = SimpleGreedyScheduler(
+                parameters=self.session_parameters,
+                rooms=self.rooms,
+                available_chairmen=available_chairmen
+            )
+            algo_name = "Simple greedy"
+
+        # obliczenia w wątku roboczym (identyczne dane -> wynik z cache); okno zostaje responsywne,
+        # wynik trafia do self.schedule dopiero po zakończeniu
+        initial = self.schedule if self.warm_start_var.get() else None
+        worker = GenerationWorker(self.result_cache, scheduler, self.persons, self.defenses, initial=initial)
+        self.update_status(f"Generating schedule ({algo_name})...")
+        self._generation = GenerationDialog(
+            self.root, worker, f"Generating Schedule – {algo_name}",
+            on_finish=lambda kind, payload: self._generation_finished(algo_name, kind, payload))
+
+    def _generation_finished(self, algo_name, kind, payload):
+        """Apply the worker's result (called on the Tk thread once the run has ended)."""
+        self._generation = None
+        if kind == "cancelled":
+            self.update_status("Schedule generation cancelled")
+            return
+        if kind == "error":
+            messagebox.showerror("Error", f"Error generating schedule: {str(payload)}")
+            self.update_status("Schedule generation failed")
+            return
 
-            # Generate schedule
-            schedule, conflicts = scheduler.schedule(self.defenses)
+        try:
+            schedule, conflicts, cache_key, cache_hit = payload
             self.schedule = schedule
+            self._attach_validation(changed=True)
+            self.last_cache_key = cache_key
+            if cache_hit:
+                algo_name += " (cached)"
 
             # try:
             #     opt = ScheduleOptimizer(OptimizationWeights(
@@ -922,7 +1105,7 @@ class MainWindow:
                                     f"Successfully scheduled all {scheduled_count} defenses!")
 
             self.update_status(f"Schedule generated using {algo_name}: "
-                               f"{scheduled_count}/{total_count} defenses scheduled")
+                               f"{scheduled_count}/{total_count} defenses scheduled | key {cache_key[:12]}")
             self._display_schedule()
             self.show_schedule_table()
 
@@ -936,18 +1119,18 @@ class MainWindow:
         """Clear the current schedule and its display."""
         if self.schedule and messagebox.askyesno("Clear Schedule", "Are you sure you want to clear the schedule?"):
             self.schedule = None
+            self._attach_validation(changed=True)
 
             # Usuń standardowy harmonogram (labelki)
+            self._ensure_tab(self.schedule_frame)
             for widget in self.schedule_display_frame.winfo_children():
                 widget.destroy()
 
             # Usuń tabelkę, jeśli istnieje
-            if hasattr(self, 'table_frame'):
-                self.table_frame.destroy()
-                del self.table_frame
-
-            if hasattr(self, 'tree'):
-                del self.tree
+            if self.schedule_table is not None:
+                self.schedule_table.destroy()   # <Destroy> odpina ją od harmonogramu
+                self.schedule_table = None
+            self._card_grid = None
 
             # Pokaż placeholder
             schedule_label = ttk.Label(self.schedule_display_frame,
@@ -958,7 +1141,7 @@ class MainWindow:
             self.update_status("Schedule cleared")
 
     def validate_schedule(self):
-        """Run structural and time-conflict validation and show a report."""
+        """Show the structural and time-conflict report of the live validation engine."""
         from src.utils.validators import Validator
 
         if not self.defenses:
@@ -972,7 +1155,11 @@ class MainWindow:
 
         self.update_status("Validating schedule...")
 
-        report = Validator.validate_schedule(self.schedule.get_scheduled_defenses())
+        # naruszenia utrzymuje na bieżąco ValidationEngine – bez pełnej walidacji
+        if self.validation is None:
+            self._attach_validation()
+        scheduled = self.schedule.get_scheduled_defenses()
+        report = sorted(set(Validator.validate_defense_data(scheduled)) | set(self.validation.messages()))
 
         if report:
             messagebox.showwarning("Validation Report", "• " + "\n• ".join(report))
@@ -1036,83 +1223,13 @@ class MainWindow:
             self._update_schedule_warning()
 
     def show_schedule_table(self):
-        if hasattr(self, 'table_frame'):
-            self.table_frame.destroy()
-
-        self.table_frame = ttk.Frame(self.schedule_frame)
-        self.table_frame.pack(fill='both', expand=True)
-
-        columns = ("time", "student", "room", "supervisor", "reviewer", "chairman")
-
-        self.tree = ttk.Treeview(self.table_frame, columns=columns, show='headings', height=20)
-        self.tree.pack(side='left', fill='both', expand=True)
-
-        # Nagłówki
-        self.tree.heading("time", text="Time Slot")
-        self.tree.heading("student", text="Student")
-        self.tree.heading("room", text="Room")
-        self.tree.heading("supervisor", text="Supervisor")
-        self.tree.heading("reviewer", text="Reviewer")
-        self.tree.heading("chairman", text="Chairman")
-
-        # Kolumny (po zdefiniowaniu 'columns', nie wcześniej!)
-        for col in columns:
-            self.tree.column(col, width=120, anchor="center", stretch=True)
-
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(self.table_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-
-        # Style tagów – pastelowe kolory (20)
-        style = ttk.Style()
-        style.map("Treeview", background=[('selected', '#cccccc')])
-
-        pastel_colors = [
-            "#e6f2ff", "#e6ffe6", "#fff0e6", "#f9e6ff", "#ffffe6",
-            "#e6ffff", "#ffe6f2", "#f2ffe6", "#f0f0f5", "#ffe6cc",
-            "#e6f7ff", "#f0fff0", "#fff5e6", "#fbe6ff", "#f2f2e6",
-            "#e6e6ff", "#e6fff9", "#fff0f5", "#f9ffe6", "#e6f9ff"
-        ]
-
-        # mapowanie sal -> kolor
-        room_tags = {}
-        for idx, room in enumerate(self.rooms):
-            color = pastel_colors[idx % len(pastel_colors)]
-            tag_name = f"room_{room.number}"
-            self.tree.tag_configure(tag_name, background=color)
-            room_tags[room.name] = tag_name
-
-        # tag konfliktu
-        self.tree.tag_configure("conflict", background="#ffcccc")
+        """Fill the schedule table in batches (rows keyed by slot; later edits update single rows)."""
+        self._ensure_tab(self.schedule_frame)
+        if self.schedule_table is None or not self.schedule_table.winfo_exists():
+            self.schedule_table = ScheduleTable(self.schedule_frame)
+            self.schedule_table.pack(fill='both', expand=True)
 
-        # Wypełnienie danych
+        self.schedule_table.load(self.schedule, self.rooms)
         if not self.schedule:
             messagebox.showinfo("No schedule", "No schedule generated.")
-            return
-
-        times_seen = {}  # (room, time) → True
-        for slot in self.schedule.slots:
-            if not slot.defense:
-                continue
-
-            d = slot.defense
-            time_str = str(slot.time_slot)
-            room = slot.room.name
-            key = (room, time_str)
-
-            tag = room_tags.get(room, "")
-            if key in times_seen:
-                tag = "conflict"
-            else:
-                times_seen[key] = True
-
-            self.tree.insert("", "end", values=(
-                time_str,
-                d.student_name,
-                room,
-                d.supervisor.name,
-                d.reviewer.name,
-                d.chairman.name if d.chairman else "—"
-            ), tags=(tag,))
 
@@ -0,0 +1,152 @@
+import bisect
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List, Optional, Tuple
+
+COLUMNS = ("time", "student", "room", "supervisor", "reviewer", "chairman")
+HEADINGS = ("Time Slot", "Student", "Room", "Supervisor", "Reviewer", "Chairman")
+
+# Style tagów – pastelowe kolory (20)
+PASTEL_COLORS = [
+    "#e6f2ff", "#e6ffe6", "#fff0e6", "#f9e6ff", "#ffffe6",
+    "#e6ffff", "#ffe6f2", "#f2ffe6", "#f0f0f5", "#ffe6cc",
+    "#e6f7ff", "#f0fff0", "#fff5e6", "#fbe6ff", "#f2f2e6",
+    "#e6e6ff", "#e6fff9", "#fff0f5", "#f9ffe6", "#e6f9ff"
+]
+
+
+class ScheduleTable(ttk.Frame):
+    """
+    Schedule Treeview that is built once and filled incrementally.
+
+    `load()` clears the rows in one call and inserts them `BATCH` at a time from `after()`
+    callbacks, so the window stays responsive for thousands of defenses. Rows are keyed by
+    slot (iid = position in `schedule.slots`): the table subscribes to the schedule and
+    add/remove/move/chairman events touch only the affected rows; `refresh(item)` re-renders
+    the rows of a defense or person edited in place. Slots the fill has not reached yet are
+    left to it – it always reads the live slot.
+    """
+
+    BATCH = 250
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.tree = ttk.Treeview(self, columns=COLUMNS, show='headings', height=20)
+        self.tree.pack(side='left', fill='both', expand=True)
+        for col, text in zip(COLUMNS, HEADINGS):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=120, anchor="center", stretch=True)
+        scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscroll=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+
+        style = ttk.Style()
+        style.map("Treeview", background=[('selected', '#cccccc')])
+        self.tree.tag_configure("conflict", background="#ffcccc")
+
+        self.schedule = None
+        self._room_tags: Dict[str, str] = {}
+        self._index: Dict[int, int] = {}          # id(slot) -> pozycja w schedule.slots
+        self._placed: List[int] = []              # posortowane pozycje wierszy w tabeli
+        self._row_of: Dict[int, int] = {}         # id(defense) -> pozycja jego wiersza
+        self._keys: Dict[Tuple[str, str], int] = {}   # (sala, czas) -> liczba wierszy
+        self._cursor = 0                          # dokąd doszło wypełnianie
+        self._job: Optional[str] = None
+        self.bind("<Destroy>", lambda _e: self.detach(), add="+")
+
+    # ---------- ładowanie ----------
+
+    def load(self, schedule, rooms) -> None:
+        """Show `schedule`; rows appear in batches, later edits are applied row by row."""
+        self.detach()
+        self.tree.delete(*self.tree.get_children())
+        self._room_tags = {}
+        for idx, room in enumerate(rooms):
+            tag_name = f"room_{room.number}"
+            self.tree.tag_configure(tag_name, background=PASTEL_COLORS[idx % len(PASTEL_COLORS)])
+            self._room_tags[room.name] = tag_name
+        self._placed, self._row_of, self._keys = [], {}, {}
+        self._cursor = 0
+        self.schedule = schedule
+        if schedule is None:
+            self._index = {}
+            return
+        self._index = {id(slot): i for i, slot in enumerate(schedule.slots)}
+        schedule.subscribe(self._on_event)
+        self._job = self.after(0, self._fill)
+
+    def detach(self) -> None:
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        if self.schedule is not None:
+            self.schedule.unsubscribe(self._on_event)
+
+    @property
+    def loading(self) -> bool:
+        return self._job is not None
+
+    def _fill(self) -> None:
+        slots = self.schedule.slots
+        end = min(len(slots), self._cursor + self.BATCH * 4)   # puste sloty są tanie
+        inserted = 0
+        while self._cursor < end and inserted < self.BATCH:
+            i = self._cursor
+            self._cursor += 1
+            if slots[i].defense is not None:
+                self._insert(i)
+                inserted += 1
+        self._job = self.after(1, self._fill) if self._cursor < len(slots) else None
+
+    # ---------- wiersze ----------
+
+    def _values(self, slot) -> Tuple[str, ...]:
+        d = slot.defense
+        return (str(slot.time_slot), d.student_name, slot.room.name, d.supervisor.name, d.reviewer.name,
+                d.chairman.name if d.chairman else "—")
+
+    def _insert(self, i: int) -> None:
+        slot = self.schedule.slots[i]
+        values = self._values(slot)
+        key = (values[2], values[0])
+        tag = "conflict" if self._keys.get(key) else self._room_tags.get(values[2], "")
+        self._keys[key] = self._keys.get(key, 0) + 1
+        pos = bisect.bisect_left(self._placed, i)
+        self._placed.insert(pos, i)
+        self._row_of[id(slot.defense)] = i
+        self.tree.insert("", pos, iid=str(i), values=values, tags=(tag,))
+
+    def _delete(self, i: int) -> None:
+        pos = bisect.bisect_left(self._placed, i)
+        if pos == len(self._placed) or self._placed[pos] != i:
+            return
+        del self._placed[pos]
+        values = self.tree.item(str(i), "values")
+        key = (values[2], values[0])
+        self._keys[key] -= 1
+        self.tree.delete(str(i))
+
+    def _update(self, i: int) -> None:
+        self.tree.item(str(i), values=self._values(self.schedule.slots[i]))
+
+    def _on_event(self, event, defense, slot) -> None:
+        old = self._row_of.pop(id(defense), None)
+        if old is not None:
+            if event == "chairman" and slot is not None and self._index.get(id(slot)) == old:
+                self._row_of[id(defense)] = old
+                self._update(old)
+                return
+            self._delete(old)
+        if slot is None:
+            return
+        i = self._index.get(id(slot))
+        if i is not None and i < self._cursor and slot.defense is defense:
+            self._insert(i)
+
+    def refresh(self, item=None) -> None:
+        """Re-render rows after a defense or person changed in place (None = every row)."""
+        slots = self.schedule.slots if self.schedule is not None else []
+        for i in list(self._placed):
+            d = slots[i].defense
+            if item is None or d is item or item in (d.supervisor, d.reviewer, d.chairman):
+                self._update(i)
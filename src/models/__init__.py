@@ -3,6 +3,7 @@ from .person import Person
 from .defense import Defense
 from .room import Room
 from .time_slot import TimeSlot
+from .interval_list import IntervalList
 from .session_parameters import SessionParameters
 
-__all__ = ['Role', 'Person', 'Defense', 'Room', 'TimeSlot', 'SessionParameters']
\ No newline at end of file
+__all__ = ['Role', 'Person', 'Defense', 'Room', 'TimeSlot', 'IntervalList', 'SessionParameters']
\ No newline at end of file
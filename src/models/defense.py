@@ -5,7 +5,7 @@ from .time_slot import TimeSlot
 from .room import Room
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Defense:
     """Represents a thesis defense."""
     student_name: str
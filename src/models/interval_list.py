@@ -0,0 +1,113 @@
+from bisect import bisect_right
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from .time_slot import TimeSlot
+
+
+class IntervalList(list):
+    """
+    List of TimeSlots kept sorted by start with overlapping/touching entries merged.
+
+    Every mutation that adds intervals renormalizes the list, so it always holds disjoint
+    intervals in order and `overlaps` can answer with a binary search over the end times.
+    """
+
+    __slots__ = ("_starts", "_ends", "_masks")
+
+    def __init__(self, intervals: Iterable[TimeSlot] = ()):
+        super().__init__()
+        self._starts: Optional[List] = None
+        self._ends: Optional[List] = None
+        self._masks: Optional[Dict[Hashable, int]] = None
+        if intervals:
+            self.extend(intervals)
+
+    # ---------- zapytania ----------
+
+    def overlaps(self, time_slot: TimeSlot) -> bool:
+        """True when any interval overlaps `time_slot` (O(log n))."""
+        if not self:
+            return False
+        if self._ends is None:
+            self._starts = [s.start for s in self]
+            self._ends = [s.end for s in self]
+        # pierwszy przedział kończący się po początku zapytania
+        i = bisect_right(self._ends, time_slot.start)
+        return i < len(self._starts) and self._starts[i] < time_slot.end
+
+    def cached_mask(self, grid_key: Hashable) -> Optional[int]:
+        """Slot bitmask compiled earlier for the grid `grid_key` (dropped on any change)."""
+        return self._masks.get(grid_key) if self._masks else None
+
+    def store_mask(self, grid_key: Hashable, mask: int) -> None:
+        if self._masks is None:
+            self._masks = {}
+        self._masks[grid_key] = mask
+
+    # ---------- normalizacja ----------
+
+    def _normalize(self) -> None:
+        if len(self) < 2:
+            self._invalidate()
+            return
+        merged: List[TimeSlot] = []
+        for ts in sorted(super().__iter__(), key=lambda s: (s.start, s.end)):
+            if merged and ts.start <= merged[-1].end:
+                if ts.end > merged[-1].end:
+                    merged[-1] = TimeSlot(start=merged[-1].start, end=ts.end)
+            else:
+                merged.append(ts)
+        super().__setitem__(slice(None), merged)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._starts = None
+        self._ends = None
+        self._masks = None
+
+    def append(self, time_slot: TimeSlot) -> None:
+        super().append(time_slot)
+        self._normalize()
+
+    def extend(self, intervals: Iterable[TimeSlot]) -> None:
+        super().extend(intervals)
+        self._normalize()
+
+    def insert(self, index: int, time_slot: TimeSlot) -> None:
+        super().insert(index, time_slot)
+        self._normalize()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._normalize()
+
+    def __iadd__(self, intervals: Iterable[TimeSlot]):
+        self.extend(intervals)
+        return self
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._invalidate()
+
+    def remove(self, time_slot: TimeSlot) -> None:
+        super().remove(time_slot)
+        self._invalidate()
+
+    def pop(self, index: int = -1) -> TimeSlot:
+        item = super().pop(index)
+        self._invalidate()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args, **kwargs) -> None:
+        # zawsze posortowana po początku – inne porządki złamałyby wyszukiwanie binarne
+        self._normalize()
+
+    def reverse(self) -> None:
+        self._normalize()
+
+    def copy(self) -> List[TimeSlot]:
+        return list(self)
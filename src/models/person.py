@@ -3,14 +3,21 @@ from typing import Set, List
 from datetime import datetime
 from .role import Role
 from .time_slot import TimeSlot
+from .interval_list import IntervalList
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     """Represents a faculty member who can participate in defenses."""
     name: str
     email: str
     roles: Set[Role] = field(default_factory=set)
     unavailable_slots: List['TimeSlot'] = field(default_factory=list)
+
+    def __setattr__(self, name, value):
+        # niedostępności zawsze jako posortowana, scalona IntervalList (także przy wczytywaniu)
+        if name == "unavailable_slots" and not isinstance(value, IntervalList):
+            value = IntervalList(value or [])
+        object.__setattr__(self, name, value)
     
     def __post_init__(self):
         if not self.email or '@' not in self.email:
@@ -20,10 +27,7 @@ class Person:
     
     def is_available_at(self, time_slot: 'TimeSlot') -> bool:
         """Check if person is available during given time slot."""
-        for unavailable in self.unavailable_slots:
-            if unavailable.overlaps_with(time_slot):
-                return False
-        return True
+        return not self.unavailable_slots.overlaps(time_slot)
     
     def can_be_chairman(self) -> bool:
         """Check if person can serve as chairman."""
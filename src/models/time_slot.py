@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeSlot:
     """Represents a time period."""
     start: datetime
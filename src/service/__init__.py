@@ -0,0 +1,4 @@
+from .jobs import Job, JobManager, QueueFullError
+from .http_server import SchedulingHTTPServer, SchedulingRequestHandler
+
+__all__ = ['Job', 'JobManager', 'QueueFullError', 'SchedulingHTTPServer', 'SchedulingRequestHandler']
@@ -0,0 +1,173 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from src.service.jobs import JobManager, QueueFullError, DONE, FAILED, CANCELLED
+
+
+MAX_BODY_BYTES = 50 * 1024 * 1024
+RETRY_AFTER_SEC = 5
+
+
+class SchedulingRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API:
+    - GET    /health              – liveness + queue stats
+    - POST   /jobs?algorithm=...  – body: project in save_project shape
+                                    (&warm_start=1 keeps its existing assignments as the start)
+    - GET    /jobs                – list of jobs
+    - GET    /jobs/<id>           – status and progress
+    - GET    /jobs/<id>/result    – scheduled project + conflicts
+    - DELETE /jobs/<id>           – cancel a queued job
+    """
+
+    server_version = "ThesisDefenseScheduler/1.0"
+
+    @property
+    def jobs(self) -> JobManager:
+        return self.server.jobs
+
+    # ---------- helpers ----------
+
+    def _send_json(self, status: int, payload, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[dict] = None) -> None:
+        self._send_json(status, {"error": message}, headers)
+
+    def _route(self) -> Tuple[list, dict]:
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        return parts, query
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+    # ---------- verbs ----------
+
+    def do_GET(self):
+        parts, _ = self._route()
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", **self.jobs.stats()})
+        elif parts == ["jobs"]:
+            self._send_json(200, [job.to_dict() for job in self.jobs.list_jobs()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                self._send_error(404, "Job not found")
+            else:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            self._get_result(parts[1])
+        else:
+            self._send_error(404, "Not found")
+
+    def _get_result(self, job_id: str) -> None:
+        job = self.jobs.get(job_id)
+        if job is None:
+            self._send_error(404, "Job not found")
+        elif job.status == DONE:
+            self._send_json(200, {**job.to_dict(), "result": job.result})
+        elif job.status in (FAILED, CANCELLED):
+            self._send_json(409, job.to_dict())
+        else:
+            # jeszcze liczy – klient ma pytać dalej
+            self._send_json(202, job.to_dict(), {"Retry-After": "1"})
+
+    def do_POST(self):
+        parts, query = self._route()
+        if parts != ["jobs"]:
+            self._send_error(404, "Not found")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_error(400, "Invalid Content-Length")
+            return
+        if length <= 0:
+            self._send_error(400, "Request body is required")
+            return
+        if length > MAX_BODY_BYTES:
+            self._send_error(413, "Project is too large")
+            return
+
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self._send_error(400, f"Invalid JSON: {e}")
+            return
+
+        try:
+            time_limit = float(query["time_limit"]) if "time_limit" in query else None
+            warm_start = query.get("warm_start", "0").lower() in ("1", "true", "yes")
+            job = self.jobs.submit(data, algorithm=query.get("algorithm", "simple"), time_limit=time_limit,
+                                   warm_start=warm_start)
+        except QueueFullError as e:
+            self._send_error(503, str(e), {"Retry-After": str(RETRY_AFTER_SEC)})
+            return
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+
+        self._send_json(202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_error(404, "Not found")
+            return
+        job = self.jobs.get(parts[1])
+        if job is None:
+            self._send_error(404, "Job not found")
+        elif self.jobs.cancel(job.id):
+            self._send_json(200, {"id": job.id, "status": CANCELLED})
+        else:
+            self._send_error(409, f"Job cannot be cancelled (status: {job.status})")
+
+
+class SchedulingHTTPServer(ThreadingHTTPServer):
+    """HTTP server owning a JobManager; port 0 picks a free port."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], jobs: JobManager, quiet: bool = False):
+        super().__init__(address, SchedulingRequestHandler)
+        self.jobs = jobs
+        self.quiet = quiet
+
+    def server_close(self):
+        super().server_close()
+        self.jobs.shutdown(wait=False)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Thesis Defense Scheduler – local scheduling service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="size of the process pool")
+    parser.add_argument("--queue-size", type=int, default=8, help="jobs allowed to wait for a worker")
+    parser.add_argument("--cache-dir", default=None, help="share results through an on-disk result cache")
+    args = parser.parse_args(argv)
+
+    jobs = JobManager(args.workers, args.queue_size, cache_dir=args.cache_dir)
+    server = SchedulingHTTPServer((args.host, args.port), jobs)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} "
+          f"({args.workers} workers, queue {args.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
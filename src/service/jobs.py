@@ -0,0 +1,266 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.algorithm import ALGORITHMS
+from src.utils.project_io import project_from_dict, project_to_dict
+from src.utils.result_cache import ScheduleCache, apply_assignments, run_cached, scheduler_cache_key
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is rejected by admission control."""
+
+
+@dataclass
+class Job:
+    """A single scheduling request tracked by the JobManager."""
+    id: str
+    algorithm: str
+    total: int
+    cache_key: Optional[str] = None
+    status: str = QUEUED
+    placed: int = 0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def is_finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "algorithm": self.algorithm,
+            "status": self.status,
+            "progress": {"placed": self.placed, "total": self.total},
+            "cache_key": self.cache_key,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+# ---------- worker process side ----------
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _build_scheduler(algorithm: str, persons, rooms, params, time_limit: Optional[float], progress=None):
+    scheduler = ALGORITHMS[algorithm](
+        parameters=params,
+        rooms=rooms,
+        available_chairmen=[p for p in persons if p.can_be_chairman()],
+        progress_callback=progress,
+    )
+    if time_limit is not None:
+        scheduler.TIME_LIMIT_SEC = time_limit
+    return scheduler
+
+
+def solve_project(job_id: Optional[str], data: dict, algorithm: str, time_limit: Optional[float] = None,
+                  cache_dir: Optional[str] = None, warm_start: bool = False) -> dict:
+    """
+    Runs one scheduler on a project document; executed inside a pool worker.
+    With warm_start the assignments already present in the document are the starting point.
+    """
+    persons, defenses, rooms, params, loaded = project_from_dict(data)
+
+    def progress(placed: int, total: int) -> None:
+        if _progress_queue is not None:
+            _progress_queue.put((job_id, "progress", placed))
+
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, "started", 0))
+
+    scheduler = _build_scheduler(algorithm, persons, rooms, params, time_limit, progress)
+    cache = ScheduleCache(cache_dir) if cache_dir else None
+    schedule, conflicts, key, hit = run_cached(cache, scheduler, persons, defenses,
+                                               initial=loaded if warm_start else None)
+    return _job_result(data, persons, defenses, rooms, params, schedule, [str(c) for c in conflicts], key, hit)
+
+
+def _job_result(data: dict, persons, defenses, rooms, params, schedule, conflicts: List[str],
+                key: str, hit: bool) -> dict:
+    return {
+        # wynik w tej samej wersji formatu, w której przyszedł projekt
+        "project": project_to_dict(persons, defenses, rooms, params, version=data.get("version", 1)),
+        "conflicts": conflicts,
+        "scheduled": len(schedule.get_scheduled_defenses()),
+        "total": len(defenses),
+        "cache_key": key,
+        "cache_hit": hit,
+    }
+
+
+# ---------- server side ----------
+
+class JobManager:
+    """
+    Fixed-size process pool with admission control.
+
+    At most `workers` jobs run at once and at most `queue_size` more wait for
+    a free worker; anything beyond that is rejected with QueueFullError.
+    Finished jobs are kept (up to `keep_finished`) so clients can poll results.
+    With `cache_dir` set, results are shared through a ScheduleCache and
+    repeated requests are answered without touching the pool.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 8, keep_finished: int = 100,
+                 cache_dir: Optional[str] = None):
+        if workers <= 0:
+            raise ValueError("Worker count must be positive")
+        if queue_size < 0:
+            raise ValueError("Queue size cannot be negative")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.keep_finished = keep_finished
+        self.cache_dir = cache_dir
+        self._cache = ScheduleCache(cache_dir) if cache_dir else None
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._finished_order: List[str] = []
+
+        # spawn: bezpieczne przy wielowątkowym serwerze HTTP
+        ctx = multiprocessing.get_context("spawn")
+        self._progress_queue = ctx.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._progress_queue,),
+        )
+        self._progress_thread = threading.Thread(target=self._drain_progress, daemon=True)
+        self._progress_thread.start()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _active_count(self) -> int:
+        return sum(1 for j in self._jobs.values() if not j.is_finished())
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+            running = sum(1 for j in self._jobs.values() if j.status == RUNNING)
+        return {"workers": self.workers, "capacity": self.capacity, "queued": queued, "running": running}
+
+    def submit(self, data: dict, algorithm: str = "simple", time_limit: Optional[float] = None,
+               warm_start: bool = False) -> Job:
+        """Validates the project document and enqueues it; raises ValueError or QueueFullError."""
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        # szybka walidacja w procesie serwera – błędne dane nie zajmują workera
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid project: expected a JSON object, got {type(data).__name__}")
+        try:
+            persons, defenses, rooms, params, loaded = project_from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid project: {e}") from e
+        scheduler = _build_scheduler(algorithm, persons, rooms, params, time_limit)
+        key = scheduler_cache_key(scheduler, persons, defenses, initial=loaded if warm_start else None)
+
+        entry = self._cache.get(key) if self._cache is not None else None
+        if entry is not None:
+            # trafienie w cache – zapisane przydziały nakładane od ręki; nigdy pełne liczenie poza kolejką
+            schedule = apply_assignments(scheduler, defenses, entry["assignments"])
+            result = _job_result(data, persons, defenses, rooms, params, schedule,
+                                 [c["message"] for c in entry["conflicts"]], key, True)
+            now = time.time()
+            job = Job(id=uuid.uuid4().hex, algorithm=algorithm, total=len(defenses), cache_key=key,
+                      status=DONE, placed=result["scheduled"], started_at=now, finished_at=now, result=result)
+            with self._lock:
+                self._jobs[job.id] = job
+                self._finished_order.append(job.id)
+                self._evict_finished()
+            return job
+
+        with self._lock:
+            if self._active_count() >= self.capacity:
+                raise QueueFullError(f"Job queue is full ({self.capacity} active jobs)")
+            job = Job(id=uuid.uuid4().hex, algorithm=algorithm, total=len(defenses), cache_key=key)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(solve_project, job.id, data, algorithm, time_limit,
+                                               self.cache_dir, warm_start)
+
+        job.future.add_done_callback(lambda fut, job_id=job.id: self._on_done(job_id, fut))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a job that has not started yet."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED or job.future is None:
+                return False
+            future = job.future
+        return future.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._progress_queue.put(None)
+        self._progress_thread.join(timeout=5)
+
+    def _on_done(self, job_id: str, fut: Future) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.finished_at = time.time()
+            if fut.cancelled():
+                job.status = CANCELLED
+            elif fut.exception() is not None:
+                job.status = FAILED
+                job.error = str(fut.exception())
+            else:
+                job.result = fut.result()
+                job.placed = job.result["scheduled"]
+                job.status = DONE
+            job.future = None
+            self._finished_order.append(job_id)
+            self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        while len(self._finished_order) > self.keep_finished:
+            self._jobs.pop(self._finished_order.pop(0), None)
+
+    def _drain_progress(self) -> None:
+        for message in iter(self._progress_queue.get, None):
+            job_id, event, placed = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.is_finished():
+                    continue
+                if event == "started":
+                    job.status = RUNNING
+                    job.started_at = time.time()
+                else:
+                    job.placed = max(job.placed, placed)
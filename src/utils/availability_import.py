@@ -0,0 +1,122 @@
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from src.models import Person, SessionParameters, TimeSlot, IntervalList
+from src.utils.csv_handler import CSVHandler, ImportReport, ImportProgress
+from src.utils.icalendar import iter_busy_events
+from src.utils.merge import email_key, person_key
+
+
+def session_window(params: SessionParameters) -> TimeSlot:
+    """Session day from start_time to end_time – the only part of a calendar that matters."""
+    def at(hhmm: str) -> datetime:
+        h, m = map(int, hhmm.split(":"))
+        return datetime.combine(params.session_date, datetime.min.time().replace(hour=h, minute=m))
+    return TimeSlot(at(params.start_time), at(params.end_time))
+
+
+class AvailabilityImporter:
+    """
+    Bulk unavailability from CSV (email, start, end) and .ics files.
+
+    Every interval is clipped to the session window as it is read; intervals that miss the
+    window are dropped immediately, so even year-long calendars keep only a handful per person.
+    `apply()` then attaches them through the email index with one merge per person
+    (Person.unavailable_slots is an IntervalList, which sorts and merges overlaps).
+    """
+
+    def __init__(self, persons: List[Person], params: SessionParameters):
+        self.window = session_window(params)
+        self._index: Dict[str, Person] = {}
+        for p in persons:
+            self._index.setdefault(person_key(p), p)
+        self._pending: Dict[int, List[TimeSlot]] = {}
+        self._persons: Dict[int, Person] = {}
+        self.reports: List[ImportReport] = []
+        self.clipped_away = 0   # przedziały poza oknem sesji
+
+    def add(self, email: str, start: datetime, end: datetime) -> Optional[bool]:
+        """Queue one interval; None = unknown email, False = outside the session window."""
+        person = self._index.get(email_key(email))
+        if person is None:
+            return None
+        start, end = max(start, self.window.start), min(end, self.window.end)
+        if start >= end:
+            self.clipped_away += 1
+            return False
+        self._pending.setdefault(id(person), []).append(TimeSlot(start, end))
+        self._persons[id(person)] = person
+        return True
+
+    def read(self, filepath: str, email: Optional[str] = None,
+             progress: Optional[ImportProgress] = None) -> ImportReport:
+        """Read one .csv or .ics file; for .ics, `email` (or an 'email@domain.ics' file name) names the owner."""
+        if filepath.lower().endswith(".ics"):
+            report = self._read_ics(filepath, email)
+        else:
+            report = ImportReport("availability", filepath)
+            for line, row_email, start, end in CSVHandler.iter_unavailability(filepath, report, progress):
+                self._count(report, line, row_email, self.add(row_email, start, end))
+        self.reports.append(report)
+        return report
+
+    def _read_ics(self, filepath: str, email: Optional[str]) -> ImportReport:
+        report = ImportReport("availability", filepath)
+        if email is None:
+            stem = os.path.splitext(os.path.basename(filepath))[0]
+            email = stem if "@" in stem else None
+        errors = []
+        with open(filepath, "r", encoding="utf-8-sig") as f:
+            for event in iter_busy_events(f, errors):
+                report.rows_read += 1
+                owners = [email] if email else [e for e in event.emails if email_key(e) in self._index]
+                if not owners:
+                    report.error(event.line, "ATTENDEE", "No known person for this event")
+                    continue
+                try:
+                    occurrences = list(event.occurrences(self.window.start, self.window.end))
+                except ValueError as e:
+                    report.error(event.line, "RRULE", str(e))
+                    continue
+                if not occurrences:
+                    self.clipped_away += 1
+                    continue
+                for owner in owners:
+                    for start, end in occurrences:
+                        self._count(report, event.line, owner, self.add(owner, start, end))
+        for line, message in errors:
+            report.rows_read += 1
+            report.error(line, None, message)
+        return report
+
+    @staticmethod
+    def _count(report: ImportReport, line: int, email: str, outcome: Optional[bool]) -> None:
+        if outcome is None:
+            report.error(line, "email", f"No person with email {email}")
+        elif outcome:
+            report.imported += 1
+
+    def apply(self, replace: bool = False) -> List[Person]:
+        """Attach the queued intervals; `replace` drops each affected person's previous ones. Returns changed persons."""
+        changed = []
+        for key, slots in self._pending.items():
+            person = self._persons[key]
+            if replace:
+                person.unavailable_slots = IntervalList(slots)
+            else:
+                person.unavailable_slots.extend(slots)
+            changed.append(person)
+        self._pending.clear()
+        self._persons.clear()
+        return changed
+
+
+def import_unavailability(paths: Iterable[str], persons: List[Person], params: SessionParameters,
+                          replace: bool = False, email: Optional[str] = None,
+                          progress: Optional[ImportProgress] = None):
+    """Read all `paths` and attach the intervals; returns (changed persons, per-file reports)."""
+    importer = AvailabilityImporter(persons, params)
+    for path in paths:
+        importer.read(path, email=email, progress=progress)
+    return importer.apply(replace=replace), importer.reports
@@ -0,0 +1,154 @@
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.pdf_engine import PdfRow, SchedulePDF, schedule_rows
+
+MANIFEST = "manifest.json"
+ROLES = ("supervisor", "reviewer", "chairman")
+
+# (gotowe, wszystkie) – wywoływane w procesie głównym po każdej paczce
+BookletProgress = Callable[[int, int], None]
+
+
+@dataclass
+class Booklet:
+    """One printout: every defense of a person (in any role) or of a room."""
+    kind: str                  # "person" | "room"
+    key: str                   # email albo sala
+    name: str
+    filename: str = ""
+    rows: List[PdfRow] = field(default_factory=list)
+    roles: Dict[str, int] = field(default_factory=dict)
+    pages: int = 0
+
+    @property
+    def title(self) -> str:
+        return f"Defense schedule – {self.name}"
+
+    @property
+    def subtitle(self) -> str:
+        if self.kind == "person":
+            return " · ".join(f"{role.capitalize()}: {self.roles[role]}" for role in ROLES if self.roles.get(role))
+        return f"{len(self.rows)} defenses"
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "key": self.key, "name": self.name, "file": self.filename,
+                "defenses": len(self.rows), "roles": dict(self.roles), "pages": self.pages}
+
+
+def build_booklets(schedule, kinds: Iterable[str] = ("person", "room")) -> List[Booklet]:
+    """
+    Per-person and per-room indexes in one pass over the schedule.
+
+    Each placed defense becomes one PdfRow shared by the booklets of its room, supervisor,
+    reviewer and chairman; a person holding two roles in the same defense gets the row once.
+    Persons are keyed by email, rooms by their place in the schedule.
+    """
+    kinds = set(kinds)
+    unknown = kinds - {"person", "room"}
+    if unknown:
+        raise ValueError(f"Unknown booklet kind(s): {', '.join(sorted(unknown))}")
+    persons: Dict[str, Booklet] = {}
+    rooms: Dict[int, Booklet] = {}
+    placed = [slot for slot in schedule.slots if slot.defense is not None]
+    for slot, row in zip(placed, schedule_rows(schedule)):   # ta sama kolejność slotów
+        d = slot.defense
+        if "room" in kinds:
+            booklet = rooms.get(row.room_order)
+            if booklet is None:
+                room = slot.room
+                booklet = rooms[row.room_order] = Booklet("room", room.number or room.name,
+                                                          f"{room.name} ({room.number})" if room.number else room.name)
+            booklet.rows.append(row)
+        if "person" in kinds:
+            seen = set()
+            for role, person in zip(ROLES, (d.supervisor, d.reviewer, d.chairman)):
+                if person is None:
+                    continue
+                booklet = persons.get(person.email)
+                if booklet is None:
+                    booklet = persons[person.email] = Booklet("person", person.email, person.name)
+                booklet.roles[role] = booklet.roles.get(role, 0) + 1
+                if person.email not in seen:
+                    seen.add(person.email)
+                    booklet.rows.append(row)
+
+    booklets = sorted(persons.values(), key=lambda b: (b.name.casefold(), b.key)) + list(rooms.values())
+    used = set()
+    for booklet in booklets:
+        booklet.filename = unique_filename(f"{booklet.kind}-{file_slug(booklet.key)}.pdf", used)
+    return booklets
+
+
+def file_slug(text: str) -> str:
+    """Email/room name -> file name part (also used for the calendar feeds)."""
+    return re.sub(r"[^\w.@-]+", "_", text.strip()).strip("._") or "unnamed"
+
+
+def unique_filename(filename: str, used: set) -> str:
+    stem, ext = os.path.splitext(filename)
+    candidate, n = filename, 1
+    while candidate.casefold() in used:
+        n += 1
+        candidate = f"{stem}-{n}{ext}"
+    used.add(candidate.casefold())
+    return candidate
+
+
+def _render_batch(directory: str, jobs: List[Tuple[str, str, str, List[PdfRow]]]) -> List[int]:
+    """Worker: render a batch of booklets; metryki czcionki raz na proces workera."""
+    return [SchedulePDF(title, subtitle).output(rows, os.path.join(directory, filename))
+            for filename, title, subtitle, rows in jobs]
+
+
+def export_booklets(schedule, directory: str, kinds: Iterable[str] = ("person", "room"),
+                    workers: Optional[int] = None,
+                    progress: Optional[BookletProgress] = None) -> List[Booklet]:
+    """
+    Write one PDF per person and/or room into `directory` plus a `manifest.json` describing them.
+
+    Booklets are rendered in batches across a process pool (`workers`, default: CPU count);
+    with `workers=1` or only a few booklets everything runs in this process. Returns the
+    booklets with page counts filled in.
+    """
+    booklets = build_booklets(schedule, kinds)
+    os.makedirs(directory, exist_ok=True)
+    jobs = [(b.filename, b.title, b.subtitle, b.rows) for b in booklets]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    # kilka paczek na workera: równe obciążenie przy różnej liczbie obron na osobę
+    size = max(1, -(-len(jobs) // (workers * 4)))
+    batches = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+    pages: List[int] = []
+    if workers == 1 or len(jobs) < 8:
+        results = (_render_batch(directory, batch) for batch in batches)
+        _collect(results, pages, len(jobs), progress)
+    else:
+        # spawn – jak w JobManager; GUI i serwer mają własne wątki
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+            results = executor.map(_render_batch, [directory] * len(batches), batches)
+            _collect(results, pages, len(jobs), progress)
+    for booklet, count in zip(booklets, pages):
+        booklet.pages = count
+
+    manifest = {"format": 1, "generated": datetime.now().isoformat(timespec="seconds"),
+                "booklets": [b.to_dict() for b in booklets]}
+    tmp = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+    return booklets
+
+
+def _collect(results, pages: List[int], total: int, progress: Optional[BookletProgress]) -> None:
+    for batch in results:
+        pages.extend(batch)
+        if progress:
+            progress(len(pages), total)
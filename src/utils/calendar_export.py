@@ -0,0 +1,123 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.booklets import file_slug, unique_filename
+from src.utils.icalendar import CalendarWriter, escape_text, fold_line, format_datetime, param_value
+from src.utils.merge import defense_key
+
+COMBINED = "schedule.ics"
+_ROLES = (("supervisor", "REQ-PARTICIPANT"), ("reviewer", "REQ-PARTICIPANT"), ("chairman", "CHAIR"))
+
+
+def defense_uid(defense) -> str:
+    """Stable UID (student + thesis), so a moved defense updates the subscribed event instead of duplicating it."""
+    digest = hashlib.sha1("\x1f".join(defense_key(defense)).encode("utf-8")).hexdigest()[:20]
+    return f"{digest}@thesis-defense-scheduler"
+
+
+class CalendarFeeds:
+    """
+    RFC 5545 feeds of a schedule: one per person (events of all their roles), one per room,
+    and a combined one.
+
+    A single pass over `schedule.slots` renders every VEVENT once – times are formatted once
+    per distinct datetime and the attendee lines once per person – and files it under its
+    room and members (person → events index); the combined feed is streamed while the pass
+    runs. Each per-person/per-room file is then written in one go, so only one file is open
+    at a time even with hundreds of feeds.
+    """
+
+    def __init__(self, schedule, calendar_name: str = "Thesis defenses"):
+        self.schedule = schedule
+        self.calendar_name = calendar_name
+        self.stamp = format_datetime(datetime.now(timezone.utc).replace(microsecond=0))
+        self._times: Dict[datetime, str] = {}
+        self._attendees: Dict[Tuple[int, str], str] = {}
+
+    def _time(self, value: datetime) -> str:
+        text = self._times.get(value)
+        if text is None:
+            text = self._times[value] = format_datetime(value)
+        return text
+
+    def _attendee(self, person, role: str) -> str:
+        key = (id(person), role)
+        line = self._attendees.get(key)
+        if line is None:
+            line = self._attendees[key] = fold_line(
+                f"ATTENDEE;CN={param_value(person.name)};ROLE={role}:mailto:{person.email}")
+        return line
+
+    def _event(self, slot) -> Tuple[str, str, str, List[Tuple[object, str]]]:
+        """(head, summary text, tail, [(person, role name)]) – the summary differs per person feed."""
+        d = slot.defense
+        members = [(p, name, role) for (name, role), p in zip(_ROLES, (d.supervisor, d.reviewer, d.chairman))
+                   if p is not None]
+        location = f"{slot.room.name} ({slot.room.number})" if slot.room.number else slot.room.name
+        description = (f"Thesis: {d.thesis_title}\nSupervisor: {d.supervisor.name}\nReviewer: {d.reviewer.name}\n"
+                       f"Chairman: {d.chairman.name if d.chairman else '—'}")
+        head = ("BEGIN:VEVENT\r\n" + fold_line(f"UID:{defense_uid(d)}") + f"DTSTAMP:{self.stamp}\r\n"
+                f"DTSTART:{self._time(slot.time_slot.start)}\r\nDTEND:{self._time(slot.time_slot.end)}\r\n")
+        tail = (fold_line(f"LOCATION:{escape_text(location)}") + fold_line(f"DESCRIPTION:{escape_text(description)}")
+                + "".join(self._attendee(p, role) for p, _, role in members) + "END:VEVENT\r\n")
+        return head, f"Thesis defense: {d.student_name}", tail, [(p, name) for p, name, _ in members]
+
+    def write(self, directory: str, persons: bool = True, rooms: bool = True,
+              combined: Optional[str] = COMBINED) -> Dict[str, int]:
+        """Write the feeds into `directory` (`combined` = file name of the combined feed or None); {file: events}."""
+        os.makedirs(directory, exist_ok=True)
+        person_events: Dict[str, List[str]] = {}
+        person_names: Dict[str, str] = {}
+        room_events: Dict[int, List[str]] = {}
+        room_names: Dict[int, Tuple[str, str]] = {}
+        counts: Dict[str, int] = {}
+
+        writer = CalendarWriter(os.path.join(directory, combined), self.calendar_name) if combined else None
+        try:
+            for slot in self.schedule.slots:
+                if slot.defense is None:
+                    continue
+                head, summary, tail, members = self._event(slot)
+                block = head + fold_line(f"SUMMARY:{escape_text(summary)}") + tail
+                if writer is not None:
+                    writer.write(block)
+                if rooms:
+                    key = id(slot.room)
+                    if key not in room_events:
+                        room_events[key] = []
+                        room_names[key] = (slot.room.number or slot.room.name, slot.room.name)
+                    room_events[key].append(block)
+                if persons:
+                    roles: Dict[str, List[str]] = {}
+                    for person, role in members:
+                        roles.setdefault(person.email, []).append(role.capitalize())
+                        person_names.setdefault(person.email, person.name)
+                    for email, names in roles.items():
+                        label = escape_text(f"{summary} ({', '.join(names)})")
+                        person_events.setdefault(email, []).append(head + fold_line(f"SUMMARY:{label}") + tail)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is not None:
+            counts[combined] = writer.events
+
+        used = {combined.casefold()} if combined else set()
+        feeds = [(f"person-{file_slug(email)}.ics", f"{self.calendar_name} – {person_names[email]}", events)
+                 for email, events in sorted(person_events.items())]
+        feeds += [(f"room-{file_slug(room_names[key][0])}.ics", f"{self.calendar_name} – {room_names[key][1]}", events)
+                  for key, events in room_events.items()]
+        for filename, name, events in feeds:
+            filename = unique_filename(filename, used)
+            with CalendarWriter(os.path.join(directory, filename), name) as feed:
+                feed.write_all(events)
+            counts[filename] = feed.events
+        return counts
+
+
+def export_calendars(schedule, directory: str, persons: bool = True, rooms: bool = True,
+                     combined: Optional[str] = COMBINED, calendar_name: Optional[str] = None) -> Dict[str, int]:
+    """Per-person, per-room and combined .ics feeds of `schedule`; returns {file name: event count}."""
+    feeds = CalendarFeeds(schedule, calendar_name or "Thesis defenses")
+    return feeds.write(directory, persons=persons, rooms=rooms, combined=combined)
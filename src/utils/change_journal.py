@@ -0,0 +1,349 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.algorithm.scheduler import Schedule, ScheduleSlot
+from src.models import Person, Defense, Room, TimeSlot, SessionParameters, Role
+from src.utils.project_io import project_to_dict, project_from_dict, build_schedule
+
+
+JOURNAL_FORMAT = 1
+DEFAULT_COMPACT_EVERY = 500
+
+ProjectState = Tuple[List[Person], List[Defense], List[Room], Optional[SessionParameters]]
+
+
+def default_journal_dir() -> str:
+    """Per-user autosave directory (overridable with TDS_AUTOSAVE_DIR)."""
+    env = os.environ.get("TDS_AUTOSAVE_DIR")
+    if env:
+        return env
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "thesis_defense_scheduler", "autosave")
+
+
+def _ts(ts: TimeSlot) -> List[str]:
+    return [ts.start.isoformat(timespec="minutes"), ts.end.isoformat(timespec="minutes")]
+
+
+def _ts_from(pair) -> TimeSlot:
+    return TimeSlot(datetime.fromisoformat(pair[0]), datetime.fromisoformat(pair[1]))
+
+
+class ChangeJournal:
+    """
+    Autosave as an append-only journal of model edits on top of a full snapshot.
+
+    Every edit appends one small JSON line (persons and rooms by value, defenses by list
+    index, placements as time/room/chairman) and flushes it, so its cost does not depend on
+    the project size. After `compact_every` records the journal is rotated and a fresh
+    snapshot (project_to_dict) is written by a background thread; the rotated part is
+    dropped once the snapshot is on disk. `recover()` replays snapshot + journal after a
+    crash. All records are idempotent setters, so replaying a rotated journal over the
+    snapshot that already contains it is harmless.
+    """
+
+    SNAPSHOT = "snapshot.json"
+    JOURNAL = "journal.jsonl"
+    ROTATED = "journal.1.jsonl"
+
+    def __init__(self, directory: Optional[str] = None, state: Optional[Callable[[], ProjectState]] = None,
+                 compact_every: int = DEFAULT_COMPACT_EVERY):
+        self.directory = directory or default_journal_dir()
+        self.state = state            # () -> (persons, defenses, rooms, params) bieżącego projektu
+        self.compact_every = compact_every
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = None
+        self._records = 0
+        self._compactor: Optional[threading.Thread] = None
+        self._tracked: Optional[Schedule] = None
+        self._positions: Dict[int, int] = {}
+        self._positions_of: Optional[List[Defense]] = None   # lista, z której zbudowano _positions
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # ---------- cykl życia ----------
+
+    def has_changes(self) -> bool:
+        """True when a previous session left a snapshot or journal behind (i.e. it did not close cleanly)."""
+        return any(os.path.exists(self._path(n)) for n in (self.SNAPSHOT, self.JOURNAL, self.ROTATED))
+
+    def begin(self, persons: List[Person], defenses: List[Defense], rooms: List[Room],
+              params: Optional[SessionParameters]) -> None:
+        """Start journaling a (new or freshly opened) project: drop old files and record the base state."""
+        self.wait()
+        self._close_file()
+        self._remove(self.SNAPSHOT, self.JOURNAL, self.ROTATED)
+        self._positions, self._positions_of = {}, None
+        self._open_file()
+        if params is not None:
+            self.compact(persons, defenses, rooms, params, wait=True)
+        else:
+            # bez parametrów sesji nie ma pełnego dokumentu projektu – stan bazowy jako zwykłe wpisy
+            self.save_rooms(rooms)
+            for p in persons:
+                self.save_person(p)
+            for d in defenses:
+                self.save_defense(d)
+
+    def close(self, discard: bool = False) -> None:
+        """Stop journaling; `discard=True` (clean exit) removes the autosave files."""
+        self.untrack()
+        self.wait()
+        self._close_file()
+        if discard:
+            self._remove(self.SNAPSHOT, self.JOURNAL, self.ROTATED)
+
+    def wait(self) -> None:
+        """Block until a running background compaction has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    # ---------- zapisy (te same nazwy co w ProjectStore) ----------
+
+    def save_person(self, person: Person) -> None:
+        self._append({"op": "person", "name": person.name, "email": person.email,
+                      "roles": sorted(r.value for r in person.roles),
+                      "unavailable": [_ts(ts) for ts in person.unavailable_slots]})
+
+    def save_defense(self, defense: Defense) -> None:
+        self._append({"op": "defense", "index": self._index_of(defense),
+                      "student_name": defense.student_name, "thesis_title": defense.thesis_title,
+                      "supervisor": defense.supervisor.email, "reviewer": defense.reviewer.email})
+        self._append(self._assignment(defense))
+
+    def save_rooms(self, rooms: List[Room]) -> None:
+        self._append({"op": "rooms", "rooms": [[r.name, r.number, r.capacity] for r in rooms]})
+
+    def save_parameters(self, params: SessionParameters) -> None:
+        self._append({"op": "parameters", "session_date": params.session_date.isoformat(),
+                      "start_time": params.start_time, "end_time": params.end_time,
+                      "defense_duration": params.defense_duration, "room_count": params.room_count,
+                      "breaks": [_ts(b) for b in (params.breaks or [])]})
+
+    def save_assignment(self, defense: Defense) -> None:
+        self._append(self._assignment(defense))
+
+    def save_assignments(self, defenses: List[Defense]) -> None:
+        for d in defenses:
+            self._append(self._assignment(d), flush=False)
+        self._flush()
+
+    def track(self, schedule: Schedule) -> None:
+        """Journal every add/remove/move/chairman change of `schedule`."""
+        self.untrack()
+        schedule.subscribe(self._on_schedule_event)
+        self._tracked = schedule
+
+    def untrack(self) -> None:
+        if self._tracked is not None:
+            self._tracked.unsubscribe(self._on_schedule_event)
+            self._tracked = None
+
+    def _on_schedule_event(self, event: str, defense: Defense, slot: Optional[ScheduleSlot]) -> None:
+        self.save_assignment(defense)
+
+    # ---------- kompaktowanie ----------
+
+    def compact(self, persons: Optional[List[Person]] = None, defenses: Optional[List[Defense]] = None,
+                rooms: Optional[List[Room]] = None, params: Optional[SessionParameters] = None,
+                wait: bool = False) -> bool:
+        """
+        Rotate the journal and write a full snapshot in the background.
+
+        The document is built here (on the caller's thread, which owns the models);
+        only serialization and the atomic file replace run in the background.
+        Returns False when there is nothing to snapshot yet or a compaction is running.
+        """
+        if persons is None:
+            if self.state is None:
+                return False
+            persons, defenses, rooms, params = self.state()
+        if params is None or (self._compactor is not None and self._compactor.is_alive()):
+            return False
+        self.wait()
+        document = project_to_dict(persons, defenses, rooms, params)
+
+        self._close_file()
+        journal, rotated = self._path(self.JOURNAL), self._path(self.ROTATED)
+        if os.path.exists(journal):
+            if os.path.exists(rotated):
+                # poprzednie kompaktowanie nie dokończyło – dopisz, nic nie gubiąc
+                with open(journal, "rb") as src, open(rotated, "ab") as dst:
+                    dst.write(src.read())
+                os.remove(journal)
+            else:
+                os.replace(journal, rotated)
+        self._open_file()
+
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(document,),
+                                           name="journal-compaction", daemon=True)
+        self._compactor.start()
+        if wait:
+            self.wait()
+        return True
+
+    def _write_snapshot(self, document: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"format": JOURNAL_FORMAT, "project": document}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path(self.SNAPSHOT))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._remove(self.ROTATED)
+
+    # ---------- odtwarzanie ----------
+
+    def recover(self) -> Optional[Tuple[List[Person], List[Defense], List[Room],
+                                        Optional[SessionParameters], Optional[Schedule]]]:
+        """Rebuild the project left behind by the previous session (None when there is nothing)."""
+        if not self.has_changes():
+            return None
+        persons: List[Person] = []
+        defenses: List[Defense] = []
+        rooms: List[Room] = []
+        params: Optional[SessionParameters] = None
+        try:
+            with open(self._path(self.SNAPSHOT), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("format") == JOURNAL_FORMAT:
+                persons, defenses, rooms, params, _ = project_from_dict(snapshot["project"])
+        except (OSError, ValueError):
+            pass
+
+        replay = _Replay(persons, defenses, rooms, params)
+        for name in (self.ROTATED, self.JOURNAL):
+            try:
+                with open(self._path(name), "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            break  # urwany ostatni wpis po awarii
+                        replay.apply(record)
+            except OSError:
+                continue
+
+        params = replay.params
+        schedule = build_schedule(persons, defenses, rooms, params) if params is not None else None
+        return persons, defenses, replay.rooms, params, schedule
+
+    # ---------- plik ----------
+
+    def _index_of(self, defense: Defense) -> int:
+        defenses = self.state()[1] if self.state is not None else []
+        idx = self._positions.get(id(defense)) if defenses is self._positions_of else None
+        # id() obiektu może zostać użyte ponownie – indeks ważny tylko, gdy wskazuje ten sam obiekt
+        if idx is None or idx >= len(defenses) or defenses[idx] is not defense:
+            self._positions = {id(d): i for i, d in enumerate(defenses)}
+            self._positions_of = defenses
+            idx = self._positions.get(id(defense))
+        if idx is None:
+            raise ValueError(f"{defense} is not on the defense list")
+        return idx
+
+    def _assignment(self, defense: Defense) -> dict:
+        record = {"op": "assign", "index": self._index_of(defense), "slot": None}
+        if defense.time_slot is not None and defense.room is not None:
+            record["slot"] = _ts(defense.time_slot) + [defense.room.number,
+                                                       defense.chairman.email if defense.chairman else None]
+        return record
+
+    def _append(self, record: dict, flush: bool = True) -> None:
+        if self._file is None:
+            self._open_file()
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._records += 1
+        if flush:
+            self._flush()
+
+    def _flush(self) -> None:
+        # flush do systemu (przeżywa awarię programu); fsync tylko przy zapisie migawki
+        self._file.flush()
+        if self._records >= self.compact_every:
+            self.compact()
+
+    def _open_file(self) -> None:
+        self._file = open(self._path(self.JOURNAL), "a", encoding="utf-8")
+        self._records = 0
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _remove(self, *names: str) -> None:
+        for name in names:
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+
+class _Replay:
+    """Applies journal records to the recovered model lists in place."""
+
+    def __init__(self, persons: List[Person], defenses: List[Defense], rooms: List[Room],
+                 params: Optional[SessionParameters]):
+        self.persons = persons
+        self.defenses = defenses
+        self.rooms = rooms
+        self.params = params
+        self._by_email: Dict[str, Person] = {p.email: p for p in persons}
+
+    def apply(self, record: dict) -> None:
+        getattr(self, "_" + record["op"])(record)
+
+    def _person(self, r: dict) -> None:
+        person = self._by_email.get(r["email"])
+        roles = {Role(x) for x in r["roles"]}
+        if person is None:
+            person = Person(name=r["name"], email=r["email"], roles=roles)
+            self.persons.append(person)
+            self._by_email[person.email] = person
+        else:
+            person.name = r["name"]
+            person.roles = roles
+        person.unavailable_slots = [_ts_from(pair) for pair in r["unavailable"]]
+
+    def _defense(self, r: dict) -> None:
+        sup, rev = self._by_email[r["supervisor"]], self._by_email[r["reviewer"]]
+        idx = r["index"]
+        if idx < len(self.defenses):
+            d = self.defenses[idx]
+            d.student_name, d.thesis_title, d.supervisor, d.reviewer = (
+                r["student_name"], r["thesis_title"], sup, rev)
+        else:
+            self.defenses.append(Defense(student_name=r["student_name"], thesis_title=r["thesis_title"],
+                                         supervisor=sup, reviewer=rev))
+
+    def _assign(self, r: dict) -> None:
+        d = self.defenses[r["index"]]
+        if r["slot"] is None:
+            d.time_slot = d.room = d.chairman = None
+            return
+        start, end, room_number, chairman = r["slot"]
+        d.time_slot = _ts_from((start, end))
+        d.room = next((room for room in self.rooms if room.number == room_number), None)
+        d.chairman = self._by_email.get(chairman) if chairman else None
+
+    def _rooms(self, r: dict) -> None:
+        self.rooms[:] = [Room(name, number, int(capacity)) for name, number, capacity in r["rooms"]]
+
+    def _parameters(self, r: dict) -> None:
+        self.params = SessionParameters(
+            session_date=date.fromisoformat(r["session_date"]), start_time=r["start_time"],
+            end_time=r["end_time"], defense_duration=int(r["defense_duration"]),
+            room_count=int(r["room_count"]), breaks=[_ts_from(pair) for pair in r["breaks"]],
+        )
@@ -1,7 +1,112 @@
 import csv
-from typing import List
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from src.models import Role, Person, Defense
+from src.utils.merge import email_key, person_key
+
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ISSUES = 1000
+
+# role po nazwie – jedno wyszukanie w słowniku zamiast przeglądania enuma dla każdego pola
+_ROLE_BY_NAME: Dict[str, Role] = {role.value: role for role in Role}
+
+PERSON_COLUMNS = ("name", "email")
+UNAVAILABILITY_COLUMNS = ("email", "start", "end")
+DEFENSE_COLUMNS = ("student_name", "thesis_title", "supervisor_email", "reviewer_email")
+
+ImportProgress = Callable[[int, int, int], None]   # (rows_read, bytes_read, bytes_total)
+
+
+@dataclass
+class RowError:
+    """One problem found in an imported file (line 1 is the header)."""
+    line: int
+    field: Optional[str]
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """Machine-readable outcome of a CSV import (see to_dict)."""
+    kind: str
+    filepath: str
+    rows_read: int = 0
+    imported: int = 0
+    skipped: int = 0
+    errors: List[RowError] = field(default_factory=list)      # wiersze pominięte
+    warnings: List[RowError] = field(default_factory=list)    # wiersze zaimportowane z uwagami
+    truncated: bool = False                                   # zgłoszeń było więcej niż MAX_REPORTED_ISSUES
+
+    @property
+    def ok(self) -> bool:
+        return self.skipped == 0
+
+    def _issue(self, bucket: List[RowError], line: int, field_name: Optional[str], message: str) -> None:
+        # pamięć ograniczona także przy pliku pełnym błędów
+        if len(self.errors) + len(self.warnings) < MAX_REPORTED_ISSUES:
+            bucket.append(RowError(line, field_name, message))
+        else:
+            self.truncated = True
+
+    def error(self, line: int, field_name: Optional[str], message: str) -> None:
+        self.skipped += 1
+        self._issue(self.errors, line, field_name, message)
+
+    def warning(self, line: int, field_name: Optional[str], message: str) -> None:
+        self._issue(self.warnings, line, field_name, message)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _read_rows(filepath: str, report: ImportReport, required: tuple,
+               progress: Optional[ImportProgress]) -> Iterator[tuple]:
+    """
+    Yield (line_number, row_dict) for every data row, streaming the file.
+
+    The file is read in binary and decoded line by line so the byte position is known
+    for progress reporting (text-mode tell() is unavailable while csv iterates).
+    """
+    total = os.path.getsize(filepath)
+    position = 0
+
+    with open(filepath, "rb") as raw:
+        def lines():
+            nonlocal position
+            for chunk in raw:
+                position += len(chunk)
+                yield chunk.decode("utf-8-sig" if position == len(chunk) else "utf-8")
+
+        reader = csv.DictReader(lines())
+        columns = [c.strip() for c in (reader.fieldnames or [])]
+        reader.fieldnames = columns
+        missing = [c for c in required if c not in columns]
+        if missing:
+            report.error(1, None, f"Missing column(s): {', '.join(missing)}")
+            return
+
+        for row in reader:
+            report.rows_read += 1
+            yield reader.line_num, row
+            if progress is not None and report.rows_read % DEFAULT_CHUNK_SIZE == 0:
+                progress(report.rows_read, position, total)
+        if progress is not None:
+            progress(report.rows_read, position, total)
+
+
+def _chunks(items: Iterator, chunk_size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 class CSVHandler:
@@ -23,39 +128,80 @@ class CSVHandler:
                 })
 
     @staticmethod
-    def import_persons(filepath: str) -> List[Person]:
-        """Import persons from CSV file."""
-        persons = []
-
-        with open(filepath, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-
-            for row in reader:
-                # Parse roles
-                roles_str = row.get('roles', '')
-                roles = set()
-                if roles_str:
-                    for role_str in roles_str.split(';'):
-                        role_str = role_str.strip().lower()
-                        for role in Role:
-                            if role.value == role_str:
-                                roles.add(role)
-                                break
-
-                # Create person
-                try:
-                    person = Person(
-                        name=row['name'].strip(),
-                        email=row['email'].strip(),
-                        roles=roles if roles else {Role.SUPERVISOR}  # Default role
-                    )
-                    persons.append(person)
-                except (KeyError, ValueError) as e:
-                    print(f"Error importing person from row {row}: {e}")
-                    continue
-
+    def import_persons(filepath: str, report: Optional[ImportReport] = None,
+                       progress: Optional[ImportProgress] = None) -> List[Person]:
+        """Import persons from CSV file (problems are collected in `report`)."""
+        persons: List[Person] = []
+        for chunk in CSVHandler.iter_persons(filepath, report, progress=progress):
+            persons.extend(chunk)
         return persons
 
+    @staticmethod
+    def iter_persons(filepath: str, report: Optional[ImportReport] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     progress: Optional[ImportProgress] = None) -> Iterator[List[Person]]:
+        """Stream persons from CSV in chunks of `chunk_size` (bounded memory for large exports)."""
+        if report is None:
+            report = ImportReport("persons", filepath)
+        return _chunks(CSVHandler._persons(filepath, report, progress), chunk_size)
+
+    @staticmethod
+    def _persons(filepath: str, report: ImportReport, progress: Optional[ImportProgress]) -> Iterator[Person]:
+        # te same napisy ról powtarzają się w całym pliku – parsujemy każdy raz
+        parsed_roles: Dict[str, tuple] = {}
+
+        for line, row in _read_rows(filepath, report, PERSON_COLUMNS, progress):
+            roles_str = row.get('roles') or ''
+            parsed = parsed_roles.get(roles_str)
+            if parsed is None:
+                known, unknown = set(), []
+                for role_str in roles_str.split(';'):
+                    role_str = role_str.strip().lower()
+                    if role_str:
+                        role = _ROLE_BY_NAME.get(role_str)
+                        if role is None:
+                            unknown.append(role_str)
+                        else:
+                            known.add(role)
+                parsed = parsed_roles[roles_str] = (frozenset(known or {Role.SUPERVISOR}), unknown)  # Default role
+            roles, unknown = parsed
+            for role_str in unknown:
+                report.warning(line, 'roles', f"Unknown role '{role_str}' ignored")
+
+            # Create person
+            try:
+                person = Person(
+                    name=(row['name'] or '').strip(),
+                    email=(row['email'] or '').strip(),
+                    roles=set(roles)
+                )
+            except ValueError as e:
+                report.error(line, 'email' if 'email' in str(e) else 'name', str(e))
+                continue
+            report.imported += 1
+            yield person
+
+    @staticmethod
+    def iter_unavailability(filepath: str, report: ImportReport,
+                            progress: Optional[ImportProgress] = None) -> Iterator[Tuple[int, str, datetime, datetime]]:
+        """Stream (line, email, start, end) rows of an availability CSV (ISO date-times, e.g. 2025-06-20 09:00)."""
+        for line, row in _read_rows(filepath, report, UNAVAILABILITY_COLUMNS, progress):
+            email = (row['email'] or '').strip()
+            times = []
+            for column in ('start', 'end'):
+                try:
+                    times.append(datetime.fromisoformat((row[column] or '').strip()))
+                except ValueError as e:
+                    report.error(line, column, str(e))
+                    break
+            if len(times) < 2:
+                continue
+            start, end = times
+            if end <= start:
+                report.error(line, 'end', "End must be after start")
+                continue
+            yield line, email, start, end
+
     @staticmethod
     def export_defenses(defenses: List[Defense], filepath: str) -> None:
         """Export defenses to CSV file."""
@@ -74,46 +220,59 @@ class CSVHandler:
                 })
 
     @staticmethod
-    def import_defenses(filepath: str, persons: List[Person]) -> List[Defense]:
-        """Import defenses from CSV file. Requires existing persons list."""
-        defenses = []
+    def import_defenses(filepath: str, persons: List[Person], report: Optional[ImportReport] = None,
+                        progress: Optional[ImportProgress] = None) -> List[Defense]:
+        """Import defenses from CSV file. Requires existing persons list (problems are collected in `report`)."""
+        defenses: List[Defense] = []
+        for chunk in CSVHandler.iter_defenses(filepath, persons, report, progress=progress):
+            defenses.extend(chunk)
+        return defenses
+
+    @staticmethod
+    def iter_defenses(filepath: str, persons: List[Person], report: Optional[ImportReport] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      progress: Optional[ImportProgress] = None) -> Iterator[List[Defense]]:
+        """Stream defenses from CSV in chunks of `chunk_size`."""
+        if report is None:
+            report = ImportReport("defenses", filepath)
+        return _chunks(CSVHandler._defenses(filepath, persons, report, progress), chunk_size)
 
-        # Create email to person mapping
-        person_map = {p.email: p for p in persons}
+    @staticmethod
+    def _defenses(filepath: str, persons: List[Person], report: ImportReport,
+                  progress: Optional[ImportProgress]) -> Iterator[Defense]:
+        # email -> osoba; ten sam klucz (bez wielkości liter) co PersonMerger
+        person_map: Dict[str, Person] = {}
+        for p in persons:
+            person_map.setdefault(person_key(p), p)
 
-        with open(filepath, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+        for line, row in _read_rows(filepath, report, DEFENSE_COLUMNS, progress):
+            supervisor_email = (row['supervisor_email'] or '').strip()
+            reviewer_email = (row['reviewer_email'] or '').strip()
 
-            for row in reader:
-                try:
-                    supervisor_email = row['supervisor_email'].strip()
-                    reviewer_email = row['reviewer_email'].strip()
-
-                    # Find supervisor and reviewer
-                    supervisor = person_map.get(supervisor_email)
-                    reviewer = person_map.get(reviewer_email)
-
-                    if not supervisor:
-                        print(f"Supervisor with email {supervisor_email} not found")
-                        continue
-                    if not reviewer:
-                        print(f"Reviewer with email {reviewer_email} not found")
-                        continue
-
-                    # Create defense
-                    defense = Defense(
-                        student_name=row['student_name'].strip(),
-                        thesis_title=row['thesis_title'].strip(),
-                        supervisor=supervisor,
-                        reviewer=reviewer
-                    )
-                    defenses.append(defense)
-
-                except (KeyError, ValueError) as e:
-                    print(f"Error importing defense from row {row}: {e}")
-                    continue
+            # Find supervisor and reviewer
+            supervisor = person_map.get(email_key(supervisor_email))
+            reviewer = person_map.get(email_key(reviewer_email))
 
-        return defenses
+            if not supervisor:
+                report.error(line, 'supervisor_email', f"Supervisor with email {supervisor_email} not found")
+                continue
+            if not reviewer:
+                report.error(line, 'reviewer_email', f"Reviewer with email {reviewer_email} not found")
+                continue
+
+            # Create defense
+            try:
+                defense = Defense(
+                    student_name=(row['student_name'] or '').strip(),
+                    thesis_title=(row['thesis_title'] or '').strip(),
+                    supervisor=supervisor,
+                    reviewer=reviewer
+                )
+            except ValueError as e:
+                report.error(line, None, str(e))
+                continue
+            report.imported += 1
+            yield defense
 
     @staticmethod
     def create_sample_persons_csv(filepath: str) -> None:
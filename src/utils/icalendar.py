@@ -0,0 +1,254 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+
+# Minimalny czytnik iCalendar (RFC 5545) – tyle, ile trzeba, żeby wyciągnąć zajętość:
+# VEVENT z DTSTART/DTEND/DURATION, RRULE (DAILY/WEEKLY), EXDATE, TRANSP, STATUS, ORGANIZER/ATTENDEE.
+# Na końcu pliku – strumieniowy zapis (CalendarWriter).
+
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+@dataclass
+class CalendarEvent:
+    """One busy VEVENT (times are naive local datetimes, like the rest of the model)."""
+    start: datetime
+    end: datetime
+    line: int
+    emails: List[str] = field(default_factory=list)
+    rrule: Dict[str, str] = field(default_factory=dict)
+    exdates: List[datetime] = field(default_factory=list)
+
+    def occurrences(self, window_start: datetime, window_end: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """(start, end) of every occurrence overlapping the window (recurrence expanded up to window_end)."""
+        length = self.end - self.start
+        if not self.rrule:
+            if self.start < window_end and self.end > window_start:
+                yield self.start, self.end
+            return
+
+        freq = self.rrule.get("FREQ")
+        if freq not in ("DAILY", "WEEKLY"):
+            raise ValueError(f"Unsupported recurrence FREQ={freq}")
+        interval = int(self.rrule.get("INTERVAL", "1"))
+        count = int(self.rrule["COUNT"]) if "COUNT" in self.rrule else None
+        until = None
+        if "UNTIL" in self.rrule:
+            until, until_is_date = _parse_value(self.rrule["UNTIL"], {})
+            if until_is_date:
+                until += timedelta(days=1, microseconds=-1)   # UNTIL=YYYYMMDD obejmuje cały dzień
+        days = {_WEEKDAYS[d[-2:]] for d in self.rrule.get("BYDAY", "").split(",") if d[-2:] in _WEEKDAYS}
+        if not days:
+            days = {self.start.weekday()}
+        excluded = set(self.exdates)
+
+        # dzień po dniu od pierwszego wystąpienia – COUNT liczy także wystąpienia sprzed okna;
+        # bez COUNT można od razu przeskoczyć pod okno (reszta z INTERVAL liczona od DTSTART)
+        seen = 0
+        week0 = self.start.date() - timedelta(days=self.start.weekday())
+        day = self.start.date()
+        if count is None:
+            day = max(day, window_start.date() - timedelta(days=length.days + 1))
+        while True:
+            occ_start = datetime.combine(day, self.start.time())
+            if occ_start >= window_end or (until is not None and occ_start > until):
+                return
+            if freq == "DAILY":
+                hit = (day - self.start.date()).days % interval == 0
+            else:
+                hit = day.weekday() in days and ((day - week0).days // 7) % interval == 0
+            if hit:
+                seen += 1
+                if count is not None and seen > count:
+                    return
+                if occ_start not in excluded and occ_start + length > window_start:
+                    yield occ_start, occ_start + length
+            day += timedelta(days=1)
+
+
+def _unfold(lines: Iterator[str]) -> Iterator[Tuple[int, str]]:
+    """Join folded content lines (continuations start with a space or tab)."""
+    current, current_no = None, 0
+    for no, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current_no, current
+        current, current_no = line, no
+    if current is not None:
+        yield current_no, current
+
+
+def _split(line: str) -> Tuple[str, Dict[str, str], str]:
+    """'NAME;PARAM=x:value' -> (NAME, {PARAM: x}, value)."""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+
+def _parse_value(value: str, params: Dict[str, str]) -> Tuple[datetime, bool]:
+    """DATE or DATE-TIME -> (naive local datetime, is_all_day)."""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.combine(datetime.strptime(value, "%Y%m%d").date(), time()), True
+    if value.endswith("Z"):
+        utc = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None), False
+    # TZID – przyjmujemy, że to strefa sesji (czas ścienny bez konwersji)
+    return datetime.strptime(value, "%Y%m%dT%H%M%S"), False
+
+
+def _parse_duration(value: str) -> timedelta:
+    m = _DURATION.match(value.strip())
+    if not m:
+        raise ValueError(f"Invalid DURATION: {value}")
+    sign, weeks, days, hours, minutes, seconds = m.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def iter_busy_events(lines: Iterator[str], errors: Optional[list] = None) -> Iterator[CalendarEvent]:
+    """
+    Stream the busy VEVENTs of an .ics file (cancelled and TRANSP:TRANSPARENT events are skipped).
+
+    Broken events are skipped; when `errors` is given, (line, message) pairs are appended to it.
+    """
+    props: Optional[dict] = None
+    begin_line = 0
+    for no, line in _unfold(lines):
+        upper = line.upper()
+        if upper == "BEGIN:VEVENT":
+            props, begin_line = {"emails": [], "exdates": []}, no
+            continue
+        if props is None:
+            continue
+        if upper == "END:VEVENT":
+            event = None
+            try:
+                if "error" in props:
+                    raise ValueError(props["error"])
+                event = _build_event(props, begin_line)
+            except KeyError as e:
+                if errors is not None:
+                    errors.append((begin_line, f"Missing {e.args[0]}"))
+            except ValueError as e:
+                if errors is not None:
+                    errors.append((begin_line, str(e)))
+            if event is not None:
+                yield event
+            props = None
+            continue
+
+        name, params, value = _split(line)
+        try:
+            if name in ("ORGANIZER", "ATTENDEE"):
+                if value.lower().startswith("mailto:"):
+                    props["emails"].append(value[7:].strip())
+            elif name == "EXDATE":
+                props["exdates"].extend(_parse_value(v, params)[0] for v in value.split(",") if v)
+            elif name in ("DTSTART", "DTEND"):
+                props[name] = _parse_value(value, params)
+            elif name in ("DURATION", "RRULE", "TRANSP", "STATUS"):
+                props[name] = value.strip()
+        except ValueError:
+            props.setdefault("error", f"Invalid {name}: {value}")
+
+
+def _build_event(props: dict, line: int) -> Optional[CalendarEvent]:
+    if props.get("TRANSP", "").upper() == "TRANSPARENT" or props.get("STATUS", "").upper() == "CANCELLED":
+        return None
+    start, all_day = props["DTSTART"]
+    if "DTEND" in props:
+        end = props["DTEND"][0]
+    elif "DURATION" in props:
+        end = start + _parse_duration(props["DURATION"])
+    else:
+        end = start + (timedelta(days=1) if all_day else timedelta(0))
+    if end <= start:
+        return None  # zdarzenie chwilowe nie blokuje czasu
+    rrule = {}
+    if "RRULE" in props:
+        rrule = dict(part.split("=", 1) for part in props["RRULE"].upper().split(";") if "=" in part)
+    return CalendarEvent(start=start, end=end, line=line, emails=props["emails"], rrule=rrule,
+                         exdates=props["exdates"])
+
+
+# ---------- Zapis ----------
+
+PRODID = "-//Thesis Defense Scheduler//EN"
+_ESCAPES = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": ""})
+
+
+def escape_text(text: str) -> str:
+    """TEXT value escaping (backslash, ';', ',' and newlines)."""
+    return str(text).translate(_ESCAPES)
+
+
+def fold_line(line: str) -> str:
+    """One content line with its CRLF, folded so no physical line exceeds 75 octets."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while len(data) - start > limit:
+        cut = start + limit
+        while data[cut] & 0xC0 == 0x80:   # nie tniemy znaku UTF-8 w środku
+            cut -= 1
+        parts.append(data[start:cut])
+        start, limit = cut, 74            # kontynuacja zaczyna się spacją
+    parts.append(data[start:])
+    return b"\r\n ".join(parts).decode("utf-8") + "\r\n"
+
+
+def format_datetime(value: datetime) -> str:
+    """Naive datetimes are written as floating local time, aware ones in UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def param_value(value: str) -> str:
+    """Quote a parameter value (e.g. CN) when it contains ':', ';' or ','."""
+    value = str(value).replace('"', "'")
+    return f'"{value}"' if any(c in value for c in ":;,") else value
+
+
+class CalendarWriter:
+    """
+    Streams one VCALENDAR to a text file: the header on open, pre-rendered VEVENT blocks
+    (already folded, CRLF-terminated – see `fold_line`) as they come, the footer on close.
+    """
+
+    def __init__(self, filepath: str, name: Optional[str] = None):
+        self.filepath = filepath
+        self.events = 0
+        self._file: TextIO = open(filepath, "w", encoding="utf-8", newline="")
+        self._file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + fold_line(f"PRODID:{PRODID}") +
+                         "CALSCALE:GREGORIAN\r\nMETHOD:PUBLISH\r\n")
+        if name:
+            self._file.write(fold_line(f"X-WR-CALNAME:{escape_text(name)}"))
+
+    def write(self, block: str) -> None:
+        self._file.write(block)
+        self.events += 1
+
+    def write_all(self, blocks: Iterable[str]) -> None:
+        for block in blocks:
+            self.write(block)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write("END:VCALENDAR\r\n")
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
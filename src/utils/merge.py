@@ -0,0 +1,125 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+from src.models import Person, Defense
+
+
+def email_key(email: str) -> str:
+    """Emails compare case-insensitively."""
+    return email.strip().casefold()
+
+
+def person_key(person: Person) -> str:
+    """Merge key of a person: email, case-insensitive."""
+    return email_key(person.email)
+
+
+def defense_key(defense: Defense) -> Tuple[str, str]:
+    """Merge key of a defense: student and thesis title, case-insensitive."""
+    return defense.student_name.strip().casefold(), defense.thesis_title.strip().casefold()
+
+
+@dataclass
+class MergeResult:
+    """What an import merge did; the lists hold the objects that live in the model."""
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+
+    @property
+    def changed(self) -> list:
+        return self.created + self.updated
+
+    def to_dict(self) -> dict:
+        return {"created": len(self.created), "updated": len(self.updated), "unchanged": len(self.unchanged)}
+
+
+class _Merger(ABC):
+    """Shared upsert loop: `_key` finds the existing object, `_update` copies the imported fields."""
+
+    def __init__(self, items: list):
+        self.items = items
+        self._index: Dict = {}
+        for item in items:
+            self._index.setdefault(self._key(item), item)
+        self._touched: Set[int] = set()   # id() obiektów już utworzonych/zmienionych przez ten import
+        self.result = MergeResult()
+
+    def merge(self, incoming: Iterable) -> MergeResult:
+        """Merge one batch; returns what happened to this batch (totals accumulate in `result`)."""
+        batch = MergeResult()
+        for item in incoming:
+            key = self._key(item)
+            current = self._index.get(key)
+            if current is None:
+                self.items.append(item)
+                self._index[key] = item
+                self._touched.add(id(item))
+                batch.created.append(item)
+            elif not self._update(current, item):
+                if id(current) not in self._touched:
+                    batch.unchanged.append(current)
+            elif id(current) not in self._touched:
+                # powtórzony klucz w tym samym imporcie – ostatni wiersz wygrywa, liczony raz
+                self._touched.add(id(current))
+                batch.updated.append(current)
+        for name in ("created", "updated", "unchanged"):
+            getattr(self.result, name).extend(getattr(batch, name))
+        return batch
+
+    @staticmethod
+    @abstractmethod
+    def _key(item):
+        """Merge key of an existing or imported object."""
+
+    @staticmethod
+    @abstractmethod
+    def _update(current, imported) -> bool:
+        """Copy the imported fields onto `current`; False when nothing changed."""
+
+
+class PersonMerger(_Merger):
+    """
+    Upserts imported persons into an existing list through an email index.
+
+    Known emails update the name and roles of the existing object in place (so defenses
+    and schedules that reference it stay valid, and its unavailability is kept); new
+    emails are appended. The index is built once, so merging n rows is O(n) also when
+    a large file is fed chunk by chunk.
+    """
+
+    _key = staticmethod(person_key)
+
+    def __init__(self, persons: List[Person]):
+        super().__init__(persons)
+        self.persons = persons
+
+    @staticmethod
+    def _update(current: Person, imported: Person) -> bool:
+        if current.name == imported.name and current.roles == imported.roles:
+            return False
+        current.name, current.roles = imported.name, set(imported.roles)
+        return True
+
+
+class DefenseMerger(_Merger):
+    """
+    Upserts imported defenses into an existing list, keyed on (student, thesis title).
+
+    A known defense gets the imported supervisor/reviewer (its placement is kept);
+    new ones are appended. Same O(n) batching as PersonMerger.
+    """
+
+    _key = staticmethod(defense_key)
+
+    def __init__(self, defenses: List[Defense]):
+        super().__init__(defenses)
+        self.defenses = defenses
+
+    @staticmethod
+    def _update(current: Defense, imported: Defense) -> bool:
+        if current.supervisor is imported.supervisor and current.reviewer is imported.reviewer:
+            return False
+        current.supervisor, current.reviewer = imported.supervisor, imported.reviewer
+        return True
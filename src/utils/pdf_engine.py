@@ -0,0 +1,249 @@
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from fpdf import FPDF
+
+FONT_FAMILY = "NotoSans"
+FONT_PATH = os.path.join(os.path.dirname(__file__), "fonts", "NotoSans-Regular.ttf")
+
+_PT = 25.4 / 72   # 1 pt w mm
+
+
+class FontMetrics:
+    """
+    Advance widths of one TTF font, parsed once per process (see `font_metrics`).
+
+    Text widths are summed from a code point -> em table instead of asking fpdf2, whose
+    multi_cell line breaking re-measures the growing line after every character; measured
+    words are memoized because names repeat on every page.
+    """
+
+    _CACHE_LIMIT = 50_000
+
+    def __init__(self, path: str):
+        from fontTools.ttLib import TTFont
+        font = TTFont(path, lazy=True)
+        upm = font["head"].unitsPerEm
+        advances = font["hmtx"].metrics
+        self.em: Dict[int, float] = {cp: advances[glyph][0] / upm for cp, glyph in font.getBestCmap().items()}
+        self.missing = advances[".notdef"][0] / upm if ".notdef" in advances else 0.5
+        self._words: Dict[str, float] = {}
+        font.close()
+
+    def em_width(self, text: str) -> float:
+        width = self._words.get(text)
+        if width is None:
+            em, missing = self.em, self.missing
+            width = sum(em.get(ord(ch), missing) for ch in text)
+            if len(self._words) >= self._CACHE_LIMIT:
+                self._words.clear()
+            self._words[text] = width
+        return width
+
+    def width(self, text: str, size: float) -> float:
+        """Width of `text` in mm at `size` pt."""
+        return self.em_width(text) * size * _PT
+
+    def wrap(self, text: str, width: float, size: float) -> List[str]:
+        """Greedy word wrap to `width` mm; words longer than a line are split by characters."""
+        limit = width / (size * _PT)   # szerokość w em
+        space = self.em.get(32, self.missing)
+        lines: List[str] = []
+        for paragraph in str(text).split("\n"):
+            line, line_w = [], 0.0
+            for word in paragraph.split():
+                w = self.em_width(word)
+                if line and line_w + space + w <= limit:
+                    line.append(word)
+                    line_w += space + w
+                    continue
+                if line:
+                    lines.append(" ".join(line))
+                if w > limit:
+                    head, word, w = self._split_word(word, limit)
+                    lines.extend(head)
+                line, line_w = [word], w
+            lines.append(" ".join(line))
+        return lines
+
+    def _split_word(self, word: str, limit: float) -> Tuple[List[str], str, float]:
+        pieces, start, acc = [], 0, 0.0
+        for i, ch in enumerate(word):
+            w = self.em.get(ord(ch), self.missing)
+            if acc + w > limit and i > start:
+                pieces.append(word[start:i])
+                start, acc = i, 0.0
+            acc += w
+        return pieces, word[start:], acc
+
+
+@lru_cache(maxsize=None)
+def font_metrics(path: str = FONT_PATH) -> FontMetrics:
+    return FontMetrics(path)
+
+
+# ---------- Tabela harmonogramu ----------
+
+# (nagłówek, szerokość w mm) – razem szerokość A4 poziomo bez marginesów
+COLUMNS = (("Time", 18), ("Student", 42), ("Thesis", 100),
+           ("Supervisor", 39), ("Reviewer", 39), ("Chairman", 39))
+
+
+class PdfRow(NamedTuple):
+    """One placed defense as plain strings – cheap to pickle for worker processes."""
+    day: date
+    room_order: int
+    room: str
+    start: datetime
+    time: str
+    student: str
+    thesis: str
+    supervisor: str
+    reviewer: str
+    chairman: str
+
+
+def room_label(room) -> str:
+    return f"Room: {room.name} ({room.number})" if room.number else f"Room: {room.name}"
+
+
+def schedule_rows(schedule) -> List[PdfRow]:
+    """Rows of all placed defenses; rooms are numbered in the order they appear in the schedule."""
+    room_order: Dict[int, int] = {}
+    labels: Dict[int, str] = {}
+    rows = []
+    for slot in schedule.slots:
+        key = id(slot.room)
+        if key not in room_order:
+            room_order[key] = len(room_order)
+            labels[key] = room_label(slot.room)
+        d = slot.defense
+        if d is None:
+            continue
+        start, end = slot.time_slot.start, slot.time_slot.end
+        rows.append(PdfRow(start.date(), room_order[key], labels[key], start, f"{start:%H:%M}-{end:%H:%M}",
+                           d.student_name, d.thesis_title, d.supervisor.name, d.reviewer.name,
+                           d.chairman.name if d.chairman else "—"))
+    return rows
+
+
+class SchedulePDF:
+    """
+    Compact table layout of a schedule: one section per day, one table per room, rows by time.
+
+    Rows are wrapped with the cached FontMetrics and drawn with plain `text()` calls at
+    precomputed positions, and page breaks are decided from the known row heights (the table
+    header is repeated on every page), so the cost of an export grows linearly with the
+    number of defenses.
+    """
+
+    MARGIN = 10
+    SIZE = 8          # pt, treść tabeli
+    LINE = 3.6        # mm na wiersz tekstu
+    PAD = 1.0
+
+    def __init__(self, title: str = "Thesis Defense Schedule", subtitle: Optional[str] = None):
+        self.title = title
+        self.subtitle = subtitle
+        from fpdf import FPDF   # ciężki import (fontTools, PIL) – dopiero przy pierwszym PDF
+        self.metrics = font_metrics()
+        self.pdf = FPDF(orientation="L", format="A4")
+        self.pdf.set_auto_page_break(False)
+        self.pdf.add_font(FONT_FAMILY, "", FONT_PATH)
+        self.bottom = self.pdf.h - self.MARGIN
+        self.y = self.MARGIN
+        self.rows = 0
+
+    @staticmethod
+    def grouped(rows: Iterable[PdfRow]) -> List[Tuple[date, List[Tuple[str, List[PdfRow]]]]]:
+        """[(day, [(room label, rows sorted by start)])] in day and room order."""
+        days: Dict[date, Dict[int, List[PdfRow]]] = {}
+        for row in rows:
+            days.setdefault(row.day, {}).setdefault(row.room_order, []).append(row)
+        return [(day, [(rooms[k][0].room, sorted(rooms[k], key=lambda r: r.start)) for k in sorted(rooms)])
+                for day, rooms in sorted(days.items())]
+
+    def render(self, rows: Iterable[PdfRow]) -> "FPDF":
+        self._page()
+        self._text(self.MARGIN, 14, self.title)
+        if self.subtitle:
+            self._text(self.MARGIN, 10, self.subtitle)
+        self.y += 6
+        for day, rooms in self.grouped(rows):
+            day_label = day.strftime("%A, %d.%m.%Y")
+            self._heading(day_label, 12, keep=20)
+            for label, room_rows in rooms:
+                self._heading(label, 10, keep=12)
+                self._header()
+                for row in room_rows:
+                    self._row(row, f"{day_label} – {label} (cont.)")
+                self.y += 3
+        return self.pdf
+
+    def output(self, rows: Iterable[PdfRow], filepath: str) -> int:
+        """Render and write the document; returns its page count."""
+        self.render(rows).output(filepath)
+        return self.pdf.page
+
+    # ---------- rysowanie ----------
+
+    def _page(self) -> None:
+        self.pdf.add_page()
+        self.y = self.MARGIN
+
+    def _text(self, x: float, size: float, text: str) -> None:
+        self.pdf.set_font(FONT_FAMILY, "", size)
+        self.pdf.text(x, self.y + size * _PT, text)
+        self.y += size * _PT + 1.5
+
+    def _heading(self, text: str, size: float, keep: float) -> None:
+        if self.y + keep > self.bottom:   # nagłówek nie zostaje sam na dole strony
+            self._page()
+        self._text(self.MARGIN, size, text)
+
+    def _header(self) -> None:
+        pdf = self.pdf
+        height = self.LINE + 2 * self.PAD
+        pdf.set_fill_color(230, 230, 230)
+        pdf.rect(self.MARGIN, self.y, sum(w for _, w in COLUMNS), height, style="F")
+        pdf.set_font(FONT_FAMILY, "", self.SIZE)
+        x = self.MARGIN
+        baseline = self.y + self.PAD + self.LINE * 0.75
+        for name, width in COLUMNS:
+            pdf.text(x + self.PAD, baseline, name)
+            x += width
+        self.y += height
+
+    def _row(self, row: PdfRow, continued: str) -> None:
+        values = row[4:]
+        cells = [self.metrics.wrap(value, width - 2 * self.PAD, self.SIZE)
+                 for value, (_, width) in zip(values, COLUMNS)]
+        height = max(len(lines) for lines in cells) * self.LINE + 2 * self.PAD
+        if self.y + height > self.bottom:
+            self._page()
+            self._text(self.MARGIN, 9, continued)
+            self._header()
+
+        pdf = self.pdf
+        pdf.set_font(FONT_FAMILY, "", self.SIZE)
+        x = self.MARGIN
+        top = self.y + self.PAD + self.LINE * 0.75
+        for lines, (_, width) in zip(cells, COLUMNS):
+            for k, line in enumerate(lines):
+                if line:
+                    pdf.text(x + self.PAD, top + k * self.LINE, line)
+            x += width
+        self.y += height
+        pdf.set_draw_color(200, 200, 200)
+        pdf.line(self.MARGIN, self.y, x, self.y)
+        self.rows += 1
+
+
+def export_schedule_pdf(schedule, filepath: str, title: str = "Thesis Defense Schedule") -> int:
+    """Write the table PDF of `schedule`; returns the number of defense rows."""
+    document = SchedulePDF(title)
+    document.output(schedule_rows(schedule), filepath)
+    return document.rows
@@ -1,10 +1,11 @@
 import json
 from dataclasses import asdict
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import List, Tuple, Optional, Dict
 
 from src.models import Person, Defense, Room, TimeSlot, SessionParameters, Role
-from src.algorithm.scheduler import Schedule, ScheduleSlot, SchedulingAlgorithm
+from src.algorithm.scheduler import Schedule, SchedulingAlgorithm
+from src.algorithm.time_model import time_model_for
 
 
 # ---------- helpers for datetime ----------
@@ -29,19 +30,89 @@ def _deserialize_timeslot(d: dict) -> TimeSlot:
     return TimeSlot(start=_dt_from_str(d["start"]), end=_dt_from_str(d["end"]))
 
 
+# ---------- helpers for format v2 ----------
+#
+# Wersja 2 (kompaktowa):
+#   session_parameters.breaks  – płaska lista minut [start, end, start, end, ...]
+#   rooms      – [name, number, capacity]
+#   persons    – [name, email, [roles], [start, end, ...]]      (niedostępności płasko, w minutach)
+#   defenses   – [student, title, supervisor_idx, reviewer_idx, scheduled]
+#                scheduled = null | [start, end, room_idx, chairman_idx (-1 = brak)]
+#   availability – {"slots": N, "masks": [hex, ...]} – skompilowane maski zablokowanych slotów siatki
+# Wszystkie czasy to minuty od północy dnia sesji (session_date); osoby i sale – indeksy list.
+
+def _day_origin(session_date: date) -> datetime:
+    return datetime.combine(session_date, datetime.min.time())
+
+
+def _to_minutes(dt: datetime, origin: datetime) -> int:
+    return int((dt - origin).total_seconds() // 60)
+
+
+def _flat_minutes(slots, origin: datetime) -> List[int]:
+    flat: List[int] = []
+    for ts in slots:
+        flat.append(_to_minutes(ts.start, origin))
+        flat.append(_to_minutes(ts.end, origin))
+    return flat
+
+
+def _slot_factory(origin: datetime):
+    """(start, end) w minutach -> TimeSlot; te same przedziały powtarzają się w całym pliku,
+    a TimeSlot jest niemutowalny, więc zapamiętujemy i współdzielimy instancje."""
+    instants: Dict[int, datetime] = {}
+    slots: Dict[Tuple[int, int], TimeSlot] = {}
+
+    def at(minutes: int) -> datetime:
+        dt = instants.get(minutes)
+        if dt is None:
+            dt = instants[minutes] = origin + timedelta(minutes=minutes)
+        return dt
+
+    def slot(start: int, end: int) -> TimeSlot:
+        ts = slots.get((start, end))
+        if ts is None:
+            ts = slots[(start, end)] = TimeSlot(start=at(start), end=at(end))
+        return ts
+    return slot
+
+
+def _slots_from_minutes(flat: List[int], slot) -> List[TimeSlot]:
+    return [slot(flat[i], flat[i + 1]) for i in range(0, len(flat), 2)]
+
+
 # ---------- SAVE ----------
 
-def save_project(
-        filepath: str,
+FORMAT_VERSION = 2
+
+
+def project_to_dict(
         persons: List[Person],
         defenses: List[Defense],
         rooms: List[Room],
         session_parameters: Optional[SessionParameters],
-) -> None:
-    """Zapisuje pełny stan projektu do JSON."""
+        version: int = FORMAT_VERSION,
+) -> dict:
+    """Buduje dokument projektu (ten sam kształt, który zapisuje save_project); version 1 albo 2."""
     if not session_parameters:
         raise ValueError("Session parameters are required to save a project")
+    if version == 1:
+        return _project_to_dict_v1(persons, defenses, rooms, session_parameters)
+    if version == 2:
+        return _project_to_dict_v2(persons, defenses, rooms, session_parameters)
+    raise ValueError(f"Unsupported project format version: {version}")
+
+
+def _is_placed(defense: Defense, room_numbers) -> bool:
+    """True for a placed defense; a placement in a room missing from the project is an error (as on load)."""
+    if not (defense.time_slot and defense.room):
+        return False
+    if defense.room.number not in room_numbers:
+        raise ValueError(f"Defense '{defense.student_name}' is placed in unknown room {defense.room.number!r}")
+    return True
 
+
+def _project_to_dict_v1(persons, defenses, rooms, session_parameters) -> dict:
     data = {
         "version": 1,
         "session_parameters": {
@@ -67,6 +138,7 @@ def save_project(
         "defenses": [],
     }
 
+    room_numbers = {r.number for r in rooms}
     for d in defenses:
         item = {
             "student_name": d.student_name,
@@ -74,7 +146,7 @@ def save_project(
             "supervisor_email": d.supervisor.email,
             "reviewer_email": d.reviewer.email,
         }
-        if d.time_slot and d.room:
+        if _is_placed(d, room_numbers):
             item["scheduled"] = {
                 "time_slot": _serialize_timeslot(d.time_slot),
                 "room_number": d.room.number,
@@ -84,17 +156,92 @@ def save_project(
             item["scheduled"] = None
         data["defenses"].append(item)
 
+    return data
+
+
+def _project_to_dict_v2(persons, defenses, rooms, session_parameters) -> dict:
+    origin = _day_origin(session_parameters.session_date)
+    model = time_model_for(session_parameters)
+    person_index = {p.email: i for i, p in enumerate(persons)}
+    room_index = {r.number: i for i, r in enumerate(rooms)}
+
+    def _person_idx(person: Person) -> int:
+        idx = person_index.get(person.email)
+        if idx is None:
+            raise ValueError(f"{person} is not on the person list")
+        return idx
+
+    encoded_defenses = []
+    for d in defenses:
+        scheduled = None
+        if _is_placed(d, room_index):
+            scheduled = [
+                _to_minutes(d.time_slot.start, origin),
+                _to_minutes(d.time_slot.end, origin),
+                room_index[d.room.number],
+                _person_idx(d.chairman) if d.chairman else -1,
+            ]
+        encoded_defenses.append([d.student_name, d.thesis_title,
+                                 _person_idx(d.supervisor), _person_idx(d.reviewer), scheduled])
+
+    return {
+        "version": 2,
+        "session_parameters": {
+            "session_date": session_parameters.session_date.isoformat(),
+            "start_time": session_parameters.start_time,
+            "end_time": session_parameters.end_time,
+            "defense_duration": session_parameters.defense_duration,
+            "room_count": session_parameters.room_count,
+            "breaks": _flat_minutes(session_parameters.breaks or [], origin),
+        },
+        "rooms": [[r.name, r.number, r.capacity] for r in rooms],
+        "persons": [
+            [p.name, p.email, [role.value for role in p.roles], _flat_minutes(p.unavailable_slots or [], origin)]
+            for p in persons
+        ],
+        "defenses": encoded_defenses,
+        "availability": {
+            "slots": len(model),
+            "masks": [format(model.blocked_mask(p.unavailable_slots), "x") for p in persons],
+        },
+    }
+
+
+def save_project(
+        filepath: str,
+        persons: List[Person],
+        defenses: List[Defense],
+        rooms: List[Room],
+        session_parameters: Optional[SessionParameters],
+        version: int = FORMAT_VERSION,
+) -> None:
+    """Zapisuje pełny stan projektu do JSON (domyślnie kompaktowy format 2)."""
+    data = project_to_dict(persons, defenses, rooms, session_parameters, version)
+
     with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        if version == 1:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
 
 
 # ---------- LOAD ----------
 
-def load_project(filepath: str) -> Tuple[List[Person], List[Defense], List[Room], SessionParameters, Schedule]:
-    """Wczytuje projekt z JSON i odtwarza pełny Schedule (siatka slotów + przydziały)."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def project_from_dict(data: dict) -> Tuple[List[Person], List[Defense], List[Room], SessionParameters, Schedule]:
+    """Odtwarza projekt z dokumentu w kształcie save_project (pełny Schedule: siatka slotów + przydziały)."""
+    version = data.get("version", 1)
+    if version == 1:
+        persons, defenses, rooms, params = _parse_v1(data)
+        masks = None
+    elif version == 2:
+        persons, defenses, rooms, params, masks = _parse_v2(data)
+    else:
+        raise ValueError(f"Unsupported project format version: {version}")
+    schedule = build_schedule(persons, defenses, rooms, params, masks)
+    return persons, defenses, rooms, params, schedule
 
+
+def _parse_v1(data: dict) -> Tuple[List[Person], List[Defense], List[Room], SessionParameters]:
     sp = data["session_parameters"]
     params = SessionParameters(
         session_date=date.fromisoformat(sp["session_date"]),
@@ -128,29 +275,86 @@ def load_project(filepath: str) -> Tuple[List[Person], List[Defense], List[Room]
             # przypniemy dopiero po zbudowaniu siatki slotów
             df.time_slot = _deserialize_timeslot(sch["time_slot"])
             df.room = next((r for r in rooms if r.number == sch["room_number"]), None)
+            if df.room is None:
+                raise ValueError(f"Defense '{df.student_name}' is placed in unknown room {sch['room_number']!r}")
             ch_email = sch.get("chairman_email")
             df.chairman = person_by_email.get(ch_email) if ch_email else None
         defenses.append(df)
 
+    return persons, defenses, rooms, params
+
+
+def _parse_v2(data: dict):
+    sp = data["session_parameters"]
+    session_date = date.fromisoformat(sp["session_date"])
+    slot = _slot_factory(_day_origin(session_date))
+    params = SessionParameters(
+        session_date=session_date,
+        start_time=sp["start_time"],
+        end_time=sp["end_time"],
+        defense_duration=int(sp["defense_duration"]),
+        room_count=int(sp["room_count"]),
+        breaks=_slots_from_minutes(sp.get("breaks") or [], slot),
+    )
+
+    rooms = [Room(name, number, int(capacity)) for name, number, capacity in data["rooms"]]
+    persons = [
+        Person(name=name, email=email, roles={Role(r) for r in roles},
+               unavailable_slots=_slots_from_minutes(unavailable, slot))
+        for name, email, roles, unavailable in data["persons"]
+    ]
+
+    defenses: List[Defense] = []
+    for student, title, sup, rev, scheduled in data["defenses"]:
+        df = Defense(student_name=student, thesis_title=title, supervisor=persons[sup], reviewer=persons[rev])
+        if scheduled:
+            start, end, room_idx, chair_idx = scheduled
+            if not 0 <= room_idx < len(rooms):
+                raise ValueError(f"Defense '{student}' is placed in unknown room #{room_idx}")
+            df.time_slot = slot(start, end)
+            df.room = rooms[room_idx]
+            df.chairman = persons[chair_idx] if chair_idx >= 0 else None
+        defenses.append(df)
+
+    availability = data.get("availability") or {}
+    masks = availability.get("masks")
+    if masks is not None and len(masks) == len(persons):
+        masks = (availability.get("slots"), [int(m, 16) for m in masks])
+    else:
+        masks = None
+    return persons, defenses, rooms, params, masks
+
+
+def build_schedule(persons: List[Person], defenses: List[Defense], rooms: List[Room],
+                    params: SessionParameters, masks=None) -> Schedule:
     # zbuduj pusty schedule (pełna siatka)
     available_chairmen = [p for p in persons if p.can_be_chairman()]
     helper = SchedulingAlgorithm(parameters=params, rooms=rooms, available_chairmen=available_chairmen)
     schedule = helper.create_empty_schedule()
 
-    # wstaw obrony do odpowiadających slotów (po start/end i numerze sali)
-    slots_by_key: Dict[tuple, ScheduleSlot] = {
-        (s.time_slot.start, s.time_slot.end, s.room.number): s for s in schedule.slots
-    }
+    # maski z pliku v2 – tylko gdy pasują do tej samej siatki; IntervalList porzuca je przy zmianie
+    if masks is not None and masks[0] == len(helper.time_model):
+        for person, mask in zip(persons, masks[1]):
+            person.unavailable_slots.store_mask(helper.time_model.key, mask)
 
+    # wstaw obrony do odpowiadających slotów (po start/end i numerze sali) – komórka siatki = indeks slotu
+    grid = helper.grid
     for d in defenses:
         if d.time_slot and d.room:
-            key = (d.time_slot.start, d.time_slot.end, d.room.number)
-            slot = slots_by_key.get(key)
+            cell = grid.cell_of(d.time_slot, d.room.number)
+            slot = schedule.slots[cell] if cell is not None else None
             if slot:
                 # jeśli nie ma przewodniczącego w pliku, spróbuj dobrać dostępnego
                 chairman = d.chairman
                 if chairman is None:
-                    chairman = helper.find_available_chairman(slot.time_slot, schedule.get_scheduled_defenses())
+                    chairman = helper.find_available_chairman(d, slot.time_slot, schedule.get_scheduled_defenses())
                 schedule.add_defense(d, slot, chairman if chairman else available_chairmen[0] if available_chairmen else None)
 
-    return persons, defenses, rooms, params, schedule
+    return schedule
+
+
+def load_project(filepath: str) -> Tuple[List[Person], List[Defense], List[Room], SessionParameters, Schedule]:
+    """Wczytuje projekt (format 1 lub 2) z JSON i odtwarza pełny Schedule (siatka slotów + przydziały)."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return project_from_dict(data)
@@ -0,0 +1,411 @@
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.algorithm.scheduler import Schedule, ScheduleSlot
+from src.models import Person, Defense, Room, TimeSlot, SessionParameters, Role
+from src.utils.project_io import build_schedule
+
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    id               INTEGER PRIMARY KEY CHECK (id = 1),
+    session_date     TEXT NOT NULL,
+    start_time       TEXT NOT NULL,
+    end_time         TEXT NOT NULL,
+    defense_duration INTEGER NOT NULL,
+    room_count       INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS breaks (
+    start TEXT NOT NULL,
+    end   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    number   TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    capacity INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS persons (
+    id    INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    name  TEXT NOT NULL,
+    roles TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS unavailability (
+    person_id INTEGER NOT NULL REFERENCES persons(id) ON DELETE CASCADE,
+    start     TEXT NOT NULL,
+    end       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS unavailability_person ON unavailability(person_id, start);
+CREATE TABLE IF NOT EXISTS defenses (
+    id            INTEGER PRIMARY KEY,
+    student_name  TEXT NOT NULL,
+    thesis_title  TEXT NOT NULL,
+    supervisor_id INTEGER NOT NULL REFERENCES persons(id),
+    reviewer_id   INTEGER NOT NULL REFERENCES persons(id)
+);
+CREATE INDEX IF NOT EXISTS defenses_supervisor ON defenses(supervisor_id);
+CREATE INDEX IF NOT EXISTS defenses_reviewer ON defenses(reviewer_id);
+CREATE TABLE IF NOT EXISTS assignments (
+    defense_id  INTEGER PRIMARY KEY REFERENCES defenses(id) ON DELETE CASCADE,
+    start       TEXT NOT NULL,
+    end         TEXT NOT NULL,
+    room_number TEXT NOT NULL,
+    chairman_id INTEGER REFERENCES persons(id)
+);
+CREATE INDEX IF NOT EXISTS assignments_slot ON assignments(start, room_number);
+CREATE INDEX IF NOT EXISTS assignments_chairman ON assignments(chairman_id);
+"""
+
+
+def _dt_to_str(dt: datetime) -> str:
+    return dt.isoformat(timespec="minutes")
+
+
+def _roles_to_str(roles) -> str:
+    return ",".join(sorted(role.value for role in roles))
+
+
+def _roles_from_str(s: str):
+    return {Role(r) for r in s.split(",") if r}
+
+
+class ProjectStore:
+    """
+    Project kept in an SQLite database (standard library `sqlite3`).
+
+    Unlike save_project/load_project, edits are written as small transactions
+    (one person, one defense, one assignment) and nothing is read until asked for:
+    `person(email)`, `defenses_of(email)` and `assignments_at(start)` hit the indexes
+    directly, `load_project()` reads everything. Objects read or written through one
+    store are tracked by identity, so later saves update the same rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('schema_version', ?)",
+                               (str(SCHEMA_VERSION),))
+
+        # rowid <-> obiekt; trzymamy referencje, żeby id() nie zostały użyte ponownie
+        self._person_rows: Dict[int, int] = {}
+        self._persons: Dict[int, Person] = {}
+        self._defense_rows: Dict[int, int] = {}
+        self._defenses: Dict[int, Defense] = {}
+        self._rooms: Optional[Dict[str, Room]] = None
+        self._tracked: Optional[Schedule] = None
+
+    def close(self) -> None:
+        self.untrack()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- zapis całości ----------
+
+    def save_project(self, persons: List[Person], defenses: List[Defense], rooms: List[Room],
+                     session_parameters: Optional[SessionParameters]) -> None:
+        """Replace the whole project in one transaction (e.g. 'Save As' into a new database)."""
+        if not session_parameters:
+            raise ValueError("Session parameters are required to save a project")
+        with self._conn:
+            for table in ("assignments", "defenses", "unavailability", "persons", "rooms", "breaks", "parameters"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._forget()
+            self._write_parameters(session_parameters)
+            self._write_rooms(rooms)
+            for p in persons:
+                self._write_person(p)
+            for d in defenses:
+                self._write_defense(d)
+
+    # ---------- zapisy przyrostowe ----------
+
+    def save_parameters(self, session_parameters: SessionParameters) -> None:
+        with self._conn:
+            self._write_parameters(session_parameters)
+
+    def save_rooms(self, rooms: List[Room]) -> None:
+        with self._conn:
+            self._write_rooms(rooms)
+
+    def save_person(self, person: Person) -> None:
+        """Insert or update one person together with their unavailability."""
+        with self._conn:
+            self._write_person(person)
+
+    def delete_person(self, person: Person) -> None:
+        """Delete a person; fails (sqlite3.IntegrityError) while defenses still reference them."""
+        pid = self._person_rows.get(id(person))
+        with self._conn:
+            if pid is None:
+                row = self._conn.execute("SELECT id FROM persons WHERE email = ?", (person.email,)).fetchone()
+                if row is None:
+                    return
+                pid = row[0]
+            self._conn.execute("UPDATE assignments SET chairman_id = NULL WHERE chairman_id = ?", (pid,))
+            self._conn.execute("DELETE FROM persons WHERE id = ?", (pid,))
+        self._person_rows.pop(id(person), None)
+        self._persons.pop(pid, None)
+
+    def save_defense(self, defense: Defense) -> None:
+        """Insert or update one defense and its assignment (time slot, room, chairman)."""
+        with self._conn:
+            self._write_defense(defense)
+
+    def delete_defense(self, defense: Defense) -> None:
+        did = self._defense_rows.pop(id(defense), None)
+        if did is None:
+            return
+        with self._conn:
+            self._conn.execute("DELETE FROM defenses WHERE id = ?", (did,))
+        self._defenses.pop(did, None)
+
+    def save_assignment(self, defense: Defense) -> None:
+        """Persist only the defense's placement (cheapest write after a move or chairman change)."""
+        with self._conn:
+            if id(defense) not in self._defense_rows:
+                self._write_defense(defense)
+            else:
+                self._write_assignment(self._defense_rows[id(defense)], defense)
+
+    def save_assignments(self, defenses: List[Defense]) -> None:
+        """Rewrite the assignments of `defenses` in one transaction (e.g. after a new schedule was generated)."""
+        with self._conn:
+            for d in defenses:
+                did = self._defense_rows.get(id(d))
+                if did is None:
+                    self._write_defense(d)
+                else:
+                    self._write_assignment(did, d)
+
+    def track(self, schedule: Schedule) -> None:
+        """Persist every add/remove/move/chairman change of `schedule` as it happens."""
+        self.untrack()
+        schedule.subscribe(self._on_schedule_event)
+        self._tracked = schedule
+
+    def untrack(self) -> None:
+        if self._tracked is not None:
+            self._tracked.unsubscribe(self._on_schedule_event)
+            self._tracked = None
+
+    def _on_schedule_event(self, event: str, defense: Defense, slot: Optional[ScheduleSlot]) -> None:
+        if event == "remove":
+            did = self._defense_rows.get(id(defense))
+            if did is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM assignments WHERE defense_id = ?", (did,))
+        else:
+            self.save_assignment(defense)
+
+    # ---------- odczyt leniwy ----------
+
+    def counts(self) -> Dict[str, int]:
+        return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("persons", "defenses", "rooms", "assignments")}
+
+    def session_parameters(self) -> Optional[SessionParameters]:
+        row = self._conn.execute(
+            "SELECT session_date, start_time, end_time, defense_duration, room_count FROM parameters WHERE id = 1"
+        ).fetchone()
+        if row is None:
+            return None
+        breaks = [TimeSlot(datetime.fromisoformat(s), datetime.fromisoformat(e))
+                  for s, e in self._conn.execute("SELECT start, end FROM breaks ORDER BY start")]
+        return SessionParameters(session_date=date.fromisoformat(row[0]), start_time=row[1], end_time=row[2],
+                                 defense_duration=int(row[3]), room_count=int(row[4]), breaks=breaks)
+
+    def rooms(self) -> List[Room]:
+        if self._rooms is None:
+            self._rooms = {number: Room(name, number, int(capacity)) for number, name, capacity in
+                           self._conn.execute("SELECT number, name, capacity FROM rooms ORDER BY position")}
+        return list(self._rooms.values())
+
+    def person(self, email: str) -> Optional[Person]:
+        row = self._conn.execute("SELECT id, email, name, roles FROM persons WHERE email = ?", (email,)).fetchone()
+        return self._person_from_row(row) if row else None
+
+    def iter_persons(self) -> Iterator[Person]:
+        for row in self._conn.execute("SELECT id, email, name, roles FROM persons ORDER BY id"):
+            yield self._person_from_row(row)
+
+    def defenses_of(self, email: str) -> List[Defense]:
+        """Defenses where `email` is supervisor, reviewer or chairman."""
+        row = self._conn.execute("SELECT id FROM persons WHERE email = ?", (email,)).fetchone()
+        if row is None:
+            return []
+        rows = self._conn.execute(
+            # UNION zamiast OR – każda gałąź korzysta ze swojego indeksu
+            self._DEFENSE_SELECT + " WHERE d.id IN (SELECT id FROM defenses WHERE supervisor_id = ?1"
+                                   " UNION SELECT id FROM defenses WHERE reviewer_id = ?1"
+                                   " UNION SELECT defense_id FROM assignments WHERE chairman_id = ?1)"
+                                   " ORDER BY d.id", (row[0],)
+        ).fetchall()
+        return [self._defense_from_row(r) for r in rows]
+
+    def assignments_at(self, start: datetime) -> List[Defense]:
+        """Defenses placed in a slot starting at `start` (all rooms)."""
+        rows = self._conn.execute(
+            self._DEFENSE_SELECT + " WHERE a.start = ? ORDER BY a.room_number", (_dt_to_str(start),)
+        ).fetchall()
+        return [self._defense_from_row(r) for r in rows]
+
+    def load_project(self) -> Tuple[List[Person], List[Defense], List[Room], SessionParameters, Schedule]:
+        """Read the full project (same tuple as project_io.load_project)."""
+        params = self.session_parameters()
+        if params is None:
+            raise ValueError("Project database has no session parameters")
+        rooms = self.rooms()
+        persons = list(self.iter_persons())
+        defenses = [self._defense_from_row(r) for r in
+                    self._conn.execute(self._DEFENSE_SELECT + " ORDER BY d.id").fetchall()]
+        return persons, defenses, rooms, params, build_schedule(persons, defenses, rooms, params)
+
+    # ---------- wiersze <-> obiekty ----------
+
+    _DEFENSE_SELECT = ("SELECT d.id, d.student_name, d.thesis_title, d.supervisor_id, d.reviewer_id,"
+                       " a.start, a.end, a.room_number, a.chairman_id"
+                       " FROM defenses d LEFT JOIN assignments a ON a.defense_id = d.id")
+
+    def _forget(self) -> None:
+        self._person_rows.clear()
+        self._persons.clear()
+        self._defense_rows.clear()
+        self._defenses.clear()
+        self._rooms = None
+
+    def _person_by_id(self, pid: Optional[int]) -> Optional[Person]:
+        if pid is None:
+            return None
+        person = self._persons.get(pid)
+        if person is None:
+            row = self._conn.execute("SELECT id, email, name, roles FROM persons WHERE id = ?", (pid,)).fetchone()
+            person = self._person_from_row(row) if row else None   # wiersz usunięty / osierocony klucz
+        return person
+
+    def _person_from_row(self, row) -> Person:
+        pid, email, name, roles = row
+        person = self._persons.get(pid)
+        if person is None:
+            person = Person(name=name, email=email, roles=_roles_from_str(roles))
+            person.unavailable_slots = [
+                TimeSlot(datetime.fromisoformat(s), datetime.fromisoformat(e)) for s, e in self._conn.execute(
+                    "SELECT start, end FROM unavailability WHERE person_id = ? ORDER BY start", (pid,))
+            ]
+            self._persons[pid] = person
+            self._person_rows[id(person)] = pid
+        return person
+
+    def _defense_from_row(self, row) -> Defense:
+        did, student, title, sup, rev, start, end, room_number, chair = row
+        defense = self._defenses.get(did)
+        if defense is None:
+            defense = Defense(student_name=student, thesis_title=title,
+                              supervisor=self._person_by_id(sup), reviewer=self._person_by_id(rev))
+            if start is not None:
+                # przypniemy do slotu siatki dopiero w build_schedule
+                defense.time_slot = TimeSlot(datetime.fromisoformat(start), datetime.fromisoformat(end))
+                self.rooms()
+                defense.room = self._rooms.get(room_number)
+                if defense.room is None:
+                    raise ValueError(f"Defense '{student}' is placed in unknown room {room_number!r}")
+                defense.chairman = self._person_by_id(chair)
+            self._defenses[did] = defense
+            self._defense_rows[id(defense)] = did
+        return defense
+
+    def _write_parameters(self, params: SessionParameters) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO parameters(id, session_date, start_time, end_time, defense_duration, room_count)"
+            " VALUES (1, ?, ?, ?, ?, ?)",
+            (params.session_date.isoformat(), params.start_time, params.end_time,
+             params.defense_duration, params.room_count),
+        )
+        self._conn.execute("DELETE FROM breaks")
+        self._conn.executemany("INSERT INTO breaks(start, end) VALUES (?, ?)",
+                               [(_dt_to_str(b.start), _dt_to_str(b.end)) for b in (params.breaks or [])])
+
+    def _write_rooms(self, rooms: List[Room]) -> None:
+        self._conn.execute("DELETE FROM rooms")
+        self._conn.executemany("INSERT INTO rooms(number, name, capacity, position) VALUES (?, ?, ?, ?)",
+                               [(r.number, r.name, r.capacity, i) for i, r in enumerate(rooms)])
+        self._rooms = {r.number: r for r in rooms}
+
+    def _write_person(self, person: Person) -> int:
+        pid = self._person_rows.get(id(person))
+        values = (person.email, person.name, _roles_to_str(person.roles))
+        if pid is not None:
+            self._conn.execute("UPDATE persons SET email = ?, name = ?, roles = ? WHERE id = ?", values + (pid,))
+        else:
+            # ta sama osoba (po emailu) zapisana wcześniej innym obiektem – aktualizujemy jej wiersz
+            self._conn.execute(
+                "INSERT INTO persons(email, name, roles) VALUES (?, ?, ?)"
+                " ON CONFLICT(email) DO UPDATE SET name = excluded.name, roles = excluded.roles", values
+            )
+            pid = self._conn.execute("SELECT id FROM persons WHERE email = ?", (person.email,)).fetchone()[0]
+            self._person_rows[id(person)] = pid
+            self._persons[pid] = person
+        self._conn.execute("DELETE FROM unavailability WHERE person_id = ?", (pid,))
+        self._conn.executemany("INSERT INTO unavailability(person_id, start, end) VALUES (?, ?, ?)",
+                               [(pid, _dt_to_str(ts.start), _dt_to_str(ts.end)) for ts in person.unavailable_slots])
+        return pid
+
+    def _person_row(self, person: Person) -> int:
+        pid = self._person_rows.get(id(person))
+        return pid if pid is not None else self._write_person(person)
+
+    def _write_defense(self, defense: Defense, assignment: bool = True) -> int:
+        values = (defense.student_name, defense.thesis_title,
+                  self._person_row(defense.supervisor), self._person_row(defense.reviewer))
+        did = self._defense_rows.get(id(defense))
+        if did is not None:
+            self._conn.execute("UPDATE defenses SET student_name = ?, thesis_title = ?, supervisor_id = ?,"
+                               " reviewer_id = ? WHERE id = ?", values + (did,))
+        else:
+            did = self._conn.execute("INSERT INTO defenses(student_name, thesis_title, supervisor_id, reviewer_id)"
+                                     " VALUES (?, ?, ?, ?)", values).lastrowid
+            self._defense_rows[id(defense)] = did
+            self._defenses[did] = defense
+        if assignment:
+            self._write_assignment(did, defense)
+        return did
+
+    def _write_assignment(self, did: int, defense: Defense) -> None:
+        if defense.time_slot is None or defense.room is None:
+            self._conn.execute("DELETE FROM assignments WHERE defense_id = ?", (did,))
+            return
+        chairman = self._person_row(defense.chairman) if defense.chairman is not None else None
+        self._conn.execute(
+            "INSERT OR REPLACE INTO assignments(defense_id, start, end, room_number, chairman_id)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (did, _dt_to_str(defense.time_slot.start), _dt_to_str(defense.time_slot.end),
+             defense.room.number, chairman),
+        )
+
+
+def save_project_db(filepath: str, persons: List[Person], defenses: List[Defense], rooms: List[Room],
+                    session_parameters: Optional[SessionParameters]) -> None:
+    """Write the whole project into an SQLite database (counterpart of project_io.save_project)."""
+    with ProjectStore(filepath) as store:
+        store.save_project(persons, defenses, rooms, session_parameters)
+
+
+def load_project_db(filepath: str) -> Tuple[List[Person], List[Defense], List[Room], SessionParameters, Schedule]:
+    """Read a project from an SQLite database (counterpart of project_io.load_project)."""
+    with ProjectStore(filepath) as store:
+        return store.load_project()
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import List, Optional, Tuple, Dict
+
+from src.models import Person, Defense, Room, SessionParameters, TimeSlot
+from src.algorithm.scheduler import Schedule, SchedulingAlgorithm, SchedulingConflict
+
+
+# zmiana formatu wpisu/klucza => nowa wartość (stare wpisy przestają pasować)
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory (overridable with TDS_CACHE_DIR)."""
+    env = os.environ.get("TDS_CACHE_DIR")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "thesis_defense_scheduler", "schedules")
+
+
+# ---------- klucz ----------
+
+def _ts(ts: TimeSlot) -> List[str]:
+    return [ts.start.isoformat(timespec="minutes"), ts.end.isoformat(timespec="minutes")]
+
+
+def canonical_input(persons: List[Person], defenses: List[Defense], rooms: List[Room],
+                    params: SessionParameters, algorithm: str, settings: Optional[dict] = None,
+                    initial: Optional[Schedule] = None) -> dict:
+    """
+    Canonical, machine-independent description of a scheduling run.
+    Order that cannot change the result (persons, roles, unavailability, breaks) is normalized;
+    order that can (defenses, rooms) is kept. A warm-start schedule is part of the input.
+    """
+    doc = {
+        "format": CACHE_FORMAT,
+        "algorithm": algorithm,
+        "settings": settings or {},
+        "session_parameters": {
+            "session_date": params.session_date.isoformat(),
+            "start_time": params.start_time,
+            "end_time": params.end_time,
+            "defense_duration": params.defense_duration,
+            "room_count": params.room_count,
+            "breaks": sorted(_ts(b) for b in (params.breaks or [])),
+        },
+        "rooms": [[r.name, r.number, r.capacity] for r in rooms[: params.room_count]],
+        "persons": sorted(
+            [p.email, p.name, sorted(role.value for role in p.roles),
+             sorted(_ts(u) for u in (p.unavailable_slots or []))]
+            for p in persons
+        ),
+        "defenses": [[d.student_name, d.thesis_title, d.supervisor.email, d.reviewer.email] for d in defenses],
+    }
+    if initial is not None:
+        doc["initial"] = extract_assignments(initial, defenses)
+    return doc
+
+
+def schedule_cache_key(persons: List[Person], defenses: List[Defense], rooms: List[Room],
+                       params: SessionParameters, algorithm: str, settings: Optional[dict] = None,
+                       initial: Optional[Schedule] = None) -> str:
+    """SHA-256 of the canonical input; identical on every machine for identical data."""
+    doc = canonical_input(persons, defenses, rooms, params, algorithm, settings, initial)
+    raw = json.dumps(doc, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def scheduler_cache_key(scheduler: SchedulingAlgorithm, persons: List[Person], defenses: List[Defense],
+                        initial: Optional[Schedule] = None) -> str:
+    return schedule_cache_key(persons, defenses, scheduler.rooms, scheduler.parameters,
+                              type(scheduler).__name__, scheduler.get_settings(), initial)
+
+
+# ---------- przydziały <-> wpis ----------
+
+def extract_assignments(schedule: Schedule, defenses: List[Defense]) -> List[Optional[dict]]:
+    """One entry per defense (same order): slot times, room number and chairman email, or None."""
+    index = {id(d): i for i, d in enumerate(defenses)}
+    out: List[Optional[dict]] = [None] * len(defenses)
+    for slot in schedule.slots:
+        d = slot.defense
+        if d is None or id(d) not in index:
+            continue
+        out[index[id(d)]] = {
+            "time_slot": _ts(slot.time_slot),
+            "room_number": slot.room.number,
+            "chairman_email": d.chairman.email if d.chairman else None,
+        }
+    return out
+
+
+def apply_assignments(scheduler: SchedulingAlgorithm, defenses: List[Defense],
+                      assignments: List[Optional[dict]]) -> Schedule:
+    """Rebuilds a Schedule on the scheduler's grid from extract_assignments() output."""
+    schedule = scheduler.create_empty_schedule()
+    grid = scheduler.grid
+    people: Dict[str, Person] = {p.email: p for p in scheduler.available_chairmen}
+    for d in defenses:
+        people.setdefault(d.supervisor.email, d.supervisor)
+        people.setdefault(d.reviewer.email, d.reviewer)
+
+    for d, a in zip(defenses, assignments):
+        cell = grid.cell_at(datetime.fromisoformat(a["time_slot"][0]), a["room_number"]) if a else None
+        slot = schedule.slots[cell] if cell is not None else None
+        if slot is not None and slot.is_free():
+            schedule.add_defense(d, slot, people.get(a["chairman_email"]))
+    clear_unplaced(schedule, defenses)
+    return schedule
+
+
+def clear_unplaced(schedule: Schedule, defenses: List[Defense]) -> None:
+    """Schedulers leave stale slot/room/chairman on defenses they tried but did not keep."""
+    placed = {id(d) for d in schedule.get_scheduled_defenses()}
+    for d in defenses:
+        if id(d) not in placed:
+            d.time_slot = None
+            d.room = None
+            d.chairman = None
+
+
+# ---------- cache na dysku ----------
+
+class ScheduleCache:
+    """
+    Content-addressed on-disk cache of scheduling results.
+    One JSON file per key; least recently used entries are evicted once the
+    directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key or entry.get("format") != CACHE_FORMAT:
+            return None
+        try:
+            os.utime(path)  # LRU: świeżo użyty
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, assignments: List[Optional[dict]], conflicts: List[SchedulingConflict],
+            defenses: List[Defense]) -> None:
+        index = {id(d): i for i, d in enumerate(defenses)}
+        entry = {
+            "format": CACHE_FORMAT,
+            "key": key,
+            "assignments": assignments,
+            "conflicts": [
+                {"message": c.message, "defense": index.get(id(c.defense)) if c.defense is not None else None}
+                for c in conflicts
+            ],
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._evict()
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
+
+    def size_bytes(self) -> int:
+        return sum(e.stat().st_size for e in os.scandir(self.directory) if e.name.endswith(".json"))
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for e in os.scandir(self.directory):
+            if not e.name.endswith(".json"):
+                continue
+            st = e.stat()
+            entries.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()  # najdawniej używane najpierw
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def run_cached(cache: Optional[ScheduleCache], scheduler: SchedulingAlgorithm, persons: List[Person],
+               defenses: List[Defense], initial: Optional[Schedule] = None
+               ) -> Tuple[Schedule, List[SchedulingConflict], str, bool]:
+    """
+    scheduler.schedule(defenses, initial) backed by the cache.
+    Returns (schedule, conflicts, cache_key, cache_hit).
+    """
+    key = scheduler_cache_key(scheduler, persons, defenses, initial)
+    entry = cache.get(key) if cache is not None else None
+    if entry is not None:
+        schedule = apply_assignments(scheduler, defenses, entry["assignments"])
+        conflicts = [
+            SchedulingConflict(c["message"], defense=defenses[c["defense"]] if c["defense"] is not None else None)
+            for c in entry["conflicts"]
+        ]
+        return schedule, conflicts, key, True
+
+    schedule, conflicts = scheduler.schedule(defenses, initial=initial)
+    clear_unplaced(schedule, defenses)
+    if cache is not None:
+        cache.put(key, extract_assignments(schedule, defenses), conflicts, defenses)
+    return schedule, conflicts, key, False
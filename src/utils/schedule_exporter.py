@@ -1,106 +1,134 @@
 import csv
+import gzip
 import json
-from typing import List
-from src.algorithm import Schedule
-from src.models.defense import Defense
-from fpdf import FPDF
 import os
+from typing import Iterator, Optional, TextIO, Tuple
+from src.algorithm import Schedule
+from src.utils.calendar_export import export_calendars
+from src.utils.pdf_engine import export_schedule_pdf
+from src.utils.schedule_stats import WORKLOAD_COLUMNS, schedule_stats, workload_row
+
+CSV_HEADER = ['Student', 'Thesis Title', 'Supervisor', 'Reviewer', 'Chairman', 'Room', 'Time Slot']
+JSON_FIELDS = ('student', 'thesis_title', 'supervisor', 'reviewer', 'chairman', 'room', 'time_slot')
+
+
+def open_export(filepath: str, compress: Optional[bool] = None, newline: Optional[str] = None) -> TextIO:
+    """Text file for an export; gzip-compressed on the fly when `compress` is set (default: name ends with .gz)."""
+    if compress is None:
+        compress = filepath.endswith('.gz')
+    if compress:
+        return gzip.open(filepath, 'wt', encoding='utf-8', newline=newline, compresslevel=6)
+    return open(filepath, 'w', encoding='utf-8', newline=newline)
+
+
+def _object_encoder(indent: Optional[int]):
+    """
+    row -> the JSON object json.dumps would write for dict(zip(JSON_FIELDS, row)) at `indent`
+    (nested one level, as an array item). Rows are flat strings, so only the values need the
+    C string encoder; keys and indentation are prepared once.
+    """
+    quote = json.encoder.encode_basestring
+    if indent is None:
+        keys = [quote(k) + ': ' for k in JSON_FIELDS]
+        return lambda row: '{' + ', '.join([k + quote(v) for k, v in zip(keys, row)]) + '}'
+    keys = ['\n' + ' ' * (2 * indent) + quote(k) + ': ' for k in JSON_FIELDS]
+    close = '\n' + ' ' * indent + '}'
+    return lambda row: '{' + ','.join([k + quote(v) for k, v in zip(keys, row)]) + close
+
 
 class ScheduleExporter:
     @staticmethod
-    def export_to_csv(schedule: Schedule, filepath: str) -> None:
-        with open(filepath, 'w', newline='', encoding='utf-8') as file:
+    def iter_rows(schedule: Schedule) -> Iterator[Tuple[str, ...]]:
+        """Placed defenses as rows in CSV_HEADER order; each distinct time slot is formatted only once."""
+        times = {}   # id(TimeSlot) -> tekst; sloty sal o tej samej godzinie dzielą obiekt TimeSlot
+        for slot in schedule.slots:
+            defense = slot.defense
+            if defense is None:
+                continue
+            time_slot = slot.time_slot
+            text = times.get(id(time_slot))
+            if text is None:
+                text = times[id(time_slot)] = str(time_slot)
+            yield (defense.student_name, defense.thesis_title, defense.supervisor.name, defense.reviewer.name,
+                   defense.chairman.name if defense.chairman else '', slot.room.name, text)
+
+    @staticmethod
+    def export_to_csv(schedule: Schedule, filepath: str, compress: Optional[bool] = None) -> int:
+        """Stream rows to CSV (gzip for '.gz' names); returns the row count."""
+        count = 0
+        with open_export(filepath, compress, newline='') as file:
             writer = csv.writer(file)
-            writer.writerow(['Student', 'Thesis Title', 'Supervisor', 'Reviewer', 'Chairman', 'Room', 'Time Slot'])
+            writer.writerow(CSV_HEADER)
+            for row in ScheduleExporter.iter_rows(schedule):
+                writer.writerow(row)
+                count += 1
+        return count
 
-            for slot in schedule.slots:
-                if slot.defense:
-                    defense = slot.defense
-                    writer.writerow([
-                        defense.student_name,
-                        defense.thesis_title,
-                        defense.supervisor.name,
-                        defense.reviewer.name,
-                        defense.chairman.name if defense.chairman else '',
-                        slot.room.name,
-                        str(slot.time_slot)
-                    ])
+    @staticmethod
+    def export_to_json(schedule: Schedule, filepath: str, compress: Optional[bool] = None,
+                       indent: Optional[int] = 2) -> int:
+        """
+        Stream a JSON array object by object (same bytes as json.dump with the same indent);
+        `indent=None` writes it compact with the C encoder. Returns the row count.
+        """
+        encode = _object_encoder(indent)
+        pad = '\n' + ' ' * indent if indent is not None else ''
+        separator = ',' + pad if indent is not None else ', '
+        count = 0
+        with open_export(filepath, compress) as file:
+            file.write('[')
+            for row in ScheduleExporter.iter_rows(schedule):
+                file.write((separator if count else pad) + encode(row))
+                count += 1
+            file.write(('\n]' if indent is not None else ']') if count else ']')
+        return count
 
     @staticmethod
-    def export_to_json(schedule: Schedule, filepath: str) -> None:
-        data = []
-        for slot in schedule.slots:
-            if slot.defense:
-                defense = slot.defense
-                data.append({
-                    'student': defense.student_name,
-                    'thesis_title': defense.thesis_title,
-                    'supervisor': defense.supervisor.name,
-                    'reviewer': defense.reviewer.name,
-                    'chairman': defense.chairman.name if defense.chairman else '',
-                    'room': slot.room.name,
-                    'time_slot': str(slot.time_slot)
-                })
+    def export_to_jsonl(schedule: Schedule, filepath: str, compress: Optional[bool] = None) -> int:
+        """JSON Lines: one compact object per placed defense (gzip for '.gz' names); returns the row count."""
+        encode = _object_encoder(None)
+        count = 0
+        with open_export(filepath, compress, newline='\n') as file:
+            for row in ScheduleExporter.iter_rows(schedule):
+                file.write(encode(row) + '\n')
+                count += 1
+        return count
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=2, ensure_ascii=False)
+    @staticmethod
+    def export_workload_report(schedule: Schedule, filepath: str, compress: Optional[bool] = None) -> int:
+        """
+        Per-person workload (role counts and minutes, span, idle gaps): CSV, or the full
+        statistics incl. room utilization as JSON for '.json' names. Uses the cached
+        statistics the GUI panel shows. Returns the person count.
+        """
+        stats = schedule_stats(schedule)
+        name = filepath[:-3] if filepath.endswith('.gz') else filepath
+        if name.lower().endswith('.json'):
+            with open_export(filepath, compress) as file:
+                json.dump(stats.to_dict(), file, ensure_ascii=False, indent=2)
+        else:
+            with open_export(filepath, compress, newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=WORKLOAD_COLUMNS)
+                writer.writeheader()
+                writer.writerows(workload_row(w) for w in stats.workloads)
+        return len(stats.workloads)
 
     @staticmethod
     def export_to_pdf(schedule, filepath: str) -> None:
+        # tabela dzień -> sala -> godzina, metryki czcionki wczytywane raz na proces (pdf_engine)
         try:
-            pdf = FPDF()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            pdf.add_page()
-
-            # Czcionka Unicode
-            font_path = os.path.join(os.path.dirname(__file__), "fonts", "NotoSans-Regular.ttf")
-            pdf.add_font("NotoSans", "", font_path, uni=True)
-            pdf.set_font("NotoSans", "", 14)
-
-            # Marginesy i szerokość strony
-            left_margin = 10
-            right_margin = 10
-            page_width = pdf.w
-            usable_width = page_width - left_margin - right_margin
-
-            # Nagłówek
-            pdf.set_x(left_margin)
-            pdf.cell(usable_width, 10, "Thesis Defense Schedule", ln=True, align='C')
-            pdf.ln(8)
-
-            pdf.set_font("NotoSans", "", 10)
-
-            for i, slot in enumerate(schedule.slots, start=1):
-                if slot.defense:
-                    d = slot.defense
-
-                    # Linia
-                    pdf.set_draw_color(200, 200, 200)
-                    y = pdf.get_y()
-                    pdf.line(left_margin, y, page_width - right_margin, y)
-                    pdf.ln(4)
-
-                    pdf.set_x(left_margin)
-                    pdf.cell(usable_width, 8, f"{i}. {slot.time_slot}   |   Room: {slot.room.name}", ln=True)
-
-                    pdf.set_x(left_margin)
-                    pdf.multi_cell(usable_width, 6, f"Student: {d.student_name}")
-
-                    pdf.set_x(left_margin)
-                    pdf.multi_cell(usable_width, 6, f"Thesis: {d.thesis_title}")
-
-                    pdf.set_x(left_margin)
-                    pdf.multi_cell(usable_width, 6,
-                        f"Supervisor: {d.supervisor.name}\n"
-                        f"Reviewer: {d.reviewer.name}\n"
-                        f"Chairman: {d.chairman.name if d.chairman else '—'}"
-                    )
-
-                    pdf.ln(6)
-
-            pdf.output(filepath)
-        
+            export_schedule_pdf(schedule, filepath)
         except Exception as e:
-            # Dodaj ten print, by złapać dokładny błąd
             print("Export to PDF failed:", e)
-            raise e
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def export_to_ics(schedule, filepath: str) -> None:
+        # jeden wspólny kalendarz (RFC 5545) ze wszystkimi obronami
+        export_calendars(schedule, os.path.dirname(os.path.abspath(filepath)), persons=False, rooms=False,
+                         combined=os.path.basename(filepath))
+
+    @staticmethod
+    def export_calendar_feeds(schedule, directory: str) -> dict:
+        """schedule.ics plus one .ics per person (all their roles) and per room; returns {file: events}."""
+        return export_calendars(schedule, directory)
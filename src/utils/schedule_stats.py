@@ -0,0 +1,237 @@
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.models import Person, Room
+
+ROLES = ("supervisor", "reviewer", "chairman")
+
+
+@dataclass
+class RoomUsage:
+    room: Room
+    slots: int = 0
+    used: int = 0
+    minutes: int = 0
+    first: Optional[datetime] = None
+    last: Optional[datetime] = None
+    idle_minutes: int = 0        # przerwy między pierwszą a ostatnią obroną w sali
+
+    @property
+    def utilization(self) -> float:
+        return self.used / self.slots if self.slots else 0.0
+
+
+@dataclass
+class Workload:
+    """One person's share of the schedule; `person` is the live object, so renames need no recompute."""
+    person: Person
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(ROLES, 0))
+    minutes: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(ROLES, 0))
+    defenses: int = 0            # różne obrony (dwie role w jednej obronie liczą się raz)
+    busy_minutes: int = 0        # czas obecności (obrona liczona raz, niezależnie od liczby ról)
+    first: Optional[datetime] = None
+    last: Optional[datetime] = None
+    idle_minutes: int = 0        # okienka między kolejnymi obronami tej osoby
+    _intervals: List[Tuple[datetime, datetime]] = field(default_factory=list, repr=False)
+
+    @property
+    def total_minutes(self) -> int:
+        """Minutes summed over roles (a defense held in two roles counts twice, as before)."""
+        return sum(self.minutes.values())
+
+    @property
+    def span_minutes(self) -> int:
+        return int((self.last - self.first).total_seconds() // 60) if self.first else 0
+
+
+@dataclass
+class ScheduleStats:
+    """Everything the statistics panel and the workload report show, computed in one pass."""
+    version: int
+    slots: int = 0
+    used_slots: int = 0
+    defenses: int = 0
+    total_minutes: int = 0
+    first: Optional[datetime] = None
+    last: Optional[datetime] = None
+    idle_minutes: int = 0        # okresy w obrębie sesji bez żadnej obrony
+    rooms: List[RoomUsage] = field(default_factory=list)
+    workloads: List[Workload] = field(default_factory=list)   # malejąco wg total_minutes
+
+    @property
+    def span_minutes(self) -> int:
+        return int((self.last - self.first).total_seconds() // 60) if self.first else 0
+
+    @property
+    def utilization(self) -> float:
+        return self.used_slots / self.slots if self.slots else 0.0
+
+    def by_role(self, role: str) -> List[Workload]:
+        """Persons holding `role` at least once, busiest first."""
+        return sorted((w for w in self.workloads if w.counts[role]), key=lambda w: -w.counts[role])
+
+    def to_dict(self) -> dict:
+        return {
+            "slots": self.slots, "used_slots": self.used_slots, "defenses": self.defenses,
+            "total_minutes": self.total_minutes, "span_minutes": self.span_minutes,
+            "idle_minutes": self.idle_minutes,
+            "first": self.first.isoformat() if self.first else None,
+            "last": self.last.isoformat() if self.last else None,
+            "rooms": [{"name": r.room.name, "number": r.room.number, "slots": r.slots, "used": r.used,
+                       "minutes": r.minutes, "idle_minutes": r.idle_minutes,
+                       "utilization": round(r.utilization, 4)} for r in self.rooms],
+            "workload": [workload_row(w) for w in self.workloads],
+        }
+
+    def text(self) -> str:
+        """Plain-text summary for the GUI panel."""
+        def hm(minutes: int) -> str:
+            return f"{minutes // 60}h {minutes % 60}min"
+
+        lines = ["Room Utilization:"]
+        lines += [f"  {r.room.name}: {r.used}/{r.slots} slots ({r.utilization:.0%}), idle {hm(r.idle_minutes)}"
+                  for r in self.rooms if r.used]
+        lines += ["", "Workload Distribution:"]
+        for role in ROLES:
+            lines.append(f"  {role.capitalize()}s:")
+            lines += [f"    {w.person.name}: {w.counts[role]} defenses ({hm(w.minutes[role])})"
+                      for w in self.by_role(role)]
+        lines += ["", "Total Work Time:"]
+        lines += [f"  {w.person.name}: {hm(w.total_minutes)} ({w.defenses} defenses, idle {hm(w.idle_minutes)})"
+                  for w in self.workloads]
+        lines += ["", f"Total Scheduled Defenses: {self.defenses}",
+                  f"Used Slots: {self.used_slots}/{self.slots}",
+                  f"Session span: {hm(self.span_minutes)}, idle {hm(self.idle_minutes)}"]
+        return "\n".join(lines)
+
+
+WORKLOAD_COLUMNS = ("name", "email", "defenses", "supervisor", "reviewer", "chairman",
+                    "supervisor_minutes", "reviewer_minutes", "chairman_minutes", "total_minutes",
+                    "busy_minutes", "first", "last", "span_minutes", "idle_minutes")
+
+
+def workload_row(w: Workload) -> dict:
+    return {"name": w.person.name, "email": w.person.email, "defenses": w.defenses,
+            **{role: w.counts[role] for role in ROLES},
+            **{f"{role}_minutes": w.minutes[role] for role in ROLES},
+            "total_minutes": w.total_minutes, "busy_minutes": w.busy_minutes,
+            "first": w.first.strftime("%Y-%m-%d %H:%M") if w.first else "",
+            "last": w.last.strftime("%Y-%m-%d %H:%M") if w.last else "",
+            "span_minutes": w.span_minutes, "idle_minutes": w.idle_minutes}
+
+
+def _gaps(intervals: List[Tuple[datetime, datetime]]) -> int:
+    """Minutes between consecutive (sorted, merged) intervals."""
+    intervals.sort()
+    idle, end = 0, None
+    for start, stop in intervals:
+        if end is not None and start > end:
+            idle += int((start - end).total_seconds() // 60)
+        end = stop if end is None or stop > end else end
+    return idle
+
+
+def compute_stats(schedule) -> ScheduleStats:
+    """Room utilization, per-role workload, minutes, idle gaps and span in one pass over the slots."""
+    stats = ScheduleStats(version=schedule.version)
+    rooms: Dict[int, RoomUsage] = {}
+    people: Dict[int, Workload] = {}
+    room_intervals: Dict[int, List[Tuple[datetime, datetime]]] = {}
+    busy: List[Tuple[datetime, datetime]] = []
+    minutes_of: Dict[int, int] = {}   # id(TimeSlot) -> minuty; sloty o tej samej godzinie dzielą obiekt
+
+    for slot in schedule.slots:
+        ts = slot.time_slot
+        if ts is None:
+            continue
+        stats.slots += 1
+        usage = rooms.get(id(slot.room))
+        if usage is None:
+            usage = rooms[id(slot.room)] = RoomUsage(slot.room)
+            room_intervals[id(slot.room)] = []
+        usage.slots += 1
+        d = slot.defense
+        if d is None:
+            continue
+
+        minutes = minutes_of.get(id(ts))
+        if minutes is None:
+            minutes = minutes_of[id(ts)] = int((ts.end - ts.start).total_seconds() // 60)
+        interval = (ts.start, ts.end)
+        stats.used_slots += 1
+        stats.total_minutes += minutes
+        usage.used += 1
+        usage.minutes += minutes
+        room_intervals[id(slot.room)].append(interval)
+        busy.append(interval)
+
+        seen = set()
+        for role, person in zip(ROLES, (d.supervisor, d.reviewer, d.chairman)):
+            if person is None:
+                continue
+            w = people.get(id(person))
+            if w is None:
+                w = people[id(person)] = Workload(person)
+            w.counts[role] += 1
+            w.minutes[role] += minutes
+            if id(person) not in seen:
+                seen.add(id(person))
+                w.defenses += 1
+                w.busy_minutes += minutes
+                w._intervals.append(interval)
+
+    stats.defenses = stats.used_slots
+    for key, usage in rooms.items():
+        intervals = room_intervals[key]
+        if intervals:
+            usage.idle_minutes = _gaps(intervals)
+            usage.first, usage.last = intervals[0][0], max(end for _, end in intervals)
+    for w in people.values():
+        w.idle_minutes = _gaps(w._intervals)
+        w.first, w.last = w._intervals[0][0], max(end for _, end in w._intervals)
+        w._intervals = []
+    if busy:
+        stats.idle_minutes = _gaps(busy)
+        stats.first, stats.last = busy[0][0], max(end for _, end in busy)
+    stats.rooms = list(rooms.values())
+    stats.workloads = sorted(people.values(), key=lambda w: (-w.total_minutes, w.person.name))
+    return stats
+
+
+class StatsCache:
+    """
+    Last computed stats per schedule, reused while `schedule.version` (and the slot count) is
+    unchanged – the GUI panel, the header and the exporters then share one computation.
+    Holds the schedule weakly. Edits made in place on a defense (no version bump) call
+    `invalidate()`.
+    """
+
+    def __init__(self):
+        self._ref = None
+        self._key: Optional[Tuple[int, int]] = None
+        self._stats: Optional[ScheduleStats] = None
+
+    def get(self, schedule) -> ScheduleStats:
+        key = (schedule.version, len(schedule.slots))
+        if self._ref is None or self._ref() is not schedule or self._key != key:
+            self._stats = compute_stats(schedule)
+            self._ref, self._key = weakref.ref(schedule), key
+        return self._stats
+
+    def invalidate(self) -> None:
+        self._ref = self._key = self._stats = None
+
+
+_cache = StatsCache()
+
+
+def schedule_stats(schedule) -> ScheduleStats:
+    """Cached `compute_stats` (recomputed only after the schedule changed)."""
+    return _cache.get(schedule)
+
+
+def invalidate_stats() -> None:
+    """Drop the cached stats after a defense or person was changed in place."""
+    _cache.invalidate()
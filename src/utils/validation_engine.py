@@ -0,0 +1,175 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.algorithm.instance import CompiledInstance
+from src.algorithm.scheduler import Schedule, ScheduleSlot
+from src.models import Defense, Person, Role, Room, TimeSlot
+
+
+class _Placement:
+    """What one placed defense contributes to the violation sets (snapshot taken on registration)."""
+    __slots__ = ("defense", "slot", "time_slot", "room", "members", "position", "unavailable", "bad_chair")
+
+    def __init__(self, defense: Defense, slot: ScheduleSlot, members: Dict[int, Person], position: int):
+        self.defense = defense
+        self.slot = slot
+        self.time_slot: TimeSlot = defense.time_slot
+        self.room: Room = defense.room
+        self.members = members              # person id -> Person (pierwsze wystąpienie w komisji)
+        self.position = position            # pozycja slotu – kolejność jak w get_scheduled_defenses()
+        self.unavailable: List[Person] = []
+        self.bad_chair = False
+
+
+class ValidationEngine:
+    """
+    Incremental version of Validator.validate_schedule for one Schedule.
+
+    Subscribes to the schedule's mutations and keeps per-(time, person) and per-(time, room)
+    booking buckets plus per-defense unavailability / chairman-role flags, so counts are O(1)
+    and every change costs O(committee size). Assumes the slots of one schedule never overlap
+    unless they are the same time slot (true for schedules built by create_empty_schedule).
+    Direct writes to ScheduleSlot.defense bypass the notifications – call rebuild() after them.
+    """
+
+    def __init__(self, schedule: Schedule,
+                 on_change: Optional[Callable[["ValidationEngine"], None]] = None):
+        self.schedule = schedule
+        self.on_change = on_change
+        self._ids = CompiledInstance()
+        self._positions: Dict[int, int] = {}
+        self._placed: Dict[int, _Placement] = {}
+        self._person_at: Dict[Tuple[TimeSlot, int], List[_Placement]] = {}
+        self._room_at: Dict[Tuple[TimeSlot, Room], List[_Placement]] = {}
+        self._counts = {"person_clashes": 0, "room_clashes": 0, "unavailable": 0, "chairman_role": 0}
+        self.rebuild()
+        schedule.subscribe(self._on_schedule_event)
+
+    # ---------- API ----------
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts.values())
+
+    def messages(self) -> List[str]:
+        """Current violations in Validator's wording (sorted, deduplicated)."""
+        msgs: List[str] = []
+        for (_, pid), bucket in self._person_at.items():
+            for a, b in self._pairs(bucket):
+                msgs.append(f"{a.members[pid].name} booked twice: "
+                            f"'{a.defense.student_name}' and '{b.defense.student_name}' at {a.time_slot}")
+        for bucket in self._room_at.values():
+            for a, b in self._pairs(bucket):
+                msgs.append(f"Room {a.room.name} double-booked: "
+                            f"'{a.defense.student_name}' and '{b.defense.student_name}' at {a.time_slot}")
+        for placement in self._placed.values():
+            d = placement.defense
+            for p in placement.unavailable:
+                msgs.append(f"{p.name} is marked unavailable for {d.student_name}'s defense at {placement.time_slot}")
+            if placement.bad_chair:
+                msgs.append(f"{d.chairman.name} assigned as chairman for {d.student_name} but lacks CHAIRMAN role")
+        return sorted(set(msgs))
+
+    def refresh(self, defense: Defense) -> None:
+        """Re-evaluate one defense (e.g. after its people were edited or its committee was replaced)."""
+        self._withdraw(defense)
+        slot = self.schedule.find_slot(defense)
+        if slot is not None:
+            self._register(defense, slot)
+        self._changed()
+
+    def refresh_person(self, person: Person) -> None:
+        """Re-evaluate every placed defense `person` sits on (e.g. after an availability change)."""
+        pid = self._ids.person_id(person)
+        for placement in [p for p in self._placed.values() if pid in p.members]:
+            self._withdraw(placement.defense)
+            self._register(placement.defense, placement.slot)
+        self._changed()
+
+    def rebuild(self) -> None:
+        """Start over from the schedule's current slots (only needed after bypassing its methods)."""
+        self._positions = {id(slot): k for k, slot in enumerate(self.schedule.slots)}
+        self._placed.clear()
+        self._person_at.clear()
+        self._room_at.clear()
+        for key in self._counts:
+            self._counts[key] = 0
+        for slot in self.schedule.slots:
+            if slot.defense is not None:
+                self._register(slot.defense, slot)
+        self._changed()
+
+    def detach(self) -> None:
+        self.schedule.unsubscribe(self._on_schedule_event)
+
+    # ---------- aktualizacje ----------
+
+    def _on_schedule_event(self, event: str, defense: Defense, slot: Optional[ScheduleSlot]) -> None:
+        self._withdraw(defense)
+        if slot is not None and event != "remove":
+            self._register(defense, slot)
+        self._changed()
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def _register(self, defense: Defense, slot: ScheduleSlot) -> None:
+        if defense.time_slot is None or defense.room is None:
+            return
+        # komisja czytana na żywo – committee_ids() pamięta promotora/recenzenta z pierwszego internowania
+        members: Dict[int, Person] = {}
+        for p in defense.get_committee():
+            members.setdefault(self._ids.person_id(p), p)
+        if len(self._positions) != len(self.schedule.slots):
+            self._positions = {id(s): k for k, s in enumerate(self.schedule.slots)}
+        placement = _Placement(defense, slot, members, self._positions.get(id(slot), len(self._positions)))
+        self._placed[id(defense)] = placement
+
+        for pid in members:
+            bucket = self._person_at.setdefault((placement.time_slot, pid), [])
+            self._counts["person_clashes"] += len(bucket)
+            bucket.append(placement)
+        bucket = self._room_at.setdefault((placement.time_slot, placement.room), [])
+        self._counts["room_clashes"] += len(bucket)
+        bucket.append(placement)
+
+        for p in members.values():
+            if not p.is_available_at(placement.time_slot):
+                placement.unavailable.append(p)
+        self._counts["unavailable"] += len(placement.unavailable)
+        if defense.chairman is not None and Role.CHAIRMAN not in defense.chairman.roles:
+            placement.bad_chair = True
+            self._counts["chairman_role"] += 1
+
+    def _withdraw(self, defense: Defense) -> None:
+        placement = self._placed.pop(id(defense), None)
+        if placement is None:
+            return
+        for pid in placement.members:
+            self._counts["person_clashes"] -= self._drop((placement.time_slot, pid), placement, self._person_at)
+        self._counts["room_clashes"] -= self._drop((placement.time_slot, placement.room), placement, self._room_at)
+        self._counts["unavailable"] -= len(placement.unavailable)
+        if placement.bad_chair:
+            self._counts["chairman_role"] -= 1
+
+    @staticmethod
+    def _drop(key, placement: _Placement, buckets: dict) -> int:
+        """Remove `placement` from a bucket; returns the number of pairs it was part of."""
+        bucket = buckets[key]
+        bucket.remove(placement)
+        if not bucket:
+            del buckets[key]
+        return len(bucket)
+
+    @staticmethod
+    def _pairs(bucket: List[_Placement]):
+        if len(bucket) < 2:
+            return
+        ordered = sorted(bucket, key=lambda p: p.position)
+        for i, a in enumerate(ordered):
+            for b in ordered[i + 1:]:
+                yield a, b
@@ -1,7 +1,11 @@
+import heapq
 import re
-from typing import List, Dict
+from collections import defaultdict
+from typing import List, Dict, Set, Tuple
 from src.models.defense import Defense
+from src.models.person import Person
 from src.models.role import Role
+from src.algorithm.instance import CompiledInstance
 
 
 class Validator:
@@ -34,39 +38,62 @@ class Validator:
         Sprawdza:
         - ta sama osoba (w dowolnej roli, w tym chairman) jednocześnie w 2 obronach,
         - podwójna rezerwacja sali.
-        Porównujemy osoby po emailu (obiekty Person mogą być niehashowalne).
-        """
-        conflicts: List[str] = []
-
-        for i, d1 in enumerate(defenses):
-            if not d1.is_scheduled():
-                continue
+        Osoby i sale porównujemy po gęstych id z CompiledInstance (email / wartość sali).
 
-            for d2 in defenses[i + 1:]:
-                if not d2.is_scheduled():
-                    continue
-
-                if not d1.time_slot.overlaps_with(d2.time_slot):
-                    continue
-
-                # mapy email -> Person (dla czytelnych komunikatów)
-                comm1: Dict[str, object] = {getattr(p, "email", str(id(p))): p for p in d1.get_committee()}
-                comm2: Dict[str, object] = {getattr(p, "email", str(id(p))): p for p in d2.get_committee()}
-
-                common_emails = set(comm1.keys()) & set(comm2.keys())
-                for em in common_emails:
-                    person = comm1.get(em) or comm2.get(em)
-                    name = getattr(person, "name", em)
-                    conflicts.append(
-                        f"{name} booked twice: "
-                        f"'{d1.student_name}' and '{d2.student_name}' at {d1.time_slot}"
-                    )
+        Sweep-line po początkach obron: aktywne (jeszcze trwające) obrony trzymamy w zbiorach
+        per osoba i per sala, więc koszt to O((n + k) log n) zamiast porównywania wszystkich par.
+        Komunikaty i ich kolejność jak przy przeglądaniu par (i < j) w kolejności wejścia.
+        """
+        scheduled = [d for d in defenses if d.is_scheduled()]
+        ids = CompiledInstance(defenses=scheduled)
+        # id -> Person (pierwsze wystąpienie w komisji – dla czytelnych komunikatów)
+        committees: List[Dict[int, Person]] = []
+        for d in scheduled:
+            committee: Dict[int, Person] = {}
+            for pid, p in zip(ids.committee_ids(d), d.get_committee()):
+                committee.setdefault(pid, p)
+            committees.append(committee)
+        rooms = [ids.room_id(d.room) for d in scheduled]
+
+        # (i, j) -> [wspólne osoby, czy ta sama sala]
+        clashes: Dict[Tuple[int, int], list] = {}
+        active_by_person: Dict[int, Set[int]] = defaultdict(set)
+        active_by_room: Dict[int, Set[int]] = defaultdict(set)
+        ending: List[Tuple[object, int]] = []  # kopiec (koniec, indeks) aktywnych obron
+
+        order = sorted(range(len(scheduled)), key=lambda k: scheduled[k].time_slot.start)
+        for j in order:
+            start = scheduled[j].time_slot.start
+            while ending and ending[0][0] <= start:
+                _, k = heapq.heappop(ending)
+                for pid in committees[k]:
+                    active_by_person[pid].discard(k)
+                active_by_room[rooms[k]].discard(k)
+
+            for pid in committees[j]:
+                for k in active_by_person[pid]:
+                    clashes.setdefault((min(j, k), max(j, k)), [set(), False])[0].add(pid)
+                active_by_person[pid].add(j)
+            for k in active_by_room[rooms[j]]:
+                clashes.setdefault((min(j, k), max(j, k)), [set(), False])[1] = True
+            active_by_room[rooms[j]].add(j)
+            heapq.heappush(ending, (scheduled[j].time_slot.end, j))
 
-                if d1.room == d2.room:
+        conflicts: List[str] = []
+        for (i, j) in sorted(clashes):
+            d1, d2 = scheduled[i], scheduled[j]
+            common, same_room = clashes[(i, j)]
+            for pid, person in committees[i].items():
+                if pid in common:
                     conflicts.append(
-                        f"Room {d1.room.name} double-booked: "
+                        f"{person.name} booked twice: "
                         f"'{d1.student_name}' and '{d2.student_name}' at {d1.time_slot}"
                     )
+            if same_room:
+                conflicts.append(
+                    f"Room {d1.room.name} double-booked: "
+                    f"'{d1.student_name}' and '{d2.student_name}' at {d1.time_slot}"
+                )
 
         return conflicts
 
@@ -78,12 +105,11 @@ class Validator:
             if not d.is_scheduled():
                 continue
             for p in d.get_committee():
-                for unav in getattr(p, "unavailable_slots", []) or []:
-                    if unav.overlaps_with(d.time_slot):
-                        issues.append(
-                            f"{p.name} is marked unavailable for {d.student_name}'s defense at {d.time_slot}"
-                        )
-                        break
+                # unavailable_slots to posortowana IntervalList – wyszukiwanie binarne
+                if not p.is_available_at(d.time_slot):
+                    issues.append(
+                        f"{p.name} is marked unavailable for {d.student_name}'s defense at {d.time_slot}"
+                    )
         return issues
 
     # ---------- poprawność roli przewodniczącego ----------
@@ -39,6 +39,16 @@ def test_time_slot_overlap():
     ts3 = TimeSlot(start=now + timedelta(hours=2), end=now + timedelta(hours=3))
     assert ts1.overlaps_with(ts3) is False
 
+def test_time_slot_and_room_are_frozen_and_hashable():
+    now = datetime.now()
+    a = TimeSlot(now, now + timedelta(minutes=30))
+    b = TimeSlot(now, now + timedelta(minutes=30))
+    assert a == b and len({a, b}) == 1
+    assert len({Room("Room A", "001"), Room("Room A", "001")}) == 1
+    with pytest.raises(AttributeError):
+        a.start = now + timedelta(minutes=5)
+    assert not hasattr(a, "__dict__")
+
 def test_person_availability_simple():
     p = Person("Bob", "bob@example.com", roles=[Role.SUPERVISOR])
     now = datetime.now()
@@ -48,6 +58,21 @@ def test_person_availability_simple():
     assert p.is_available_at(slot) is False
     assert p.is_available_at(other) is True
 
+def test_unavailability_is_sorted_and_merged():
+    base = datetime(2025, 6, 20, 9, 0)
+    h = lambda a, b: TimeSlot(base + timedelta(hours=a), base + timedelta(hours=b))
+    person = Person("Dr. X", "x@example.com", unavailable_slots=[h(5, 6), h(0, 1), h(0.5, 2), h(2, 3)])
+    assert list(person.unavailable_slots) == [h(0, 3), h(5, 6)]
+
+    person.unavailable_slots.append(h(4, 5))
+    assert list(person.unavailable_slots) == [h(0, 3), h(4, 6)]
+    assert not person.is_available_at(h(2.5, 3.5))
+    assert person.is_available_at(h(3, 4))
+    assert not person.is_available_at(h(5.5, 7))
+
+    del person.unavailable_slots[0]
+    assert person.is_available_at(h(1, 2))
+
 def test_schedule_slot_free_status():
     slot = ScheduleSlot(time_slot=TimeSlot(datetime.now(), datetime.now() + timedelta(hours=1)),
                         room=Room("Sala X", "X1", 20))
@@ -98,6 +123,87 @@ def test_create_empty_schedule_slots_match_rooms_times():
 
     assert len(schedule.slots) == 4  # 2 hours × 2 rooms
 
+def test_time_model_uses_minute_offsets_and_slot_indices():
+    from src.algorithm.time_model import TimeModel
+    day = datetime.today().replace(second=0, microsecond=0)
+    params = SessionParameters(
+        session_date=day.date(), start_time="09:00", end_time="12:00", defense_duration=30,
+        breaks=[TimeSlot(day.replace(hour=10, minute=0), day.replace(hour=10, minute=30))]
+    )
+    model = TimeModel(params)
+
+    assert model.slot_starts == [0, 30, 90, 120, 150]
+    assert model.index_of(model.time_slots[2]) == 2
+    assert model.to_minutes(day.replace(hour=10, minute=45)) == 105
+    # 10:15-11:05 zahacza o sloty 10:30 i 11:00 (indeksy 2 i 3)
+    mask = model.blocked_mask([TimeSlot(day.replace(hour=10, minute=15), day.replace(hour=11, minute=5))])
+    assert mask == (1 << 2) | (1 << 3)
+
+
+def test_slot_grid_is_shared_and_indexes_schedule_slots(monkeypatch):
+    from src.algorithm import BacktrackingScheduler
+    from src.algorithm import time_model as tm
+    from src.algorithm.slot_grid import slot_grid_for
+    day = datetime(2031, 1, 7)   # data spoza innych testów – siatka jeszcze nie w cache
+    rooms = [Room("A", "1", 20), Room("B", "2", 20), Room("C", "3", 20)]
+    params = SessionParameters(session_date=day.date(), start_time="09:00", end_time="12:00", defense_duration=30,
+                               room_count=2, breaks=[TimeSlot(day.replace(hour=10), day.replace(hour=10, minute=30))])
+    built = []
+    original = tm.TimeModel.__init__
+    monkeypatch.setattr(tm.TimeModel, "__init__", lambda self, p: (built.append(p), original(self, p))[1])
+
+    a = SchedulingAlgorithm(parameters=params, rooms=rooms, available_chairmen=[])
+    b = BacktrackingScheduler(parameters=params, rooms=list(rooms), available_chairmen=[])
+    assert a.grid is b.grid and a.time_model is b.time_model and len(built) == 1
+    grid = a.grid
+    assert grid.rooms == tuple(rooms[:2]) and grid.starts == (0, 30, 90, 120, 150) and len(grid) == 10
+
+    # komórka siatki == pozycja slotu w create_empty_schedule()
+    schedule = a.create_empty_schedule()
+    for cell, slot in enumerate(schedule.slots):
+        assert grid.cell(slot.time_index, slot.room.number) == cell
+        assert grid.cell_of(slot.time_slot, slot.room.number) == cell
+    assert grid.cell_at(day.replace(hour=10), "1") is None       # przerwa
+    assert grid.cell(0, "3") is None                              # sala poza room_count
+    assert schedule.slots[0].time_slot is b.create_empty_schedule().slots[0].time_slot
+
+    # backtracking (z baseline'ami) nie kompiluje siatki ponownie; inne parametry -> nowa siatka
+    b.schedule([])
+    assert len(built) == 1
+    params.defense_duration = 45
+    assert slot_grid_for(params, rooms) is not grid and len(built) == 2
+
+
+def test_can_schedule_defense_reports_integer_path_conflicts():
+    day = datetime.today().replace(second=0, microsecond=0)
+    params = SessionParameters(session_date=day.date(), start_time="09:00", end_time="10:00", defense_duration=30)
+    sup = Person("Dr. S", "s@example.com", roles={Role.SUPERVISOR})
+    rev = Person("Dr. R", "r@example.com", roles={Role.REVIEWER},
+                 unavailable_slots=[TimeSlot(day.replace(hour=9, minute=0), day.replace(hour=9, minute=10))])
+    chair = Person("Dr. C", "c@example.com", roles={Role.CHAIRMAN})
+    algo = SchedulingAlgorithm(parameters=params, rooms=[Room("A", "1")], available_chairmen=[chair])
+    schedule = algo.create_empty_schedule()
+    defense = Defense("Student", "Thesis", supervisor=sup, reviewer=rev)
+
+    ok, conflicts = algo.can_schedule_defense(defense, schedule.slots[0], schedule)
+    assert not ok and conflicts[0].message.startswith("Dr. R is not available")
+    assert algo.fit_defense(defense, schedule.slots[0], schedule) is None
+    assert algo.fit_defense(defense, schedule.slots[1], schedule) is chair
+
+def test_compiled_instance_interns_persons_by_email():
+    from src.algorithm.instance import CompiledInstance
+    sup = Person("Dr. S", "s@example.com", roles={Role.SUPERVISOR})
+    rev = Person("Dr. R", "r@example.com", roles={Role.REVIEWER})
+    same_sup = Person("Dr. S (copy)", "s@example.com", roles={Role.CHAIRMAN})
+    d1 = Defense("A", "Thesis A", supervisor=sup, reviewer=rev)
+    d2 = Defense("B", "Thesis B", supervisor=rev, reviewer=sup, chairman=same_sup)
+
+    inst = CompiledInstance(defenses=[d1, d2])
+    assert inst.committee_ids(d1) == [0, 1]
+    assert inst.committee_ids(d2) == [1, 0, 0]
+    assert inst.defense_id(d2) == 1 and inst.defense_id(d1) == 0
+    assert inst.room_id(Room("A", "1")) == inst.room_id(Room("A", "1"))
+
 # ---------- CONFLICTS ----------
 
 def test_conflict_checker_person_unavailable():
@@ -121,3 +227,114 @@ def test_conflict_checker_person_overlapping_defense():
 
     conflict = ConflictChecker.check_person_availability(person, slot2, [scheduled])
     assert conflict is not None
+
+# ---------- WARM START ----------
+
+def _load_sample():
+    import os
+    from src.utils.project_io import load_project
+    return load_project(os.path.join(os.path.dirname(__file__), "..", "data", "examples", "sample_project.json"))
+
+def _placements(schedule):
+    return sorted((s.time_slot.start, s.room.number, s.defense.student_name) for s in schedule.slots if s.defense)
+
+def test_greedy_warm_start_keeps_feasible_assignments():
+    from src.algorithm import SimpleGreedyScheduler
+    persons, defenses, rooms, params, _ = _load_sample()
+    algo = SimpleGreedyScheduler(parameters=params, rooms=rooms,
+                                 available_chairmen=[p for p in persons if p.can_be_chairman()])
+    previous, _ = algo.schedule(defenses)
+    # usuń jeden przydział – scheduler ma dołożyć tylko tę obronę
+    previous.remove_defense(defenses[-1])
+    before = _placements(previous)
+
+    schedule, conflicts = algo.schedule(defenses, initial=previous)
+    assert set(before) <= set(_placements(schedule))
+    assert defenses[-1].is_scheduled()
+
+def test_warm_start_drops_conflicting_assignments():
+    from src.algorithm import SimpleGreedyScheduler
+    from src.utils.validators import Validator
+    # zapisany przykład zawiera podwójną rezerwację – seed jej nie przenosi
+    persons, defenses, rooms, params, loaded = _load_sample()
+    algo = SimpleGreedyScheduler(parameters=params, rooms=rooms,
+                                 available_chairmen=[p for p in persons if p.can_be_chairman()])
+    seeded = algo.seed_schedule(defenses, loaded)
+    assert 0 < len(seeded.get_scheduled_defenses()) < len(loaded.get_scheduled_defenses())
+    assert not any("booked twice" in m for m in Validator.validate_schedule(seeded.get_scheduled_defenses()))
+
+def test_backtracking_complete_incumbent_skips_search(monkeypatch):
+    from src.algorithm import BacktrackingScheduler, SimpleGreedyScheduler
+    persons, defenses, rooms, params, _ = _load_sample()
+    chairmen = [p for p in persons if p.can_be_chairman()]
+    previous, conflicts = SimpleGreedyScheduler(parameters=params, rooms=rooms,
+                                                available_chairmen=chairmen).schedule(defenses)
+    assert not conflicts
+    expected = _placements(previous)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("baseline should not run")
+    monkeypatch.setattr(SimpleGreedyScheduler, "schedule", _fail)
+
+    algo = BacktrackingScheduler(parameters=params, rooms=rooms, available_chairmen=chairmen)
+    schedule, conflicts = algo.schedule(defenses, initial=previous)
+    assert conflicts == []
+    assert _placements(schedule) == expected
+
+def test_backtracking_warm_start_scores_at_least_as_high_as_cold_run():
+    import os
+    from src.algorithm import BacktrackingScheduler, SimpleGreedyScheduler
+    from src.utils.project_io import load_project
+    persons, defenses, rooms, params, _ = load_project(
+        os.path.join(os.path.dirname(__file__), "..", "data", "examples", "sample_project_complex.json"))
+    chairmen = [p for p in persons if p.can_be_chairman()]
+
+    def make(algorithm):
+        return algorithm(parameters=params, rooms=rooms, available_chairmen=chairmen)
+
+    # niepełny incumbent z zachłannego – warm-start nie może utknąć na jego wyniku
+    previous, _ = make(SimpleGreedyScheduler).schedule(defenses)
+    incumbent = len(previous.get_scheduled_defenses())
+    assert incumbent < len(defenses)
+    warm, _ = make(BacktrackingScheduler).schedule(defenses, initial=previous)
+    cold, _ = make(BacktrackingScheduler).schedule(defenses)
+    assert len(warm.get_scheduled_defenses()) >= len(cold.get_scheduled_defenses()) > incumbent
+
+# ---------- BACKGROUND GENERATION ----------
+
+def _drain(worker):
+    worker.join(timeout=30)
+    messages = []
+    while not worker.messages.empty():
+        messages.append(worker.messages.get_nowait())
+    return messages
+
+def test_generation_worker_posts_progress_and_restores_defenses_on_cancel():
+    from src.algorithm import BacktrackingScheduler, SimpleGreedyScheduler
+    from src.gui.generation import GenerationWorker
+    persons, defenses, rooms, params, _ = _load_sample()
+    chairmen = [p for p in persons if p.can_be_chairman()]
+
+    worker = GenerationWorker(None, SimpleGreedyScheduler(parameters=params, rooms=rooms, available_chairmen=chairmen),
+                              persons, defenses)
+    worker.start()
+    messages = _drain(worker)
+    kinds = [kind for kind, _ in messages]
+    assert kinds[-1] == "done" and kinds.count("progress") == len(defenses)
+    schedule, conflicts, _key, cache_hit = messages[-1][1]
+    assert not cache_hit and len(schedule.get_scheduled_defenses()) + len(conflicts) == len(defenses)
+
+    # przerwanie po pierwszym raporcie postępu: wątek kończy się, obrony wracają do stanu sprzed startu
+    before = [(d.time_slot, d.room, d.chairman) for d in defenses]
+    worker = GenerationWorker(None, BacktrackingScheduler(parameters=params, rooms=rooms, available_chairmen=chairmen),
+                              persons, defenses)
+    report = worker.scheduler.progress_callback
+    def cancel_after_first(placed, total):
+        report(placed, total)
+        worker.cancel()
+    worker.scheduler.progress_callback = cancel_after_first
+    worker.start()
+    messages = _drain(worker)
+    assert not worker.running
+    assert messages[0][0] == "progress" and messages[-1] == ("cancelled", None)
+    assert [(d.time_slot, d.room, d.chairman) for d in defenses] == before
@@ -0,0 +1,102 @@
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+import pytest
+
+from src.service import JobManager, SchedulingHTTPServer
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "examples", "sample_project.json")
+
+
+@pytest.fixture
+def server():
+    srv = SchedulingHTTPServer(("127.0.0.1", 0), JobManager(workers=1, queue_size=0), quiet=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _request(method, url, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _sample_project():
+    with open(SAMPLE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_job_roundtrip(server):
+    status, job = _request("POST", f"{server}/jobs?algorithm=priority", _sample_project())
+    assert status == 202
+    assert job["status"] in ("queued", "running")
+
+    deadline = time.time() + 60
+    while True:
+        status, body = _request("GET", f"{server}/jobs/{job['id']}/result")
+        if status != 202 or time.time() > deadline:
+            break
+        time.sleep(0.1)
+
+    assert status == 200
+    assert body["progress"]["placed"] == body["result"]["scheduled"]
+    scheduled = [d for d in body["result"]["project"]["defenses"] if d["scheduled"]]
+    assert len(scheduled) == body["result"]["scheduled"] > 0
+
+
+def test_admission_control_rejects_beyond_capacity(server):
+    status, _ = _request("POST", f"{server}/jobs?algorithm=backtracking", _sample_project())
+    assert status == 202
+    status, body = _request("POST", f"{server}/jobs", _sample_project())
+    assert status == 503
+    assert "full" in body["error"]
+
+
+def test_invalid_project_is_rejected(server):
+    status, body = _request("POST", f"{server}/jobs", {"version": 1})
+    assert status == 400
+    for payload in ([_sample_project()], "project", 42):
+        status, body = _request("POST", f"{server}/jobs", payload)
+        assert status == 400 and "JSON object" in body["error"]
+    status, _ = _request("GET", f"{server}/jobs/unknown")
+    assert status == 404
+
+    conn = http.client.HTTPConnection(urlsplit(server).netloc, timeout=30)
+    conn.putrequest("POST", "/jobs")
+    conn.putheader("Content-Length", "abc")
+    conn.endheaders()
+    resp = conn.getresponse()
+    assert resp.status == 400 and json.loads(resp.read())["error"] == "Invalid Content-Length"
+    conn.close()
+
+
+def test_repeated_job_is_served_from_cache(tmp_path):
+    jobs = JobManager(workers=1, queue_size=0, cache_dir=str(tmp_path))
+    try:
+        first = jobs.submit(_sample_project(), algorithm="simple")
+        deadline = time.time() + 60
+        while not jobs.get(first.id).is_finished() and time.time() < deadline:
+            time.sleep(0.05)
+        assert jobs.get(first.id).result["cache_hit"] is False
+
+        second = jobs.submit(_sample_project(), algorithm="simple")
+        assert second.status == "done"
+        assert second.cache_key == first.cache_key
+        assert second.result["cache_hit"] is True
+        assert second.result["project"]["defenses"] == jobs.get(first.id).result["project"]["defenses"]
+        assert second.result["conflicts"] == jobs.get(first.id).result["conflicts"]
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,723 @@
+import os
+import time
+
+from src.algorithm import PriorityGreedyScheduler, BacktrackingScheduler
+from src.utils.project_io import load_project
+from src.utils.result_cache import ScheduleCache, run_cached, scheduler_cache_key
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "examples", "sample_project.json")
+
+
+def _scheduler(cls, persons, rooms, params):
+    return cls(parameters=params, rooms=rooms, available_chairmen=[p for p in persons if p.can_be_chairman()])
+
+# ---------- RESULT CACHE ----------
+
+def test_cache_key_is_canonical():
+    persons, defenses, rooms, params, _ = load_project(SAMPLE)
+    algo = _scheduler(PriorityGreedyScheduler, persons, rooms, params)
+    key = scheduler_cache_key(algo, persons, defenses)
+
+    # kolejność osób i ich niedostępności nie zmienia wyniku -> ten sam klucz
+    for p in persons:
+        p.unavailable_slots = list(reversed(p.unavailable_slots))
+    assert scheduler_cache_key(algo, list(reversed(persons)), defenses) == key
+
+    # inne dane / inny algorytm / inne ustawienia -> inny klucz
+    assert scheduler_cache_key(algo, persons, defenses[1:]) != key
+    bt = _scheduler(BacktrackingScheduler, persons, rooms, params)
+    bt_key = scheduler_cache_key(bt, persons, defenses)
+    assert bt_key != key
+    bt.TIME_LIMIT_SEC = 5
+    assert scheduler_cache_key(bt, persons, defenses) != bt_key
+
+
+def test_run_cached_hit_reproduces_schedule(tmp_path):
+    cache = ScheduleCache(str(tmp_path))
+
+    persons, defenses, rooms, params, _ = load_project(SAMPLE)
+    schedule, conflicts, key, hit = run_cached(cache, _scheduler(PriorityGreedyScheduler, persons, rooms, params),
+                                               persons, defenses)
+    assert hit is False
+    expected = [(str(s.time_slot), s.room.number, s.defense.student_name, s.defense.chairman.email)
+                for s in schedule.slots if s.defense]
+
+    persons, defenses, rooms, params, _ = load_project(SAMPLE)
+    schedule2, conflicts2, key2, hit2 = run_cached(cache, _scheduler(PriorityGreedyScheduler, persons, rooms, params),
+                                                   persons, defenses)
+    assert hit2 is True and key2 == key
+    assert [(str(s.time_slot), s.room.number, s.defense.student_name, s.defense.chairman.email)
+            for s in schedule2.slots if s.defense] == expected
+    assert [c.message for c in conflicts2] == [c.message for c in conflicts]
+    assert all(c.defense in defenses for c in conflicts2)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    persons, defenses, rooms, params, _ = load_project(SAMPLE)
+    algo = _scheduler(PriorityGreedyScheduler, persons, rooms, params)
+    schedule, conflicts = algo.schedule(defenses)
+
+    cache = ScheduleCache(str(tmp_path))
+    cache.put("a" * 64, [None] * len(defenses), conflicts, defenses)
+    entry_size = cache.size_bytes()
+    cache.max_bytes = 2 * entry_size
+    cache.put("b" * 64, [None] * len(defenses), conflicts, defenses)
+
+    old = time.time() - 100
+    os.utime(os.path.join(str(tmp_path), "a" * 64 + ".json"), (old, old))
+    os.utime(os.path.join(str(tmp_path), "b" * 64 + ".json"), (old - 100, old - 100))
+    assert cache.get("a" * 64) is not None  # odświeża "a"
+
+    cache.put("c" * 64, [None] * len(defenses), conflicts, defenses)
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.get("c" * 64) is not None
+
+# ---------- VALIDATOR ----------
+
+def _pairwise_time_conflicts(defenses):
+    """Referencyjna wersja O(n²) – porównanie wszystkich par."""
+    out = []
+    scheduled = [d for d in defenses if d.is_scheduled()]
+    for i, d1 in enumerate(scheduled):
+        for d2 in scheduled[i + 1:]:
+            if not d1.time_slot.overlaps_with(d2.time_slot):
+                continue
+            seen = set()
+            emails2 = {p.email for p in d2.get_committee()}
+            for p in d1.get_committee():
+                if p.email in emails2 and p.email not in seen:
+                    seen.add(p.email)
+                    out.append(f"{p.name} booked twice: '{d1.student_name}' and '{d2.student_name}' at {d1.time_slot}")
+            if d1.room == d2.room:
+                out.append(f"Room {d1.room.name} double-booked: '{d1.student_name}' and '{d2.student_name}' at {d1.time_slot}")
+    return out
+
+
+def test_sweep_line_time_conflicts_match_pairwise_check():
+    import random
+    from datetime import datetime, timedelta
+    from src.models import Person, Defense, Room, TimeSlot, Role
+    from src.utils.validators import Validator
+
+    rng = random.Random(7)
+    people = [Person(f"P{i}", f"p{i}@example.com", roles={Role.CHAIRMAN}) for i in range(8)]
+    rooms = [Room("A", "1"), Room("B", "2")]
+    day = datetime(2025, 6, 20, 9, 0)
+    defenses = []
+    for i in range(60):
+        sup, rev, chair = rng.sample(people, 3)
+        start = day + timedelta(minutes=15 * rng.randrange(20))
+        d = Defense(f"S{i}", "T", sup, rev)
+        if rng.random() < 0.9:
+            d.time_slot = TimeSlot(start, start + timedelta(minutes=rng.choice([15, 30, 45])))
+            d.room = rng.choice(rooms)
+            d.chairman = rng.choice([chair, sup])
+        defenses.append(d)
+
+    expected = _pairwise_time_conflicts(defenses)
+    assert expected
+    assert Validator.check_time_conflicts(defenses) == expected
+
+
+# ---------- LIVE VALIDATION ----------
+
+def test_validation_engine_tracks_mutations_incrementally():
+    import random
+    from src.models import Person, Role
+    from src.utils.validation_engine import ValidationEngine
+    from src.utils.validators import Validator
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    changes = []
+    engine = ValidationEngine(schedule, on_change=lambda e: changes.append(e.total))
+
+    def check():
+        expected = Validator.validate_schedule(schedule.get_scheduled_defenses())
+        assert engine.messages() == expected
+        assert engine.total == len(expected)
+
+    check()
+    assert engine.total > 0  # przykładowy projekt zawiera kolizje
+
+    rng = random.Random(3)
+    outsider = Person("No Chair", "nochair@example.com", roles={Role.SUPERVISOR})
+    for _ in range(200):
+        placed = schedule.get_scheduled_defenses()
+        op = rng.randrange(4)
+        if op == 0 and placed:
+            schedule.remove_defense(rng.choice(placed))
+        elif op == 1 and placed and schedule.get_free_slots():
+            schedule.move_defense(rng.choice(placed), rng.choice(schedule.get_free_slots()))
+        elif op == 2 and placed:
+            schedule.set_chairman(rng.choice(placed), rng.choice(persons + [outsider]))
+        else:
+            unplaced = [d for d in defenses if not d.is_scheduled()]
+            if unplaced and schedule.get_free_slots():
+                schedule.add_defense(rng.choice(unplaced), rng.choice(schedule.get_free_slots()), rng.choice(persons))
+        check()
+
+    assert len(changes) > 100
+    engine.detach()
+    version, seen = schedule.version, len(changes)
+    schedule.remove_defense(schedule.get_scheduled_defenses()[0])
+    assert schedule.version == version + 1 and len(changes) == seen
+
+
+def test_validation_engine_refresh_reads_replaced_committee():
+    from src.models import Role
+    from src.utils.validation_engine import ValidationEngine
+    from src.utils.validators import Validator
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    for d in schedule.get_scheduled_defenses():
+        schedule.remove_defense(d)
+    a, b = defenses[0], next(d for d in defenses[1:] if d.supervisor is not defenses[0].supervisor
+                              and d.reviewer is not defenses[0].supervisor)
+    time_slot = schedule.slots[0].time_slot
+    first, second = [s for s in schedule.slots if s.time_slot == time_slot][:2]
+    chairs = [p for p in persons if Role.CHAIRMAN in p.roles and p not in a.get_committee() + b.get_committee()]
+    schedule.add_defense(a, first, chairs[0])
+    schedule.add_defense(b, second, chairs[1])
+    engine = ValidationEngine(schedule)
+
+    def check(expected_clashes):
+        expected = Validator.validate_schedule(schedule.get_scheduled_defenses())
+        assert engine.messages() == expected == ValidationEngine(schedule).messages()
+        assert engine.counts["person_clashes"] == expected_clashes
+
+    check(0)
+    # edycja w miejscu (jak DefenseMerger / okno edycji obrony) – bez zdarzenia harmonogramu
+    old_supervisor, b.supervisor = b.supervisor, a.supervisor
+    engine.refresh(b)
+    check(1)
+    b.supervisor = old_supervisor
+    engine.refresh(b)
+    check(0)
+    b.reviewer = a.supervisor
+    engine.refresh(b)
+    check(1)
+    engine.detach()
+
+
+# ---------- PROJECT FILE FORMAT ----------
+
+def test_project_v2_roundtrip_matches_v1(tmp_path):
+    import json
+    from src.utils.project_io import save_project
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)  # przykładowy plik jest w formacie 1
+
+    def snapshot(persons, defenses):
+        return ([(p.email, sorted(r.value for r in p.roles), [(s.start, s.end) for s in p.unavailable_slots])
+                 for p in persons],
+                [(d.student_name, d.supervisor.email, d.reviewer.email, d.time_slot,
+                  d.room.number if d.room else None, d.chairman.email if d.chairman else None)
+                 for d in defenses])
+
+    v1, v2 = tmp_path / "v1.json", tmp_path / "v2.json"
+    save_project(str(v1), persons, defenses, rooms, params, version=1)
+    save_project(str(v2), persons, defenses, rooms, params)
+    assert json.loads(v2.read_text(encoding="utf-8"))["version"] == 2
+    assert v2.stat().st_size < v1.stat().st_size
+
+    p1, d1, _, _, s1 = load_project(str(v1))
+    p2, d2, _, params2, s2 = load_project(str(v2))
+    assert snapshot(p2, d2) == snapshot(p1, d1) == snapshot(persons, defenses)
+    assert len(s2.get_scheduled_defenses()) == len(s1.get_scheduled_defenses())
+
+    # maski niedostępności z pliku są gotowe od razu i zgodne z przeliczonymi
+    from src.algorithm.time_model import TimeModel
+    model = TimeModel(params2)
+    for p in p2:
+        cached = p.unavailable_slots.cached_mask(model.key)
+        assert cached is not None
+        assert cached == TimeModel(params2).blocked_mask(list(p.unavailable_slots))
+
+    # przydział do sali spoza projektu to błąd wczytywania, a nie cicho zgubiona obrona
+    import pytest
+    from src.utils.project_io import project_from_dict
+    data = json.loads(v1.read_text(encoding="utf-8"))
+    next(d for d in data["defenses"] if d.get("scheduled"))["scheduled"]["room_number"] = "nope"
+    with pytest.raises(ValueError, match="unknown room"):
+        project_from_dict(data)
+    data = json.loads(v2.read_text(encoding="utf-8"))
+    next(d for d in data["defenses"] if d[4])[4][2] = len(rooms)
+    with pytest.raises(ValueError, match="unknown room"):
+        project_from_dict(data)
+    # zapis odrzuca to samo (np. sala usunięta w Manage Rooms, a obrony wciąż w niej stoją)
+    used = next(d.room for d in defenses if d.room is not None)
+    for version in (1, 2):
+        with pytest.raises(ValueError, match="unknown room"):
+            save_project(str(tmp_path / "gone.json"), persons, defenses, [r for r in rooms if r != used], params,
+                         version=version)
+
+
+def test_project_store_persists_incremental_edits(tmp_path):
+    from src.utils.project_store import ProjectStore
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    path = str(tmp_path / "project.db")
+    with ProjectStore(path) as store:
+        store.save_project(persons, defenses, rooms, params)
+        store.track(schedule)
+
+        # zmiany harmonogramu i dostępności trafiają do bazy bez pełnego zapisu
+        placed = schedule.get_scheduled_defenses()
+        schedule.move_defense(placed[0], schedule.get_free_slots()[0])
+        schedule.remove_defense(placed[1])
+        person = placed[2].supervisor
+        person.unavailable_slots = list(person.unavailable_slots) + [placed[2].time_slot]
+        store.save_person(person)
+
+    with ProjectStore(path) as store:
+        # odczyt leniwy – jedna osoba i jej obrony bez wczytywania całego projektu
+        lazy = store.person(person.email)
+        assert list(lazy.unavailable_slots) == list(person.unavailable_slots)
+        assert {d.student_name for d in store.defenses_of(person.email)} == {
+            d.student_name for d in defenses if person in d.get_committee()}
+        assert [d.student_name for d in store.assignments_at(placed[0].time_slot.start)] == [
+            d.student_name for d in defenses if d.time_slot and d.time_slot.start == placed[0].time_slot.start]
+
+        p2, d2, r2, params2, s2 = store.load_project()
+    assert [(d.student_name, d.time_slot, d.room, d.chairman.email if d.chairman else None) for d in d2] == \
+           [(d.student_name, d.time_slot, d.room, d.chairman.email if d.chairman else None) for d in defenses]
+    assert len(s2.get_scheduled_defenses()) == len(schedule.get_scheduled_defenses())
+    assert r2 == rooms and params2.session_date == params.session_date
+
+    # osierocony chairman_id (baza zapisana bez kluczy obcych) – brak przewodniczącego zamiast wyjątku
+    import sqlite3
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE assignments SET chairman_id = 999999")
+    with ProjectStore(path) as store:
+        assert all(d.chairman is None for d in store.assignments_at(placed[0].time_slot.start))
+
+    # przydział do sali, której nie ma w projekcie – błąd jak przy wczytywaniu JSON
+    import pytest
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE assignments SET room_number = 'nope'")
+    with ProjectStore(path) as store, pytest.raises(ValueError, match="unknown room 'nope'"):
+        store.load_project()
+
+
+# ---------- AUTOSAVE JOURNAL ----------
+
+def test_change_journal_replays_edits_after_crash(tmp_path):
+    from datetime import timedelta
+    from src.models import Person, Defense, Role, TimeSlot
+    from src.utils.change_journal import ChangeJournal
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    journal = ChangeJournal(str(tmp_path), state=lambda: (persons, defenses, rooms, params), compact_every=7)
+    journal.begin(persons, defenses, rooms, params)
+    journal.track(schedule)
+
+    # edycje przekraczające próg -> kilka rotacji i migawek w tle po drodze
+    newcomer = Person("New Person", "new.person@uni.edu", roles={Role.CHAIRMAN})
+    persons.append(newcomer)
+    journal.save_person(newcomer)
+    defenses.append(Defense("New Student", "New Thesis", newcomer, persons[0]))
+    journal.save_defense(defenses[-1])
+    placed = schedule.get_scheduled_defenses()
+    for d in placed[:10]:
+        schedule.move_defense(d, schedule.get_free_slots()[0])
+    schedule.remove_defense(placed[10])
+    schedule.add_defense(defenses[-1], schedule.get_free_slots()[0], newcomer)
+    start = placed[11].time_slot.start
+    persons[1].unavailable_slots = list(persons[1].unavailable_slots) + [TimeSlot(start, start + timedelta(hours=1))]
+    journal.save_person(persons[1])
+    journal.wait()
+    # „awaria” – bez close(); nowa sesja odtwarza stan z migawki i dziennika
+    assert journal.has_changes()
+
+    recovered = ChangeJournal(str(tmp_path)).recover()
+    assert recovered is not None
+    p2, d2, r2, params2, s2 = recovered
+
+    def snapshot(persons, defenses):
+        return ([(p.email, p.name, sorted(r.value for r in p.roles), list(p.unavailable_slots)) for p in persons],
+                [(d.student_name, d.supervisor.email, d.reviewer.email, d.time_slot,
+                  d.room.number if d.room else None, d.chairman.email if d.chairman else None) for d in defenses])
+
+    assert snapshot(p2, d2) == snapshot(persons, defenses)
+    assert r2 == rooms and params2.session_date == params.session_date
+    assert len(s2.get_scheduled_defenses()) == len(schedule.get_scheduled_defenses())
+
+    journal.close(discard=True)
+    assert not journal.has_changes()
+
+
+def test_change_journal_indexes_defenses_of_a_reopened_project(tmp_path):
+    from src.utils.change_journal import ChangeJournal
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    project = [persons, defenses]
+    journal = ChangeJournal(str(tmp_path), state=lambda: (project[0], project[1], rooms, params))
+    journal.begin(persons, defenses, rooms, params)
+    journal.track(schedule)
+    schedule.move_defense(schedule.get_scheduled_defenses()[0], schedule.get_free_slots()[0])
+
+    # ponowne otwarcie: tyle samo obron, inna lista (i inna kolejność tych samych obiektów)
+    journal.untrack()
+    reopened = list(reversed(defenses))
+    project[1] = reopened
+    journal.begin(persons, reopened, rooms, params)
+    journal.track(schedule)
+    first = reopened[0]
+    if first.time_slot is not None:
+        schedule.remove_defense(first)
+    schedule.add_defense(first, schedule.get_free_slots()[0], first.chairman or persons[0])
+    journal.wait()
+
+    p2, d2, r2, params2, s2 = ChangeJournal(str(tmp_path)).recover()
+    assert [(d.student_name, d.time_slot, d.room.number if d.room else None) for d in d2] == \
+           [(d.student_name, d.time_slot, d.room.number if d.room else None) for d in reopened]
+    journal.close(discard=True)
+
+
+# ---------- CSV IMPORT ----------
+
+def test_csv_import_streams_chunks_and_reports_row_errors(tmp_path):
+    import csv
+    from src.models import Role
+    from src.utils.csv_handler import CSVHandler, ImportReport
+
+    path = tmp_path / "persons.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["name", "email", "roles", "department"])   # dodatkowe kolumny są ignorowane
+        for i in range(25):
+            w.writerow([f"Person {i}", f"p{i}@uni.edu", "Supervisor; chairman", "CS"])
+        w.writerow(["Broken", "not-an-email", "reviewer", "CS"])
+        w.writerow(["Dean", "dean@uni.edu", "dean;reviewer", "CS"])
+
+    report = ImportReport("persons", str(path))
+    calls = []
+    chunks = list(CSVHandler.iter_persons(str(path), report, chunk_size=10,
+                                          progress=lambda rows, done, total: calls.append((rows, done, total))))
+    assert [len(c) for c in chunks] == [10, 10, 6]
+    assert chunks[0][0].roles == {Role.SUPERVISOR, Role.CHAIRMAN}
+    assert chunks[-1][-1].roles == {Role.REVIEWER}
+    assert chunks[0][0].roles is not chunks[0][1].roles
+
+    assert (report.rows_read, report.imported, report.skipped) == (27, 26, 1)
+    assert [(e.line, e.field) for e in report.errors] == [(27, "email")]
+    assert [(w.line, w.field, w.message) for w in report.warnings] == [(28, "roles", "Unknown role 'dean' ignored")]
+    assert calls[-1] == (27, path.stat().st_size, path.stat().st_size)
+    assert report.to_dict()["errors"][0]["line"] == 27
+
+    # brak wymaganej kolumny -> jeden błąd nagłówka, nic nie zaimportowano
+    bad = tmp_path / "defenses.csv"
+    bad.write_text("student_name,thesis_title,supervisor_email\nA,T,p0@uni.edu\n", encoding="utf-8")
+    report = ImportReport("defenses", str(bad))
+    assert CSVHandler.import_defenses(str(bad), chunks[0], report) == []
+    assert [(e.line, e.message) for e in report.errors] == [(1, "Missing column(s): reviewer_email")]
+
+
+def test_reimport_merges_by_email_and_student_thesis(tmp_path):
+    from src.models import Role
+    from src.utils.csv_handler import CSVHandler
+    from src.utils.merge import PersonMerger, DefenseMerger
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    n_persons, n_defenses = len(persons), len(defenses)
+    placed = schedule.get_scheduled_defenses()[0]
+    slot_before = placed.time_slot
+    unavailable_before = list(persons[0].unavailable_slots)
+
+    CSVHandler.export_persons(persons, str(tmp_path / "persons.csv"))
+    CSVHandler.export_defenses(defenses, str(tmp_path / "defenses.csv"))
+    # zmiana w pliku: inne imię (email wielkimi literami), inne role, jedna nowa osoba
+    lines = (tmp_path / "persons.csv").read_text(encoding="utf-8").splitlines()
+    first = lines[1].split(",")
+    lines[1] = ",".join(["Renamed", first[1].upper(), "reviewer"])
+    lines.append("Newcomer,newcomer@uni.edu,chairman")
+    (tmp_path / "persons.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    merger = PersonMerger(persons)
+    for chunk in CSVHandler.iter_persons(str(tmp_path / "persons.csv"), chunk_size=5):
+        merger.merge(chunk)
+    assert merger.result.to_dict() == {"created": 1, "updated": 1, "unchanged": n_persons - 1}
+    assert len(persons) == n_persons + 1
+    assert persons[0].name == "Renamed" and persons[0].roles == {Role.REVIEWER}
+    assert list(persons[0].unavailable_slots) == unavailable_before   # dostępność zostaje
+
+    # ponowny import obron – bez duplikatów, przydziały zachowane; email promotora inną wielkością liter
+    supervisor = defenses[0].supervisor
+    text = (tmp_path / "defenses.csv").read_text(encoding="utf-8")
+    (tmp_path / "defenses.csv").write_text(text.replace(supervisor.email, supervisor.email.capitalize()),
+                                           encoding="utf-8")
+    merger = DefenseMerger(defenses)
+    merger.merge(CSVHandler.import_defenses(str(tmp_path / "defenses.csv"), persons))
+    assert merger.result.to_dict() == {"created": 0, "updated": 0, "unchanged": n_defenses}
+    assert len(defenses) == n_defenses and placed.time_slot == slot_before
+
+
+# ---------- BULK AVAILABILITY ----------
+
+def test_bulk_availability_from_csv_and_ics_is_clipped_and_merged(tmp_path):
+    from datetime import datetime
+    from src.cli import main as cli_main
+    from src.models import IntervalList, TimeSlot
+    from src.utils.availability_import import import_unavailability
+
+    persons, defenses, rooms, params, _ = load_project(SAMPLE)   # sesja: czwartek 2025-08-28, 09:00-17:00
+    jan, anna = persons[0], persons[1]
+    anna_before = list(anna.unavailable_slots)
+    day = lambda h, m=0: datetime(2025, 8, 28, h, m)
+
+    csv_path = tmp_path / "availability.csv"
+    csv_path.write_text(
+        "email,start,end\n"
+        "JAN.KOWALSKI@uni.edu,2025-08-28 08:00,2025-08-28 09:30\n"    # przycięte do początku sesji
+        "jan.kowalski@uni.edu,2025-08-28 09:15,2025-08-28 10:00\n"    # scalone z poprzednim
+        "jan.kowalski@uni.edu,2025-08-29 10:00,2025-08-29 11:00\n"    # poza sesją
+        "ghost@uni.edu,2025-08-28 10:00,2025-08-28 11:00\n"
+        "anna.nowak@uni.edu,tomorrow,2025-08-28 11:00\n", encoding="utf-8")
+
+    ics_path = tmp_path / "anna.nowak@uni.edu.ics"
+    ics_path.write_text("\r\n".join([
+        "BEGIN:VCALENDAR", "VERSION:2.0",
+        "BEGIN:VEVENT", "SUMMARY:Weekly lecture with a very long title that the expo",
+        " rter folded", "DTSTART:20250605T100000", "DTEND:20250605T113000",
+        "RRULE:FREQ=WEEKLY;BYDAY=TH;UNTIL=20250930", "END:VEVENT",
+        "BEGIN:VEVENT", "DTSTART:20250605T150000", "DURATION:PT1H",
+        "RRULE:FREQ=WEEKLY", "EXDATE:20250828T150000", "END:VEVENT",
+        "BEGIN:VEVENT", "DTSTART:20250828T090000", "DTEND:20250828T170000", "TRANSP:TRANSPARENT", "END:VEVENT",
+        "BEGIN:VEVENT", "DTSTART:20250826T130000", "DTEND:20250826T140000",
+        "RRULE:FREQ=DAILY;INTERVAL=2", "END:VEVENT",
+        "BEGIN:VEVENT", "DTSTART:20250814T160000", "DTEND:20250814T170000",
+        "RRULE:FREQ=WEEKLY;COUNT=2", "END:VEVENT",
+        "END:VCALENDAR", ""]), encoding="utf-8")
+
+    changed, reports = import_unavailability([str(csv_path), str(ics_path)], persons, params)
+    assert {p.email for p in changed} == {jan.email, anna.email}
+    assert list(jan.unavailable_slots)[0] == TimeSlot(day(9), day(10))
+    assert TimeSlot(day(9), day(10)) in jan.unavailable_slots
+    assert list(anna.unavailable_slots) == list(IntervalList(
+        anna_before + [TimeSlot(day(10), day(11, 30)), TimeSlot(day(13), day(14))]))
+
+    csv_report, ics_report = reports
+    assert [(e.line, e.field) for e in csv_report.errors] == [(5, "email"), (6, "start")]
+    assert (ics_report.imported, ics_report.skipped) == (2, 0)
+
+    # to samo z wiersza poleceń – projekt zapisany obok
+    out = tmp_path / "updated.json"
+    assert cli_main(["availability", SAMPLE, str(ics_path), "-o", str(out)]) == 0
+    updated = load_project(str(out))[0]
+    assert list(updated[1].unavailable_slots) == list(anna.unavailable_slots)
+
+
+# ---------- PDF ----------
+
+def test_pdf_export_groups_by_day_room_and_wraps_with_cached_metrics(tmp_path):
+    from fpdf import FPDF
+    from src.utils.pdf_engine import FONT_FAMILY, FONT_PATH, SchedulePDF, export_schedule_pdf, font_metrics, \
+        schedule_rows
+    from src.utils.schedule_exporter import ScheduleExporter
+
+    metrics = font_metrics()
+    assert font_metrics() is metrics   # czcionka parsowana raz na proces
+
+    reference = FPDF()
+    reference.add_page()
+    reference.add_font(FONT_FAMILY, "", FONT_PATH)
+    reference.set_font(FONT_FAMILY, "", 8)
+    title = "Zastosowanie uczenia maszynowego w analizie danych – bardzo długi tytuł pracy " * 3
+    assert abs(metrics.width(title, 8) - reference.get_string_width(title)) < 1e-6
+    text = title + "Supercalifragilisticexpialidocious" * 4   # słowo dłuższe niż kolumna
+    lines = metrics.wrap(text, 40, 8)
+    assert len(lines) > 3 and all(reference.get_string_width(line) <= 40 + 1e-6 for line in lines)
+    assert "".join(lines).replace(" ", "") == text.replace(" ", "")
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    groups = SchedulePDF.grouped(schedule_rows(schedule))
+    placed = schedule.get_scheduled_defenses()
+    assert sum(len(rows) for _, day_rooms in groups for _, rows in day_rooms) == len(placed)
+    for _, day_rooms in groups:
+        assert [rows[0].room_order for _, rows in day_rooms] == sorted(rows[0].room_order for _, rows in day_rooms)
+        for label, rows in day_rooms:
+            assert all(r.room == label for r in rows)
+            assert [r.start for r in rows] == sorted(r.start for r in rows)
+
+    path = tmp_path / "schedule.pdf"
+    assert export_schedule_pdf(schedule, str(path)) == len(placed)
+    ScheduleExporter.export_to_pdf(schedule, str(tmp_path / "again.pdf"))
+    assert path.read_bytes()[:5] == b"%PDF-" and (tmp_path / "again.pdf").stat().st_size > 0
+
+
+def test_booklets_index_every_role_and_render_in_a_process_pool(tmp_path):
+    import json
+    from src.cli import main as cli_main
+    from src.utils.booklets import MANIFEST, build_booklets, export_booklets
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    placed = [slot for slot in schedule.slots if slot.defense]
+    booklets = build_booklets(schedule)
+    by_key = {(b.kind, b.key): b for b in booklets}
+
+    for person in persons:
+        mine = [s for s in placed if person in (s.defense.supervisor, s.defense.reviewer, s.defense.chairman)]
+        booklet = by_key.get(("person", person.email))
+        assert (len(booklet.rows) if booklet else 0) == len(mine)
+        if booklet:
+            assert sum(booklet.roles.values()) >= len(mine)
+            assert booklet.roles.get("chairman", 0) == sum(s.defense.chairman is person for s in mine)
+    assert sum(len(b.rows) for b in booklets if b.kind == "room") == len(placed)
+    assert len({b.filename for b in booklets}) == len(booklets)
+
+    out = tmp_path / "booklets"
+    calls = []
+    written = export_booklets(schedule, str(out), workers=2, progress=lambda done, total: calls.append((done, total)))
+    manifest = json.loads((out / MANIFEST).read_text(encoding="utf-8"))
+    assert [b["file"] for b in manifest["booklets"]] == [b.filename for b in written]
+    assert all((out / b.filename).read_bytes()[:5] == b"%PDF-" and b.pages >= 1 for b in written)
+    assert calls[-1] == (len(written), len(written))
+
+    assert cli_main(["booklets", SAMPLE, str(tmp_path / "rooms"), "--kind", "room", "-j", "1", "-q"]) == 0
+    assert sorted(os.listdir(tmp_path / "rooms")) == sorted(
+        [MANIFEST] + [b.filename for b in booklets if b.kind == "room"])
+
+
+def test_calendar_feeds_per_person_and_room_read_back(tmp_path):
+    from src.utils.calendar_export import COMBINED, defense_uid
+    from src.utils.icalendar import iter_busy_events
+    from src.utils.schedule_exporter import ScheduleExporter
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    placed = [slot for slot in schedule.slots if slot.defense]
+    placed[0].defense.thesis_title = "Sieci; grafy, oraz\nbardzo długi tytuł " * 4   # escaping + folding
+
+    counts = ScheduleExporter.export_calendar_feeds(schedule, str(tmp_path))
+    assert counts[COMBINED] == len(placed)
+    for person in persons:
+        mine = [s for s in placed if person in (s.defense.supervisor, s.defense.reviewer, s.defense.chairman)]
+        assert counts.get(f"person-{person.email}.ics", 0) == len(mine)
+    assert sum(n for name, n in counts.items() if name.startswith("room-")) == len(placed)
+
+    raw = (tmp_path / COMBINED).read_bytes()
+    assert raw.startswith(b"BEGIN:VCALENDAR\r\n") and raw.endswith(b"END:VCALENDAR\r\n")
+    assert all(len(line) <= 75 for line in raw.split(b"\r\n"))
+
+    # czytnik z importu dostępności odczytuje to samo: czasy i uczestników
+    with open(tmp_path / COMBINED, encoding="utf-8") as f:
+        events = list(iter_busy_events(f))
+    assert [(e.start, e.end) for e in events] == [(s.time_slot.start, s.time_slot.end) for s in placed]
+    first = placed[0].defense
+    assert events[0].emails == [p.email for p in (first.supervisor, first.reviewer, first.chairman) if p]
+    text = raw.decode("utf-8").replace("\r\n ", "")
+    assert r"Sieci\; grafy\, oraz\nbardzo" in text and f"UID:{defense_uid(first)}" in text
+
+    ScheduleExporter.export_to_ics(schedule, str(tmp_path / "all.ics"))
+    assert (tmp_path / "all.ics").read_bytes().count(b"BEGIN:VEVENT") == len(placed)
+
+
+def test_streaming_exports_match_in_memory_output_and_gzip(tmp_path):
+    import csv
+    import gzip
+    import json
+    from src.cli import main as cli_main
+    from src.utils.schedule_exporter import CSV_HEADER, JSON_FIELDS, ScheduleExporter
+
+    persons, defenses, rooms, params, schedule = load_project(SAMPLE)
+    placed = [slot for slot in schedule.slots if slot.defense]
+    placed[0].defense.thesis_title = 'Cytat "w tytule", przecinek\nnowa linia ąę'
+    expected = [[s.defense.student_name, s.defense.thesis_title, s.defense.supervisor.name, s.defense.reviewer.name,
+                 s.defense.chairman.name if s.defense.chairman else '', s.room.name, str(s.time_slot)] for s in placed]
+    objects = [dict(zip(JSON_FIELDS, row)) for row in expected]
+
+    assert ScheduleExporter.export_to_csv(schedule, str(tmp_path / "s.csv.gz")) == len(placed)
+    with gzip.open(tmp_path / "s.csv.gz", "rt", encoding="utf-8", newline="") as f:
+        assert list(csv.reader(f)) == [CSV_HEADER] + expected
+
+    # ta sama treść co json.dump(indent=2), także po kompresji
+    ScheduleExporter.export_to_json(schedule, str(tmp_path / "s.json"))
+    assert (tmp_path / "s.json").read_text(encoding="utf-8") == json.dumps(objects, indent=2, ensure_ascii=False)
+    ScheduleExporter.export_to_json(schedule, str(tmp_path / "compact.json"), compress=True, indent=None)
+    assert json.loads(gzip.decompress((tmp_path / "compact.json").read_bytes())) == objects
+
+    assert cli_main(["export", SAMPLE, str(tmp_path / "s.jsonl.gz")]) == 0
+    with gzip.open(tmp_path / "s.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["student"] for line in f] == [s.defense.student_name for s in
+                                                                load_project(SAMPLE)[4].slots if s.defense]
+
+
+def test_schedule_stats_single_pass_matches_brute_force_and_is_cached(tmp_path):
+    import csv
+    import json
+    from src.utils.schedule_exporter import ScheduleExporter
+    from src.utils.schedule_stats import compute_stats, invalidate_stats, schedule_stats
+
+    schedule = load_project(SAMPLE)[4]
+    placed = [slot for slot in schedule.slots if slot.defense]
+    stats = schedule_stats(schedule)
+
+    def minutes(slot):
+        return int((slot.time_slot.end - slot.time_slot.start).total_seconds() // 60)
+
+    assert stats.defenses == len(schedule.get_scheduled_defenses())
+    assert (stats.used_slots, stats.slots) == (len(placed), len([s for s in schedule.slots if s.time_slot]))
+    assert stats.total_minutes == sum(minutes(s) for s in placed)
+    for usage in stats.rooms:
+        assert usage.used == len([s for s in placed if s.room is usage.room])
+    for w in stats.workloads:
+        mine = [s for s in placed if w.person in (s.defense.supervisor, s.defense.reviewer, s.defense.chairman)]
+        assert w.counts["reviewer"] == len([s for s in placed if s.defense.reviewer is w.person])
+        assert w.defenses == len(mine)
+        # okienka: suma przerw między kolejnymi obronami osoby
+        times = sorted((s.time_slot.start, s.time_slot.end) for s in mine)
+        assert w.idle_minutes == sum(max(0, int((b[0] - a[1]).total_seconds() // 60)) for a, b in zip(times, times[1:]))
+    assert [w.total_minutes for w in stats.workloads] == sorted((w.total_minutes for w in stats.workloads), reverse=True)
+
+    # ten sam obiekt do zmiany wersji harmonogramu; edycja w miejscu -> invalidate_stats()
+    assert schedule_stats(schedule) is stats
+    schedule.remove_defense(placed[0].defense)
+    again = schedule_stats(schedule)
+    assert again is not stats and again.defenses == stats.defenses - 1
+    invalidate_stats()
+    assert schedule_stats(schedule) is not again
+    assert compute_stats(schedule).to_dict() == schedule_stats(schedule).to_dict()
+
+    assert ScheduleExporter.export_workload_report(schedule, str(tmp_path / "w.csv")) == len(again.workloads)
+    with open(tmp_path / "w.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["name"] for r in rows] == [w.person.name for w in again.workloads]
+    ScheduleExporter.export_workload_report(schedule, str(tmp_path / "w.json"))
+    report = json.loads((tmp_path / "w.json").read_text(encoding="utf-8"))
+    assert report["defenses"] == again.defenses and len(report["rooms"]) == len(again.rooms)
+
+
+# ---------- SCHEDULE VIEW ----------
+
+def test_card_layout_visible_range_is_exact_and_constant_time():
+    from src.gui.card_grid import CardLayout
+
+    layout = CardLayout(count=3000, width=1400, card_h=110, top=60)
+    assert layout.cols == 4 and layout.rows == 750
+    assert CardLayout(3000, 700).cols == 1 and CardLayout(3000, 1100).cols == 3
+
+    # zakres z arytmetyki == karty, których prostokąt przecina okno (sprawdzenie brute force)
+    for y0 in (0, 59, 60, 175, 5000, 83000, layout.top + layout.height - 10):
+        y1 = y0 + 700
+        expected = [i for i in range(layout.count) if layout.box(i)[1] < y1 and layout.box(i)[3] > y0]
+        assert list(layout.visible(y0, y1)) == expected
+    assert len(layout.visible(40000, 40700)) <= 4 * (700 // (110 + 16) + 2)   # niezależnie od count
+
+    assert layout.box(3)[2] - layout.box(0)[0] == layout.content_w - 2 * layout.side
+    assert list(CardLayout(0, 1400).visible(0, 700)) == []
+
+
+# ---------- STARTUP ----------
+
+def test_gui_and_cli_import_without_pdf_stack():
+    import subprocess
+    import sys
+
+    # fpdf/fontTools/PIL (i w GUI pula procesów) ładują się dopiero przy pierwszym eksporcie
+    def loaded(module, names):
+        code = f"import sys, {module}; print(sorted(m for m in {names!r} if m in sys.modules))"
+        return subprocess.run([sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), ".."),
+                              capture_output=True, text=True, check=True).stdout.strip()
+
+    assert loaded("src.gui.main_window", ("fpdf", "fontTools", "PIL", "multiprocessing", "src.utils.booklets")) == "[]"
+    assert loaded("src.cli", ("fpdf", "fontTools", "PIL")) == "[]"